@@ -48,6 +48,7 @@ import uuid
 import weakref
 
 from edb.common import compiler
+from edb.common import lru
 from edb.common import ordered
 from edb.common import parsing
 
@@ -72,6 +73,7 @@ from .options import GlobalCompilerOptions
 
 if TYPE_CHECKING:
     from edb.schema import objtypes as s_objtypes
+    from edb.schema import policies as s_policies
     from edb.schema import sources as s_sources
 
 
@@ -134,6 +136,125 @@ class PointerRefCache(Dict[irtyputils.PtrRefCacheKey, irast.BasePointerRef]):
         return self._rcache.get(ref)
 
 
+class TypeRefCache(Dict[irtyputils.TypeRefCacheKey, irast.TypeRef]):
+    """The TypeRef cache of a compilation.
+
+    TypeRefs are immutable, so the ones describing objects that exist in
+    the schema the compilation started with are also stored in a *shared*
+    cache, which is reused by later compilations against the very same
+    schema (see get_shared_schema_cache()).  Refs of objects derived
+    during the compilation stay local.
+    """
+
+    _schema: s_schema.Schema
+    _shared: Optional[Dict[irtyputils.TypeRefCacheKey, irast.TypeRef]]
+
+    def __init__(
+        self,
+        schema: s_schema.Schema,
+        shared: Optional[
+            Dict[irtyputils.TypeRefCacheKey, irast.TypeRef]
+        ] = None,
+    ) -> None:
+        super().__init__()
+        self._schema = schema
+        self._shared = shared
+
+    def get(  # type: ignore[override]
+        self,
+        key: irtyputils.TypeRefCacheKey,
+        default: Optional[irast.TypeRef] = None,
+    ) -> Optional[irast.TypeRef]:
+        result = super().get(key)
+        if result is None and self._shared is not None:
+            result = self._shared.get(key)
+            if result is not None:
+                super().__setitem__(key, result)
+        return default if result is None else result
+
+    def __setitem__(
+        self,
+        key: irtyputils.TypeRefCacheKey,
+        val: irast.TypeRef,
+    ) -> None:
+        super().__setitem__(key, val)
+        if self._shared is not None and self._schema.has_object(key[0]):
+            self._shared[key] = val
+
+
+@dataclasses.dataclass(eq=False)
+class SharedSchemaCache:
+    """Compilation artifacts that only depend on the schema.
+
+    Shared by all compilations against the very same schema, so only
+    things describing objects of that schema (and not the ones derived
+    during a compilation) may be stored here.
+    """
+
+    type_refs: Dict[irtyputils.TypeRefCacheKey, irast.TypeRef] = (
+        dataclasses.field(default_factory=dict))
+    """TypeRefs of schema types."""
+
+    access_policies: Dict[
+        Tuple[uuid.UUID, bool, bool],
+        Tuple[s_policies.AccessPolicy, ...],
+    ] = dataclasses.field(default_factory=dict)
+    """Access policies applied to a type, keyed by the type id and
+    the apply_query_rewrites and apply_user_access_policies options."""
+
+    own_policies: Dict[
+        Tuple[uuid.UUID, Optional[uuid.UUID], bool, bool],
+        bool,
+    ] = dataclasses.field(default_factory=dict)
+    """Results of policies.has_own_policies()."""
+
+    policy_subjects: Dict[uuid.UUID, FrozenSet[s_objtypes.ObjectType]] = (
+        dataclasses.field(default_factory=dict))
+    """Types an access policy of a type is allowed to access."""
+
+    overlapping_descendants: Dict[
+        uuid.UUID,
+        Optional[FrozenSet[s_objtypes.ObjectType]],
+    ] = dataclasses.field(default_factory=dict)
+    """Descendants of the children of a type, if some of them are shared
+    between children (see policies.try_type_rewrite())."""
+
+
+# Shared caches of the most recently used schemas, keyed by the identity
+# of the (std, user, global) schema parts.  The parts are weakly
+# referenced so that an entry is never used for a new schema that happens
+# to reuse the id() of a garbage-collected one.
+_shared_schema_caches: lru.LRUMapping = lru.LRUMapping(maxsize=8)
+
+
+def get_shared_schema_cache(
+    schema: s_schema.Schema,
+) -> Optional[SharedSchemaCache]:
+    if not isinstance(schema, s_schema.ChainedSchema):
+        return None
+
+    parts = (
+        schema.get_base_schema(),
+        schema.get_top_schema(),
+        schema.get_global_schema(),
+    )
+    key = tuple(id(part) for part in parts)
+    entry = _shared_schema_caches.get(key)
+    if entry is not None:
+        refs: tuple[weakref.ref[s_schema.Schema], ...]
+        cache: SharedSchemaCache
+        refs, cache = entry
+        if all(ref() is part for ref, part in zip(refs, parts)):
+            return cache
+
+    cache = SharedSchemaCache()
+    _shared_schema_caches[key] = (
+        tuple(weakref.ref(part) for part in parts),
+        cache,
+    )
+    return cache
+
+
 # Volatility inference computes two volatility results:
 # A basic one, and one for consumption by materialization
 InferredVolatility = Union[
@@ -218,7 +339,10 @@ class Environment:
 
     # Caches for costly operations in edb.ir.typeutils
     ptr_ref_cache: PointerRefCache
-    type_ref_cache: Dict[irtyputils.TypeRefCacheKey, irast.TypeRef]
+    type_ref_cache: TypeRefCache
+
+    shared_cache: Optional[SharedSchemaCache]
+    """Schema-level artifacts shared with other compilations."""
 
     dml_exprs: List[qlast.Base]
     """A list of DML expressions (statements and DML-containing
@@ -291,6 +415,7 @@ class Environment:
         path_scope: Optional[irast.ScopeTreeNode] = None,
         alias_result_view_name: Optional[s_name.QualName] = None,
         options: Optional[GlobalCompilerOptions] = None,
+        shared_cache: Optional[SharedSchemaCache] = None,
     ) -> None:
         if options is None:
             options = GlobalCompilerOptions()
@@ -314,7 +439,11 @@ class Environment:
         self.schema_refs = set()
         self.schema_ref_exprs = {} if options.track_schema_ref_exprs else None
         self.ptr_ref_cache = PointerRefCache()
-        self.type_ref_cache = {}
+        self.shared_cache = shared_cache
+        self.type_ref_cache = TypeRefCache(
+            schema,
+            shared_cache.type_refs if shared_cache is not None else None,
+        )
         self.dml_exprs = []
         self.dml_stmts = []
         self.pointer_derivation_map = collections.defaultdict(list)
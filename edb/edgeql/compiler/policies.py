@@ -22,7 +22,7 @@
 
 from __future__ import annotations
 
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, FrozenSet, List
 
 from edb.ir import ast as irast
 
@@ -69,15 +69,61 @@ def should_ignore_rewrite(
     return False
 
 
+def _get_shared_cache(
+    *objs: Optional[s_objtypes.ObjectType],
+    ctx: context.ContextLevel,
+) -> Optional[context.SharedSchemaCache]:
+    """Return the shared schema cache, if results about *objs* may go there.
+
+    Types derived during the compilation don't exist in the schema the
+    cache is shared for.  (Their presence as children of schema types
+    doesn't matter here, since derived views don't inherit policies.)
+    """
+    cache = ctx.env.shared_cache
+    if cache is None:
+        return None
+    orig_schema = ctx.env.orig_schema
+    if all(obj is None or orig_schema.has_object(obj.id) for obj in objs):
+        return cache
+    else:
+        return None
+
+
+def _get_policy_options(ctx: context.ContextLevel) -> Tuple[bool, bool]:
+    options = ctx.env.options
+    return (
+        options.apply_query_rewrites,
+        options.apply_user_access_policies,
+    )
+
+
 def get_access_policies(
     stype: s_objtypes.ObjectType,
     *,
     ctx: context.ContextLevel,
 ) -> Tuple[s_policies.AccessPolicy, ...]:
-    schema = ctx.env.schema
     if not ctx.env.options.apply_query_rewrites:
         return ()
 
+    cache = _get_shared_cache(stype, ctx=ctx)
+    if cache is None:
+        return _get_access_policies(stype, ctx=ctx)
+
+    key = (stype.id, *_get_policy_options(ctx))
+    pols = cache.access_policies.get(key)
+    if pols is None:
+        pols = cache.access_policies[key] = _get_access_policies(
+            stype, ctx=ctx)
+    return pols
+
+
+def _get_access_policies(
+    stype: s_objtypes.ObjectType,
+    *,
+    ctx: context.ContextLevel,
+) -> Tuple[s_policies.AccessPolicy, ...]:
+    schema = ctx.env.schema
+
     # The apply_access_policies config flag disables user-specified
     # access polices, but not stdlib ones
     if (
@@ -96,8 +142,28 @@ def has_own_policies(
     skip_from: Optional[s_objtypes.ObjectType]=None,
     ctx: context.ContextLevel,
 ) -> bool:
-    # TODO: some kind of caching or precomputation
+    cache = _get_shared_cache(stype, skip_from, ctx=ctx)
+    if cache is None:
+        return _has_own_policies(stype=stype, skip_from=skip_from, ctx=ctx)
+
+    key = (
+        stype.id,
+        skip_from.id if skip_from is not None else None,
+        *_get_policy_options(ctx),
+    )
+    result = cache.own_policies.get(key)
+    if result is None:
+        result = cache.own_policies[key] = _has_own_policies(
+            stype=stype, skip_from=skip_from, ctx=ctx)
+    return result
+
 
+def _has_own_policies(
+    *,
+    stype: s_objtypes.ObjectType,
+    skip_from: Optional[s_objtypes.ObjectType],
+    ctx: context.ContextLevel,
+) -> bool:
     schema = ctx.env.schema
     for pol in get_access_policies(stype, ctx=ctx):
         if not any(
@@ -112,6 +178,59 @@ def has_own_policies(
     )
 
 
+def _get_policy_subjects(
+    subject: s_objtypes.ObjectType,
+    *,
+    ctx: context.ContextLevel,
+) -> FrozenSet[s_objtypes.ObjectType]:
+    cache = _get_shared_cache(subject, ctx=ctx)
+    if cache is not None:
+        descs = cache.policy_subjects.get(subject.id)
+        if descs is not None:
+            return descs
+
+    schema = ctx.env.schema
+    descs = frozenset({subject} | {
+        desc for desc in subject.descendants(schema)
+        if desc.is_material_object_type(schema)
+    })
+
+    if cache is not None:
+        cache.policy_subjects[subject.id] = descs
+    return descs
+
+
+def _get_overlapping_descendants(
+    stype: s_objtypes.ObjectType,
+    *,
+    ctx: context.ContextLevel,
+) -> Optional[FrozenSet[s_objtypes.ObjectType]]:
+    """Return material descendants of *stype*'s children if they overlap.
+
+    If no two children of *stype* have a common descendant, return None.
+    """
+    cache = _get_shared_cache(stype, ctx=ctx)
+    if cache is not None and stype.id in cache.overlapping_descendants:
+        return cache.overlapping_descendants[stype.id]
+
+    schema = ctx.env.schema
+    all_descs = [
+        x
+        for child in stype.children(schema)
+        for x in child.descendants(schema)
+    ]
+    descs = set(all_descs)
+    result = None
+    if len(descs) != len(all_descs):
+        result = frozenset(
+            desc for desc in descs if desc.is_material_object_type(schema)
+        )
+
+    if cache is not None:
+        cache.overlapping_descendants[stype.id] = result
+    return result
+
+
 def compile_pol(
     pol: s_policies.AccessPolicy,
     *,
@@ -140,17 +259,14 @@ def compile_pol(
 
     # Find all descendants of the original subject of the rule
     subject = pol.get_original_subject(schema)
-    descs = {subject} | {
-        desc for desc in subject.descendants(schema)
-        if desc.is_material_object_type(schema)
-    }
+    descs = _get_policy_subjects(subject, ctx=ctx)
 
     # Compile it with all of the
     with ctx.detached() as dctx:
         dctx.schema_factoring()
         dctx.partial_path_prefix = ctx.partial_path_prefix
         dctx.expr_exposed = context.Exposure.UNEXPOSED
-        dctx.suppress_rewrites = frozenset(descs)
+        dctx.suppress_rewrites = descs
 
         return dispatch.compile(expr, ctx=dctx)
 
@@ -299,17 +415,10 @@ def try_type_rewrite(
         type_rewrites[rw_key] = None
         return
 
-    # TODO: caching?
-    children_overlap = False
+    overlapping_descs = None
     if children_have_policies:
-        all_descs = [
-            x
-            for child in stype.children(schema)
-            for x in child.descendants(schema)
-        ]
-        descs = set(all_descs)
-        if len(descs) != len(all_descs):
-            children_overlap = True
+        overlapping_descs = _get_overlapping_descendants(stype, ctx=ctx)
+    children_overlap = overlapping_descs is not None
 
     # Put a placeholder to prevent recursion.
     type_rewrites[rw_key] = None
@@ -355,7 +464,10 @@ def try_type_rewrite(
     if children_have_policies and not skip_subtypes:
         # N.B: we don't filter here, we just generate references
         # they will go in their own CTEs
-        children = stype.children(schema) if not children_overlap else descs
+        children = (
+            stype.children(schema) if overlapping_descs is None
+            else overlapping_descs
+        )
         sets += [
             # We need to wrap it in a type override so that unioning
             # them all together works...
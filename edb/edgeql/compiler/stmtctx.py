@@ -83,6 +83,10 @@ def init_context(
     inlining_context: Optional[context.ContextLevel] = None,
 ) -> context.ContextLevel:
 
+    # The shared schema cache is looked up by the schema we were given,
+    # before __derived__ is added to it.
+    input_schema = schema
+
     if not schema.get_global(s_mod.Module, '__derived__', None):
         schema, _ = s_mod.Module.create_in_schema(
             schema,
@@ -107,6 +111,7 @@ def init_context(
             schema=schema,
             options=options,
             alias_result_view_name=options.result_view_name,
+            shared_cache=context.get_shared_schema_cache(input_schema),
         )
         ctx = context.ContextLevel(None, context.ContextSwitchMode.NEW, env=env)
     _ = context.CompilerContext(initial=ctx)
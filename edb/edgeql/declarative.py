@@ -332,6 +332,29 @@ class DepTraceContext(TraceContextBase):
         self.defdeps = defdeps
         self.constraints = constraints
 
+        # The object set is complete by the time dependencies get
+        # traced, so index what _get_pointer_deps() and trace_Index()
+        # would otherwise have to search all the objects for.
+        self.subobjects: Dict[s_name.QualName, Set[s_name.QualName]] = (
+            defaultdict(set))
+        self.ai_annotations: Set[s_name.QualName] = set()
+        for name, obj in objects.items():
+            if (
+                "@ext::ai::" in name.name
+                and isinstance(obj, qltracer.AnnotationValue)
+            ):
+                self.ai_annotations.add(name)
+            if isinstance(obj, qltracer.Field):
+                continue
+            # Register the name under every pointer it is nested in,
+            # e.g. `T@link@prop` under both `T` and `T@link`.
+            at = name.name.find('@')
+            while at != -1:
+                self.subobjects[
+                    s_name.QualName(module=name.module, name=name.name[:at])
+                ].add(name)
+                at = name.name.find('@', at + 1)
+
 
 class Dependency:
     pass
@@ -967,12 +990,7 @@ def trace_Index(
             # HACK: Search all objects and depend on any ext::ai annotations.
             # FIXME: Can we make this more general and less slow?
             if kwarg == "embedding_model":
-                for n, v in ctx.objects.items():
-                    if (
-                        "@ext::ai::" in n.name
-                        and isinstance(v, qltracer.AnnotationValue)
-                    ):
-                        deps.add(n)
+                deps |= ctx.ai_annotations
     _register_item(
         node,
         deps=deps,
@@ -1375,13 +1393,7 @@ def _get_pointer_deps(
     # This will *also* grab any constraints on the pointer, which
     # is is important for properly doing cardinality inference
     # on expressions involving it.
-    # PERF: We should avoid actually searching all the objects.
-    for propname, prop in ctx.objects.items():
-        if (
-            str(propname).startswith(str(pointer) + '@')
-            and not isinstance(prop, qltracer.Field)
-        ):
-            result.add(propname)
+    result |= ctx.subobjects.get(pointer, set())
 
     return result
 
@@ -22,7 +22,9 @@ from typing import Optional, List
 import copy
 import dataclasses
 
+from edb import errors
 from edb.common import debug
+from edb.ir import ast as irast
 from edb.pgsql import ast as pgast
 from edb.pgsql import codegen as pgcodegen
 from edb.schema import schema as s_schema
@@ -36,6 +38,7 @@ from . import relation  # NOQA
 from . import command  # NOQA
 
 Options = context.Options
+CopyFrom = command.CopyFrom
 
 
 @dataclasses.dataclass(kw_only=True, eq=False, frozen=True, repr=False)
@@ -53,6 +56,18 @@ class ResolvedSQL:
     # query parameters
     params: List[dbstate.SQLParam]
 
+    # True when the query only reads from the emulated pg_catalog and
+    # information_schema, so its translation is independent of user schema.
+    catalog_only: bool
+
+    # For COPY ... FROM STDIN, the staging table and the COPY statement that
+    # loads it. The `ast` then moves the staged rows into the subject table.
+    copy_from: Optional[command.CopyFrom]
+
+    # IR of the DML compiled with the EdgeQL compiler, including the DML of
+    # the triggers it fires.
+    dml_stmts: List[irast.Statement]
+
 
 def resolve(
     query: pgast.Query | pgast.CopyStmt,
@@ -74,6 +89,10 @@ def resolve(
 
     _ = context.ResolverContext(initial=ctx)
 
+    copy_from: Optional[command.CopyFrom] = None
+    if isinstance(query, pgast.CopyStmt) and query.is_from:
+        query, copy_from = command.uncompile_copy_from(query, ctx=ctx)
+
     command.init_external_params(query, ctx)
     top_level_ctes = command.compile_dml(query, ctx=ctx)
 
@@ -86,11 +105,18 @@ def resolve(
     else:
         raise AssertionError()
 
-    if limit := ctx.options.implicit_limit:
+    if (limit := ctx.options.implicit_limit) and copy_from is None:
         resolved = apply_implicit_limit(resolved, limit, resolved_table, ctx)
 
     command.fini_external_params(ctx)
 
+    if copy_from is not None and ctx.query_params:
+        # The staged rows are inserted within the same simple query as the
+        # COPY itself, so there is no way to pass values of globals.
+        raise errors.UnsupportedFeatureError(
+            'COPY FROM into a table that depends on globals is not supported',
+        )
+
     if top_level_ctes:
         assert isinstance(resolved, pgast.Query)
         if not resolved.ctes:
@@ -102,7 +128,11 @@ def resolve(
     # Since our resolved SQL does not have a top-level DML stmt, we need to
     # override that tag.
     command_complete_tag: Optional[dbstate.CommandCompleteTag] = None
-    if isinstance(query, pgast.DMLQuery):
+    if copy_from is not None:
+        # resolved SQL will contain an injected COUNT clause, which holds the
+        # number of rows that were actually inserted
+        command_complete_tag = dbstate.TagUnpackRow(prefix='COPY ')
+    elif isinstance(query, pgast.DMLQuery):
         prefix: str
         if isinstance(query, pgast.InsertStmt):
             prefix = 'INSERT 0 '
@@ -127,7 +157,7 @@ def resolve(
         )
         debug.dump_code(debug_sql_text, lexer='sql')
 
-    if options.include_edgeql_io_format_alternative:
+    if options.include_edgeql_io_format_alternative and copy_from is None:
         edgeql_output_format_ast = copy.copy(resolved)
         if e := as_plain_select(edgeql_output_format_ast, resolved_table, ctx):
             # Turn the query into one that returns a ROW.
@@ -164,6 +194,13 @@ def resolve(
         edgeql_output_format_ast=edgeql_output_format_ast,
         command_complete_tag=command_complete_tag,
         params=ctx.query_params,
+        catalog_only=(
+            isinstance(query, pgast.SelectStmt)
+            and not top_level_ctes
+            and not ctx.schema_objects
+        ),
+        copy_from=copy_from,
+        dml_stmts=ctx.dml_stmts,
     )
 
 
@@ -26,6 +26,7 @@ import uuid
 
 from edb.server.pgcon import errors as pgerror
 from edb.server.compiler import dbstate
+from edb.server.compiler.sql import DisableNormalization
 
 from edb.common import ast
 from edb.common.typeutils import not_none
@@ -66,6 +67,9 @@ def resolve_CopyStmt(stmt: pgast.CopyStmt, *, ctx: Context) -> pgast.CopyStmt:
 
     query: Optional[pgast.Query]
 
+    # COPY FROM is translated by uncompile_copy_from()
+    assert not stmt.is_from
+
     if stmt.query:
         query = dispatch.resolve(stmt.query, ctx=ctx)
 
@@ -120,6 +124,89 @@ def resolve_CopyStmt(stmt: pgast.CopyStmt, *, ctx: Context) -> pgast.CopyStmt:
     )
 
 
+@dataclasses.dataclass(kw_only=True, eq=False, repr=False)
+class CopyFrom:
+    # name of the temporary table that receives the COPY data
+    staging_table: str
+
+    # columns of the staging table, along with their Postgres types
+    staging_columns: List[Tuple[str, Tuple[str, ...]]]
+
+    # COPY statement that loads the data into the staging table
+    copy_stmt: pgast.CopyStmt
+
+
+COPY_FROM_STAGING_TABLE = '__edb_copy_from'
+
+
+def uncompile_copy_from(
+    stmt: pgast.CopyStmt, *, ctx: Context
+) -> Tuple[pgast.InsertStmt, CopyFrom]:
+    """
+    Translates `COPY <table> FROM STDIN` into a COPY into a temporary staging
+    table and an INSERT that moves the staged rows into the subject table.
+
+    Postgres parses the data (in any of the COPY formats) into typed columns
+    of the staging table, while the INSERT goes through the regular DML
+    compilation, which takes care of link and property tables, defaults and
+    access policies.
+    """
+
+    if stmt.is_program or stmt.filename is not None or not stmt.relation:
+        raise errors.UnsupportedFeatureError(
+            'COPY FROM is supported only into a table and from STDIN',
+            span=stmt.span,
+        )
+    if ctx.options.normalized_params:
+        # The data is loaded with the simple query protocol, which cannot
+        # bind parameters.
+        raise DisableNormalization()
+
+    sub_table, sub = _uncompile_dml_subject(
+        pgast.RelRangeVar(relation=stmt.relation), ctx=ctx
+    )
+    columns = _pull_columns_from_table(
+        sub_table,
+        ((c, stmt.span) for c in stmt.colnames) if stmt.colnames else None,
+    )
+    staging_columns = [
+        (col.name, _get_pg_type_for_column(col, sub, ctx)) for col in columns
+    ]
+    col_names = [name for name, _ in staging_columns]
+
+    staging = pgast.Relation(
+        name=COPY_FROM_STAGING_TABLE, schemaname='pg_temp'
+    )
+    ctx.temp_tables[COPY_FROM_STAGING_TABLE] = col_names
+
+    insert = pgast.InsertStmt(
+        relation=pgast.RelRangeVar(relation=stmt.relation, span=stmt.span),
+        cols=[pgast.InsertTarget(name=name) for name in col_names],
+        select_stmt=pgast.SelectStmt(
+            target_list=[
+                pgast.ResTarget(val=pgast.ColumnRef(name=(name,)))
+                for name in col_names
+            ],
+            from_clause=[pgast.RelRangeVar(relation=staging)],
+            where_clause=stmt.where_clause,
+        ),
+        span=stmt.span,
+    )
+    copy_from = CopyFrom(
+        staging_table=COPY_FROM_STAGING_TABLE,
+        staging_columns=staging_columns,
+        copy_stmt=pgast.CopyStmt(
+            relation=staging,
+            colnames=col_names,
+            query=None,
+            is_from=True,
+            filename=None,
+            options=stmt.options,
+        ),
+    )
+    return insert, copy_from
+
+
 def _pull_columns_from_table(
     table: context.Table,
     col_names: Optional[Iterable[Tuple[str, pgast.Span | None]]],
@@ -1680,6 +1767,7 @@ def _compile_uncompiled_dml(
             schema=ctx.schema,
             options=options,
         )
+        ctx.dml_stmts.append(ir_stmt)
         external_rels, ir_stmts = _merge_and_prepare_external_rels(
             ir_stmt, stmts, ql_stmt_shape_names
         )
@@ -2084,6 +2172,25 @@ def _get_ptr_id(
     return source_id.extend(ptrref=ptrref)
 
 
+def _get_pg_type_for_column(
+    col: context.Column,
+    subject: s_objtypes.ObjectType | s_links.Link | s_properties.Property,
+    ctx: context.ResolverContextLevel,
+) -> Tuple[str, ...]:
+    ptr, ptr_name, _ = _get_pointer_for_column(col, subject, ctx)
+
+    if (
+        ptr_name == 'id'
+        or isinstance(ptr, s_links.Link)
+        or (ptr is subject and ptr_name == 'source')
+    ):
+        return ('uuid',)
+    else:
+        tgt = ptr.get_target(ctx.schema)
+        assert tgt
+        return pgtypes.pg_type_from_object(ctx.schema, tgt)
+
+
 def _try_inject_ptr_type_cast(
     rel: pgast.BaseRelation, index: int, ptr: s_pointers.Pointer, ctx: Context
 ):
@@ -19,7 +19,7 @@
 from __future__ import annotations
 
 from copy import deepcopy
-from typing import Optional, Sequence, List, Dict, Mapping, Tuple
+from typing import Optional, Sequence, List, Dict, Mapping, Tuple, Set
 from dataclasses import dataclass, field
 import enum
 import uuid
@@ -30,6 +30,8 @@ from edb.pgsql.compiler import aliases
 from edb.common import compiler
 from edb.server.compiler import dbstate
 
+from edb.ir import ast as irast
+
 from edb.schema import schema as s_schema
 from edb.schema import objects as s_objects
 from edb.schema import pointers as s_pointers
@@ -243,6 +245,20 @@ class ResolverContextLevel(compiler.ContextLevel):
     compilation and also includes params needed for globals, from calls to ql
     compiler."""
 
+    schema_objects: Set[uuid.UUID]
+    """Ids of user schema objects whose tables are referenced by the query.
+    When empty, the query only reads the emulated catalogs and its
+    translation does not depend on the user schema."""
+
+    temp_tables: Dict[str, List[str]]
+    """Temporary tables created by the server for the duration of a single
+    statement (e.g. staging tables of COPY FROM), mapped to their columns.
+    These can be referenced as `pg_temp.<name>`."""
+
+    dml_stmts: List[irast.Statement]
+    """IR of the DML statements compiled with the EdgeQL compiler, which
+    includes the DML of the triggers they fire."""
+
     def __init__(
         self,
         prevlevel: Optional[ResolverContextLevel],
@@ -264,6 +280,9 @@ class ResolverContextLevel(compiler.ContextLevel):
             self.inheritance_ctes = dict()
             self.compiled_dml = dict()
             self.query_params = []
+            self.schema_objects = set()
+            self.temp_tables = dict()
+            self.dml_stmts = []
 
         else:
             self.schema = prevlevel.schema
@@ -275,6 +294,9 @@ class ResolverContextLevel(compiler.ContextLevel):
             self.inheritance_ctes = prevlevel.inheritance_ctes
             self.compiled_dml = prevlevel.compiled_dml
             self.query_params = prevlevel.query_params
+            self.schema_objects = prevlevel.schema_objects
+            self.temp_tables = prevlevel.temp_tables
+            self.dml_stmts = prevlevel.dml_stmts
 
             if mode == ContextSwitchMode.EMPTY:
                 self.scope = Scope(ctes=prevlevel.scope.ctes)
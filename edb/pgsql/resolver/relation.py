@@ -257,6 +257,15 @@ def resolve_relation(
         )
     elif relation.schemaname == 'pg_toast':
         preset_tables = ({relation.name: PG_TOAST_TABLE}, 'pg_toast')
+    elif relation.schemaname == 'pg_temp' and relation.name in ctx.temp_tables:
+        preset_tables = (
+            {
+                relation.name: [
+                    (c, None, 0) for c in ctx.temp_tables[relation.name]
+                ]
+            },
+            'pg_temp',
+        )
 
     if preset_tables and relation.name in preset_tables[0]:
         cols = [
@@ -319,6 +328,8 @@ def resolve_relation(
             pgext_code=pgerror.ERROR_UNDEFINED_TABLE,
         )
 
+    ctx.schema_objects.add(obj.id)
+
     # extract table name
     table = context.Table(schema_id=obj.id, name=relation.name)
 
@@ -27,6 +27,7 @@ from typing import (
     Union,
     AbstractSet,
     Iterable,
+    Iterator,
     Mapping,
     Sequence,
     Dict,
@@ -648,3 +649,71 @@ def get_expr_referrers(
                 result.setdefault(ref, []).append(fn)
 
     return result
+
+
+def iter_schema_expressions(
+    schema: s_schema.Schema,
+) -> Iterator[Expression]:
+    """Iterate over all expressions stored in fields of schema objects."""
+
+    for obj in schema.get_objects(exclude_internal=False, type=so.Object):
+        for fn, field in type(obj).get_schema_fields().items():
+            if not issubclass(
+                field.type, (Expression, ExpressionList, ExpressionDict)
+            ):
+                continue
+            value = obj.get_explicit_field_value(schema, fn, None)
+            if value is None:
+                continue
+            elif isinstance(value, Expression):
+                yield value
+            elif isinstance(value, ExpressionDict):
+                yield from value.values()
+            else:
+                yield from value
+
+
+def preparse_schema_expressions(
+    schema: s_schema.Schema,
+    *,
+    prev_schema: Optional[s_schema.Schema] = None,
+    batch_size: int = 32,
+) -> Iterator[None]:
+    """Parse all expressions of *schema* ahead of their first use.
+
+    This is a generator doing the work in steps of *batch_size*
+    expressions, so that it can be interleaved with other work.
+
+    Expressions of a freshly unpickled schema come without their ASTs.
+    If *prev_schema* (normally the previous version of the same schema)
+    is passed, the ASTs it has already parsed are reused for expressions
+    with the same text, so that only new or changed expressions are
+    actually parsed.
+    """
+
+    parsed: Dict[str, qlast_.Expr] = {}
+    if prev_schema is not None:
+        for i, expr in enumerate(iter_schema_expressions(prev_schema), 1):
+            # Expressions parsed with a different origin have different
+            # filenames in their spans, so only reuse exact matches.
+            if expr._qlast is not None and expr.origin is None:
+                parsed[expr.text] = expr._qlast
+            if i % batch_size == 0:
+                yield
+
+    n = 0
+    for expr in iter_schema_expressions(schema):
+        if expr._qlast is not None:
+            continue
+        if expr.origin is None and expr.text in parsed:
+            expr._qlast = parsed[expr.text]
+            continue
+        try:
+            expr.parse()
+        except Exception:
+            # Leave it to the first actual use of the expression
+            # to report the error.
+            pass
+        n += 1
+        if n % batch_size == 0:
+            yield
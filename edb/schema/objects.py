@@ -226,6 +226,10 @@ class ComparisonContext:
     deletions: Dict[Tuple[Type[Object], sn.Name], sd.DeleteObject[Object]]
     guidance: Optional[DeltaGuidance]
     parent_ops: List[sd.ObjectCommand[Any]]
+    similarities: Dict[
+        Tuple[uuid.UUID, uuid.UUID, s_schema.Schema, s_schema.Schema],
+        float,
+    ]
 
     def __init__(
         self,
@@ -241,6 +245,13 @@ class ComparisonContext:
         self.deletions = {}
         self.placeholder_ctr: Dict[str, int] = collections.Counter()
         self.parent_ops = []
+        # Results of Object.compare().  The same pairs get compared
+        # many times over the course of a diff: through the refdicts
+        # of every referrer, as top-level objects of their own class
+        # and on every pass of delta_schemas().  Comparisons only
+        # depend on the renames and deletions recorded so far, so the
+        # cache is dropped whenever those change.
+        self.similarities = {}
 
     def is_deleting(self, schema: s_schema.Schema, obj: Object) -> bool:
         return (type(obj), obj.get_name(schema)) in self.deletions
@@ -249,7 +260,21 @@ class ComparisonContext:
         self,
         op: sd.RenameObject[Object],
     ) -> None:
-        self.renames[op.get_schema_metaclass(), op.classname] = op
+        key = op.get_schema_metaclass(), op.classname
+        prev = self.renames.get(key)
+        if prev is None or prev.new_name != op.new_name:
+            self.similarities.clear()
+        self.renames[key] = op
+
+    def record_deletion(
+        self,
+        sclass: Type[Object],
+        op: sd.DeleteObject[Object],
+    ) -> None:
+        key = sclass, op.classname
+        if key not in self.deletions:
+            self.similarities.clear()
+        self.deletions[key] = op
 
     def is_renaming(self, schema: s_schema.Schema, obj: Object) -> bool:
         return (type(obj), obj.get_name(schema)) in self.renames
@@ -1349,6 +1374,11 @@ class Object(s_abc.Object, ObjectContainer, metaclass=ObjectMeta):
                 f'class {other.__class__.__name__!r} are not comparable'
             )
 
+        key = (self.id, other.id, our_schema, their_schema)
+        cached = context.similarities.get(key)
+        if cached is not None:
+            return cached
+
         cls = type(self)
 
         similarity = 1.0
@@ -1370,6 +1400,7 @@ class Object(s_abc.Object, ObjectContainer, metaclass=ObjectMeta):
 
             similarity *= fcoef
 
+        context.similarities[key] = similarity
         return similarity
 
     def is_blocking_ref(
@@ -1924,7 +1955,7 @@ class Object(s_abc.Object, ObjectContainer, metaclass=ObjectMeta):
         if context.generate_prompts:
             delta.set_annotation('orig_cmdclass', type(delta))
 
-        context.deletions[type(self), delta.classname] = delta
+        context.record_deletion(type(self), delta)
 
         ff = cls.get_fields(sorted=True).items()
         fields = {fn: f for fn, f in ff if f.simpledelta and not f.ephemeral}
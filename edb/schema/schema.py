@@ -1719,6 +1719,9 @@ class ChainedSchema(Schema):
             self._global_schema._get_object_ids(),
         )
 
+    def get_base_schema(self) -> Schema:
+        return self._base_schema
+
     def get_top_schema(self) -> Schema:
         return self._top_schema
 
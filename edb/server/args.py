@@ -1151,10 +1151,20 @@ compiler_options = typeutils.chain_decorators([
         "--client-schema-cache-size",
         type=int,
         default=100,
-        help="Number of client schemas each worker could cache at most. The "
+        help="Number of client schemas each worker could cache at most. "
+             "Clients with identical schemas share them and count once. The "
              "compiler server is not affected by this setting, it keeps a "
              "pickled copy of the client schema of all active clients."
     ),
+    click.option(
+        "--compile-cache-size",
+        type=int,
+        default=0,
+        help="Maximum total size in MiB of compiled queries the compiler "
+             "server keeps to reuse for identical requests from clients "
+             "with identical schemas and configuration. Default: 0, which "
+             "disables the cache."
+    ),
     click.option(
         '-I', '--listen-addresses', type=str, multiple=True,
         default=('localhost',),
@@ -20,6 +20,7 @@
 from __future__ import annotations
 
 from .stmt_cache import StatementsCache
+from .source_cache import SourceCache
 
 
-__all__ = ('StatementsCache',)
+__all__ = ('StatementsCache', 'SourceCache')
@@ -0,0 +1,65 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2024-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from __future__ import annotations
+from typing import Any, Protocol, TypeVar
+
+from edb.common import lru
+
+
+S = TypeVar('S', covariant=True)
+
+
+class SourceFactory(Protocol[S]):
+
+    def from_string(self, text: str) -> S:
+        ...
+
+
+class SourceCache:
+    """A memo of raw query text to its tokenized or normalized Source.
+
+    Tokenizing and normalizing a query runs on the I/O process for every
+    query message, before the compiled query cache can even be consulted.
+    Source objects are immutable and only depend on the text, including
+    the extracted constants, so the same object can be handed out for
+    byte-identical query texts.
+    """
+
+    def __init__(self, *, maxsize: int, max_text_len: int) -> None:
+        self._cache: lru.LRUMapping = lru.LRUMapping(maxsize=maxsize)
+        self._max_text_len = max_text_len
+
+    def get(self, factory: SourceFactory[S], text: str) -> tuple[S, bool]:
+        """Return the Source of *text* and whether it was cached."""
+        key: tuple[Any, str] = (factory, text)
+        source = self._cache.get(key)
+        if source is not None:
+            return source, True
+
+        source = factory.from_string(text)
+        if len(text) <= self._max_text_len:
+            self._cache[key] = source
+        return source, False
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
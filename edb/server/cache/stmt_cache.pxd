@@ -22,10 +22,16 @@ cdef class StatementsCache:
     cdef:
         object _dict
         int _maxsize
+        int _maxpinned
         object _dict_move_to_end
         object _dict_get
+        object _pinned
 
     cpdef get(self, key, default)
     cpdef needs_cleanup(self)
     cpdef cleanup_one(self)
+    cpdef bint pin(self, key)
+    cpdef unpin(self, key)
+    cpdef is_pinned(self, key)
     cpdef resize(self, int maxsize)
+    cpdef int get_maxsize(self)
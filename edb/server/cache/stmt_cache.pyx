@@ -42,10 +42,16 @@ cdef class StatementsCache:
     # So new entries and hits are always promoted to the end of the
     # entries dict, whereas the unused one will group in the
     # beginning of it.
+    #
+    # Pinned entries are never picked by `cleanup_one()` and do not
+    # count towards `max_size`; they are unpinned when removed.  There
+    # can be at most `maxpinned` of them.
 
-    def __init__(self, *, maxsize):
+    def __init__(self, *, maxsize, maxpinned=0):
         self.resize(maxsize)
+        self._maxpinned = maxpinned
         self._dict = collections.OrderedDict()
+        self._pinned = set()
         self._dict_move_to_end = self._dict.move_to_end
         self._dict_get = self._dict.get
 
@@ -57,10 +63,33 @@ cdef class StatementsCache:
         return o
 
     cpdef needs_cleanup(self):
-        return len(self._dict) > self._maxsize
+        return len(self._dict) - len(self._pinned) > self._maxsize
 
     cpdef cleanup_one(self):
-        return self._dict.popitem(last=False)
+        while True:
+            key, o = self._dict.popitem(last=False)
+            if key not in self._pinned:
+                return key, o
+            # Pinned entries are skipped over by moving them to the end
+            self._dict[key] = o
+
+    cpdef bint pin(self, key):
+        # Returns whether the entry is pinned, which it is not if there
+        # are `maxpinned` pinned entries already.
+        if key not in self._dict:
+            raise KeyError(key)
+        if key in self._pinned:
+            return True
+        if len(self._pinned) >= self._maxpinned:
+            return False
+        self._pinned.add(key)
+        return True
+
+    cpdef unpin(self, key):
+        self._pinned.discard(key)
+
+    cpdef is_pinned(self, key):
+        return key in self._pinned
 
     cpdef resize(self, int maxsize):
         if maxsize <= 0:
@@ -68,13 +97,18 @@ cdef class StatementsCache:
                 f'maxsize is expected to be greater than 0, got {maxsize}')
         self._maxsize = maxsize
 
+    cpdef int get_maxsize(self):
+        return self._maxsize
+
     def items(self):
         return self._dict.items()
 
     def clear(self):
         self._dict.clear()
+        self._pinned.clear()
 
     def pop(self, key, default=_LRU_MARKER):
+        self._pinned.discard(key)
         if default is _LRU_MARKER:
             return self._dict.pop(key)
         else:
@@ -94,6 +128,7 @@ cdef class StatementsCache:
 
     def __delitem__(self, key):
         del self._dict[key]
+        self._pinned.discard(key)
 
     def __contains__(self, key):
         return key in self._dict
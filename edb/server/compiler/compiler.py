@@ -119,6 +119,12 @@ if TYPE_CHECKING:
 
 EMPTY_MAP: immutables.Map[Any, Any] = immutables.Map()
 
+# Schema objects through which a query can schedule std::net requests.
+_NET_HTTP_SCHEDULE_REFS = frozenset({
+    s_name.QualName('std::net::http', 'ScheduledRequest'),
+    s_name.QualName('std::net::http', 'schedule_request'),
+})
+
 
 @dataclasses.dataclass(frozen=True)
 class CompilerDatabaseState:
@@ -1777,6 +1783,7 @@ def _compile_ql_query(
     current_tx = ctx.state.current_tx()
 
     sql_info: Dict[str, Any] = {}
+    stats_id: Optional[uuid.UUID] = None
     if (
         not ctx.bootstrap_mode
         and ctx.backend_runtime_params.has_stat_statements
@@ -1820,7 +1827,8 @@ def _compile_ql_query(
         id_hash.update(
             json.dumps(sql_info).encode(defines.EDGEDB_ENCODING)
         )
-        sql_info['id'] = str(uuidgen.from_bytes(id_hash.digest()))
+        stats_id = uuidgen.from_bytes(id_hash.digest())
+        sql_info['id'] = str(stats_id)
 
     base_schema = (
         ctx.compiler_state.std_schema
@@ -1967,11 +1975,35 @@ def _compile_ql_query(
         out_type_data=out_type_data,
         cacheable=cacheable,
         has_dml=bool(ir.dml_exprs),
+        schedules_net_requests=_schedules_net_requests(ir),
         query_asts=query_asts,
         warnings=ir.warnings,
+        stats_id=stats_id,
     )
 
 
+def _schedules_net_requests(ir: irast.Statement) -> bool:
+    # Only inserts are of interest: the net worker updating the
+    # requests it processes must not wake itself up again.
+    if not ir.dml_exprs or not any(
+        s_name.shortname_from_fullname(ref.get_name(ir.schema))
+        in _NET_HTTP_SCHEDULE_REFS
+        for ref in ir.schema_refs
+    ):
+        return False
+
+    for expr in ir.dml_exprs:
+        if isinstance(expr, qlast.InsertQuery):
+            if expr.subject.name == 'ScheduledRequest':
+                return True
+        elif isinstance(expr, qlast.FunctionCall):
+            fname = expr.func if isinstance(expr.func, str) else expr.func[1]
+            if fname == 'schedule_request':
+                return True
+
+    return False
+
+
 def _build_cache_function(
     ctx: CompileContext,
     ir: irast.Statement,
@@ -3003,6 +3035,9 @@ def _make_query_unit(
         unit.in_type_id = comp.in_type_id
 
         unit.cacheable = comp.cacheable
+        unit.stats_id = comp.stats_id
+        if comp.schedules_net_requests:
+            unit.schedules_net_requests = True
 
         if comp.is_explain:
             unit.is_explain = True
@@ -118,6 +118,12 @@ class Query(BaseQuery):
     query_asts: Any = None
     run_and_rollback: bool = False
 
+    # The ID of the query in sys::QueryStats, if tracked.
+    stats_id: Optional[uuid.UUID] = None
+
+    # True if the query may insert std::net::http::ScheduledRequest objects.
+    schedules_net_requests: bool = False
+
 
 @dataclasses.dataclass(frozen=True, kw_only=True)
 class SimpleQuery(BaseQuery):
@@ -345,6 +351,14 @@ class QueryUnit:
     run_and_rollback: bool = False
     append_tx_op: bool = False
 
+    # The ID of the query in sys::QueryStats, if tracked; also used to
+    # key the server-side statistics of the query.
+    stats_id: Optional[uuid.UUID] = None
+
+    # True if this unit may insert std::net::http::ScheduledRequest
+    # objects, so that the net worker should be woken up on commit.
+    schedules_net_requests: bool = False
+
     # Translation source map.
     source_map: Optional[pgcodegen.SourceMap] = None
     # For SQL queries, the length of the query prefix applied
@@ -538,6 +552,11 @@ class SQLQueryUnit:
     # True if it is safe to cache this unit.
     cacheable: bool = True
 
+    catalog_only: bool = False
+    """Whether the query only reads the emulated pg_catalog and
+    information_schema.  The translation of such queries does not depend
+    on the user schema, so it remains valid across DDL."""
+
     cardinality: enums.Cardinality = enums.Cardinality.NO_RESULT
 
     capabilities: enums.Capability = enums.Capability.NONE
@@ -571,6 +590,15 @@ class SQLQueryUnit:
 
     params: Optional[List[SQLParam]] = None
 
+    schedules_net_requests: bool = False
+    """Whether the query inserts std::net requests, directly or through
+    triggers, so the net worker needs to be woken up after it commits."""
+
+    copy_from: bool = False
+    """Whether this is a COPY ... FROM STDIN.  The query is then a script of
+    several statements, which must be executed with the simple query protocol
+    while relaying the COPY data sent by the client."""
+
 
 class CommandCompleteTag:
     """Dictates the tag of CommandComplete message that concludes this query."""
@@ -759,13 +787,16 @@ class SQLTransactionState:
 class ProposedMigrationStep(NamedTuple):
     statements: Tuple[str, ...]
     confidence: float
-    prompt: str
+    prompt: Optional[str]
     prompt_id: str
     data_safe: bool
     required_user_input: tuple[dict[str, str], ...]
     # This isn't part of the output data, but is used to figure out
     # what to prohibit when something is rejected.
-    operation_key: s_delta.CommandKey
+    operation_key: Optional[s_delta.CommandKey]
+    # The prompt and the operation key are computed from the statement
+    # only when the step is proposed, until then this holds its AST.
+    ddl_ast: Optional[qlast.DDLOperation] = None
 
     def to_json(self) -> Dict[str, Any]:
         return {
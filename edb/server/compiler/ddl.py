@@ -44,11 +44,13 @@ from edb.schema import database as s_db
 from edb.schema import ddl as s_ddl
 from edb.schema import delta as s_delta
 from edb.schema import expraliases as s_expraliases
+from edb.schema import extensions as s_exts
 from edb.schema import functions as s_func
 from edb.schema import globals as s_globals
 from edb.schema import indexes as s_indexes
 from edb.schema import links as s_links
 from edb.schema import migrations as s_migrations
+from edb.schema import modules as s_mod
 from edb.schema import objects as s_obj
 from edb.schema import objtypes as s_objtypes
 from edb.schema import policies as s_policies
@@ -58,6 +60,7 @@ from edb.schema import rewrites as s_rewrites
 from edb.schema import scalars as s_scalars
 from edb.schema import schema as s_schema
 from edb.schema import triggers as s_triggers
+from edb.schema import types as s_types
 from edb.schema import utils as s_utils
 from edb.schema import version as s_ver
 
@@ -397,19 +400,13 @@ def _process_delta(
         ctx, pgdelta, subblock, context=context
     )
 
-    # Performance hack; we really want trivial migration commands
-    # (that only mutate the migration log) to not trigger a pg_catalog
-    # view refresh, since many get issued as part of MIGRATION
-    # REWRITEs.
-    all_migration_tweaks = all(
-        isinstance(
-            cmd, (s_ver.AlterSchemaVersion, s_migrations.MigrationCommand)
-        )
-        and not cmd.get_subcommands(type=s_delta.ObjectCommand)
-        for cmd in delta.get_subcommands()
-    )
-
-    if not ctx.bootstrap_mode and not all_migration_tweaks:
+    # Refreshing the materialized views of the SQL catalog emulation
+    # rebuilds them from scratch, which gets expensive on large schemas,
+    # so only do it when the delta touches something they are built from.
+    # Notably, this keeps trivial migration commands (that only mutate
+    # the migration log), many of which get issued as part of MIGRATION
+    # REWRITEs, from triggering a refresh.
+    if not ctx.bootstrap_mode and _affects_sql_catalog(delta):
         from edb.pgsql import metaschema
         refresh = metaschema.generate_sql_information_schema_refresh(
             ctx.compiler_state.backend_runtime_params.instance_params.version
@@ -419,6 +416,43 @@ def _process_delta(
     return block, new_types, pgdelta.config_ops
 
 
+# Schema objects that the materialized views of the SQL catalog emulation
+# (edgedbsql.pg_class_, pg_attribute_ext, etc.) are computed from.
+_SQL_CATALOG_OBJECTS = (
+    s_mod.Module,
+    s_objtypes.ObjectType,
+    s_pointers.Pointer,
+    s_scalars.ScalarType,
+    s_types.Collection,
+    s_indexes.Index,
+    s_constraints.Constraint,
+    s_exts.Extension,
+)
+
+
+def _affects_sql_catalog(cmd: s_delta.Command) -> bool:
+    """Whether *cmd* requires the SQL catalog views to be refreshed.
+
+    Changes that only nest, say, access policies, triggers or annotations
+    under an object type don't alter the object type itself and so
+    don't count.
+    """
+    for subcmd in cmd.get_subcommands():
+        if (
+            isinstance(subcmd, s_delta.ObjectCommand)
+            and issubclass(
+                subcmd.get_schema_metaclass(), _SQL_CATALOG_OBJECTS)
+            and (
+                not isinstance(subcmd, s_delta.AlterObject)
+                or subcmd.get_subcommands(type=s_delta.AlterObjectProperty)
+            )
+        ):
+            return True
+        if _affects_sql_catalog(subcmd):
+            return True
+    return False
+
+
 def compile_dispatch_ql_migration(
     ctx: compiler.CompileContext,
     ql: qlast.MigrationCommand,
@@ -691,26 +725,8 @@ def _describe_current_migration(
                 for ddl_text, ddl_ast, top_op in proposed_ddl:
                     assert isinstance(top_op, s_delta.ObjectCommand)
 
-                    # get_ast has a lot of logic for figuring
-                    # out when an op is implicit in a parent
-                    # op. get_user_prompt does not have any of
-                    # that sort of logic, which makes it
-                    # susceptible to producing overly broad
-                    # messages. To avoid duplicating that sort
-                    # of logic, we recreate the delta from the
-                    # AST, and extract a user prompt from
-                    # *that*.
-                    # This is stupid, and it is slow.
-                    top_op2 = s_ddl.cmd_from_ddl(
-                        ddl_ast,
-                        schema=schema,
-                        modaliases=current_tx.get_modaliases(),
-                    )
-                    assert isinstance(top_op2, s_delta.ObjectCommand)
-                    prompt_key2, prompt_text = top_op2.get_user_prompt()
-
-                    # Similarly, some placeholders may not have made
-                    # it into the actual query, so filter them out.
+                    # Some placeholders may not have made it into
+                    # the actual query, so filter them out.
                     used_placeholders = {
                         p.name
                         for p in ast.find_children(ddl_ast, qlast.Placeholder)
@@ -732,28 +748,32 @@ def _describe_current_migration(
                     step = dbstate.ProposedMigrationStep(
                         statements=(ddl_text,),
                         confidence=confidence,
-                        prompt=prompt_text,
+                        # Filled in by _resolve_proposed_step()
+                        prompt=None,
                         prompt_id=prompt_id,
                         data_safe=top_op.is_data_safe(),
                         required_user_input=required_user_input,
-                        operation_key=prompt_key2,
+                        operation_key=None,
+                        ddl_ast=ddl_ast,
                     )
                     proposed_steps.append(step)
 
-                proposed_desc = proposed_steps[0].to_json()
-            else:
-                proposed_desc = None
-
             mstate = mstate._replace(
                 last_proposed=tuple(proposed_steps),
             )
 
             current_tx.update_migration_state(mstate)
+
+        if mstate.last_proposed:
+            proposed = _resolve_proposed_step(ctx, mstate.last_proposed[0])
+            if proposed is not mstate.last_proposed[0]:
+                mstate = mstate._replace(
+                    last_proposed=(proposed,) + mstate.last_proposed[1:],
+                )
+                current_tx.update_migration_state(mstate)
+            proposed_desc = proposed.to_json()
         else:
-            if mstate.last_proposed:
-                proposed_desc = mstate.last_proposed[0].to_json()
-            else:
-                proposed_desc = None
+            proposed_desc = None
 
         extra = {}
 
@@ -798,6 +818,39 @@ def _describe_current_migration(
     )
 
 
+def _resolve_proposed_step(
+    ctx: compiler.CompileContext,
+    step: dbstate.ProposedMigrationStep,
+) -> dbstate.ProposedMigrationStep:
+    if step.ddl_ast is None:
+        return step
+
+    # get_ast has a lot of logic for figuring out when an op is
+    # implicit in a parent op. get_user_prompt does not have any of
+    # that sort of logic, which makes it susceptible to producing
+    # overly broad messages. To avoid duplicating that sort of logic,
+    # we recreate the delta from the AST, and extract a user prompt
+    # from *that*.
+    #
+    # This is slow, so it is only done for the step that is actually
+    # proposed to the user, instead of for every step of the proposed
+    # script, which for large migrations mostly gets applied as a whole
+    # or regenerated before the later steps are ever looked at.
+    current_tx = ctx.state.current_tx()
+    top_op = s_ddl.cmd_from_ddl(
+        step.ddl_ast,
+        schema=current_tx.get_schema(ctx.compiler_state.std_schema),
+        modaliases=current_tx.get_modaliases(),
+    )
+    assert isinstance(top_op, s_delta.ObjectCommand)
+    operation_key, prompt = top_op.get_user_prompt()
+    return step._replace(
+        prompt=prompt,
+        operation_key=operation_key,
+        ddl_ast=None,
+    )
+
+
 def _alter_current_migration_reject_proposed(
     ctx: compiler.CompileContext,
     ql: qlast.AlterCurrentMigrationRejectProposed,
@@ -810,7 +863,8 @@ def _alter_current_migration_reject_proposed(
         # XXX: Or should we compute what the proposal would be?
         new_guidance = mstate.guidance
     else:
-        last = mstate.last_proposed[0]
+        last = _resolve_proposed_step(ctx, mstate.last_proposed[0])
+        assert last.operation_key is not None
         cmdclass_name, mcls, classname, new_name = last.operation_key
         if new_name is None:
             new_name = classname
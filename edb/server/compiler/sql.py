@@ -474,7 +474,26 @@ def _compile_sql(
                 # the "parse" phase.
             unit.command_complete_tag = stmt_resolved.command_complete_tag
             unit.params = stmt_resolved.params
-            if isinstance(stmt, pgast.DMLQuery) and not stmt.returning_list:
+            unit.catalog_only = stmt_resolved.catalog_only
+            if stmt_resolved.dml_stmts:
+                from . import compiler
+                unit.schedules_net_requests = any(
+                    compiler._schedules_net_requests(ir)
+                    for ir in stmt_resolved.dml_stmts
+                )
+            if stmt_resolved.copy_from is not None:
+                unit.query = _build_copy_from_script(
+                    stmt_resolved.copy_from, unit.query
+                )
+                # positions reported by the backend are relative to the
+                # script, which the source map knows nothing about
+                unit.source_map = None
+                unit.copy_from = True
+                unit.cardinality = enums.Cardinality.NO_RESULT
+                unit.capabilities |= enums.Capability.MODIFICATIONS
+            elif (
+                isinstance(stmt, pgast.DMLQuery) and not stmt.returning_list
+            ):
                 unit.cardinality = enums.Cardinality.NO_RESULT
             else:
                 unit.cardinality = enums.Cardinality.MANY
@@ -551,6 +570,26 @@ def _compile_sql(
     return sql_units
 
 
+def _build_copy_from_script(
+    copy_from: pg_resolver.CopyFrom, insert_query: str
+) -> str:
+    # The whole script runs in a single (possibly implicit) transaction, so
+    # if any of the statements fails, creation of the staging table is
+    # rolled back together with everything else.
+    staging = pg_common.qname('pg_temp', copy_from.staging_table)
+    columns = ', '.join(
+        f'{pg_common.quote_ident(name)} '
+        + pg_codegen.generate_source(pgast.TypeName(name=pg_type))
+        for name, pg_type in copy_from.staging_columns
+    )
+    return '\n'.join([
+        f'CREATE TEMPORARY TABLE {staging} ({columns});',
+        pg_codegen.generate_source(copy_from.copy_stmt) + ';',
+        insert_query + ';',
+        f'DROP TABLE {staging};',
+    ])
+
+
 @dataclasses.dataclass(kw_only=True, eq=False, repr=False)
 class ResolverOptionsPartial:
     current_user: str
@@ -21,6 +21,7 @@ from __future__ import annotations
 
 import asyncio
 import os
+import select
 import socket
 import struct
 import typing
@@ -37,6 +38,9 @@ class MessageStream:
         self._buffer = b''
         self._curmsg_len = -1
 
+    def has_partial_message(self):
+        return bool(self._buffer) or self._curmsg_len != -1
+
     def feed_data(self, data):
         # TODO: rewrite to avoid buffer copies.
         self._buffer += data
@@ -171,8 +175,21 @@ class WorkerConnection:
             )
         )
 
-    def iter_request(self):
+    def iter_request(self, on_idle=None):
         while True:
+            if (
+                on_idle is not None
+                and self._sock is not None
+                and not self._stream.has_partial_message()
+            ):
+                # Do background work in steps for as long as there is
+                # no request waiting to be read.  Never do it in the middle
+                # of a request that is still arriving in chunks.
+                while (
+                    not select.select([self._sock], [], [], 0)[0]
+                    and on_idle()
+                ):
+                    pass
             data = b'' if self._sock is None else self._sock.recv(4096)
             if not data:
                 # EOF received - abort
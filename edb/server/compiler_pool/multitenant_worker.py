@@ -21,6 +21,7 @@ from __future__ import annotations
 from typing import Any, Optional, NamedTuple
 
 import pickle
+import weakref
 
 import immutables
 
@@ -30,6 +31,7 @@ from edb import graphql
 from edb.common import debug
 from edb.common import uuidgen
 from edb.pgsql import params as pgparams
+from edb.schema import expr as s_expr
 from edb.schema import schema as s_schema
 from edb.server import compiler
 from edb.server import config
@@ -47,6 +49,11 @@ BACKEND_RUNTIME_PARAMS: pgparams.BackendRuntimeParams = (
 COMPILER: compiler.Compiler
 LAST_STATE: Optional[compiler.dbstate.CompilerConnectionState] = None
 STD_SCHEMA: s_schema.FlatSchema
+# Unpickled schemas by content hash, shared by all clients that have them.
+# An entry goes away as soon as no client references the schema anymore.
+SCHEMAS: weakref.WeakValueDictionary[bytes, s_schema.FlatSchema] = (
+    weakref.WeakValueDictionary()
+)
 
 
 class ClientSchema(NamedTuple):
@@ -83,6 +90,39 @@ def __init_worker__(
     )
 
 
+def _load_schema(
+    pickled: bytes | state.SchemaPickle,
+) -> s_schema.FlatSchema:
+    if not isinstance(pickled, state.SchemaPickle):
+        # The local multi-tenant pool sends plain pickles.
+        return pickle.loads(pickled)
+
+    schema = SCHEMAS.get(pickled.digest)
+    if schema is None:
+        if pickled.data is None:
+            raise state.FailedStateSync(
+                f"schema {pickled.digest.hex()} is not in the worker")
+        schema = pickle.loads(pickled.data)
+        SCHEMAS[pickled.digest] = schema
+    return schema
+
+
+def _preparse_user_schema(
+    client_id: int,
+    dbname: str,
+    user_schema: Optional[s_schema.FlatSchema],
+    prev_user_schema: Optional[s_schema.FlatSchema] = None,
+) -> None:
+    # Parse the expressions of a newly received schema between requests,
+    # so that the first queries after a DDL don't have to.
+    if user_schema is not None:
+        worker_proc.schedule_idle(
+            (client_id, dbname),
+            s_expr.preparse_schema_expressions(
+                user_schema, prev_schema=prev_user_schema),
+        )
+
+
 def __sync__(client_id, pickled_schema, invalidation) -> None:
     global clients
 
@@ -101,7 +141,7 @@ def __sync__(client_id, pickled_schema, invalidation) -> None:
                         (
                             None
                             if pickled_state.user_schema is None
-                            else pickle.loads(pickled_state.user_schema)
+                            else _load_schema(pickled_state.user_schema)
                         ),
                         pickle.loads(pickled_state.reflection_cache),
                         pickle.loads(pickled_state.database_config),
@@ -110,9 +150,12 @@ def __sync__(client_id, pickled_schema, invalidation) -> None:
                 }
                 if debug.flags.server:
                     print(client_id, "FULL SYNC: ", list(dbs))
+                for dbname, db_state in dbs.items():
+                    _preparse_user_schema(
+                        client_id, dbname, db_state.user_schema)
                 client_schema = ClientSchema(
                     immutables.Map(dbs),
-                    pickle.loads(pickled_schema.global_schema),
+                    _load_schema(pickled_schema.global_schema),
                     pickle.loads(pickled_schema.instance_config),
                 )
                 clients = clients.set(client_id, client_schema)
@@ -128,19 +171,27 @@ def __sync__(client_id, pickled_schema, invalidation) -> None:
                             assert pickled_state.database_config is not None
                             db_state = state.DatabaseState(
                                 dbname,
-                                pickle.loads(pickled_state.user_schema),
+                                _load_schema(pickled_state.user_schema),
                                 pickle.loads(pickled_state.reflection_cache),
                                 pickle.loads(pickled_state.database_config),
                             )
                             if debug.flags.server:
                                 print(client_id, "DIFF SYNC ADD: ", dbname)
+                            _preparse_user_schema(
+                                client_id, dbname, db_state.user_schema)
                             dbs = dbs.set(dbname, db_state)
                         else:
                             db_updates = {}
                             if pickled_state.user_schema is not None:
-                                db_updates["user_schema"] = pickle.loads(
+                                db_updates["user_schema"] = _load_schema(
                                     pickled_state.user_schema
                                 )
+                                _preparse_user_schema(
+                                    client_id,
+                                    dbname,
+                                    db_updates["user_schema"],
+                                    db_state.user_schema,
+                                )
                             if pickled_state.reflection_cache is not None:
                                 db_updates["reflection_cache"] = pickle.loads(
                                     pickled_state.reflection_cache
@@ -167,7 +218,7 @@ def __sync__(client_id, pickled_schema, invalidation) -> None:
                 if dbs is not client_schema.dbs:
                     updates["dbs"] = dbs
                 if pickled_schema.global_schema is not None:
-                    updates["global_schema"] = pickle.loads(
+                    updates["global_schema"] = _load_schema(
                         pickled_schema.global_schema
                     )
                 if pickled_schema.instance_config is not None:
@@ -22,6 +22,7 @@ import asyncio
 import collections
 import hmac
 import functools
+import hashlib
 import logging
 import os
 import pickle
@@ -60,7 +61,7 @@ def next_tx_state_id():
 
 
 class PickledState(typing.NamedTuple):
-    user_schema: typing.Optional[bytes]
+    user_schema: typing.Optional[state_mod.SchemaPickle]
     reflection_cache: typing.Optional[bytes]
     database_config: typing.Optional[bytes]
 
@@ -81,7 +82,7 @@ class PickledState(typing.NamedTuple):
 
 class ClientSchema(typing.NamedTuple):
     dbs: immutables.Map[str, PickledState]
-    global_schema: typing.Optional[bytes]
+    global_schema: typing.Optional[state_mod.SchemaPickle]
     instance_config: typing.Optional[bytes]
     dropped_dbs: tuple
 
@@ -108,6 +109,80 @@ class ClientSchema(typing.NamedTuple):
             instance_config = self.instance_config
         return ClientSchema(dbs, global_schema, instance_config, dropped_dbs)
 
+    def get_schema_digests(self) -> list[bytes]:
+        rv = [
+            state.user_schema.digest
+            for state in self.dbs.values()
+            if state.user_schema is not None
+        ]
+        if self.global_schema is not None:
+            rv.append(self.global_schema.digest)
+        return rv
+
+    def get_schema_key(self) -> tuple[bytes, ...]:
+        # Clients with identical schemas share them in a worker, and so
+        # take up a single slot in its cache.
+        return tuple(sorted(self.get_schema_digests()))
+
+    def strip_schemas(self, digests: typing.Container[bytes]) -> ClientSchema:
+        # Leave out the data of the schemas a worker already has.
+        def strip(pickled):
+            if pickled is not None and pickled.digest in digests:
+                return pickled.without_data()
+            else:
+                return pickled
+
+        return self._replace(
+            dbs=immutables.Map(
+                (dbname, state._replace(user_schema=strip(state.user_schema)))
+                for dbname, state in self.dbs.items()
+            ),
+            global_schema=strip(self.global_schema),
+        )
+
+
+class CompileResultCache:
+    """Compilation results shared between clients.
+
+    Results are addressed by a hash of everything the compilation depends
+    on: the schemas, the configuration and the compilation request.  So
+    clients with identical schemas (replicas of the same instance, or
+    branches cloned from the same source) reuse each other's results.
+    The cache is bounded by the total size of the pickled results.
+    """
+
+    def __init__(self, max_size: int):
+        self._entries: collections.OrderedDict[bytes, bytes] = (
+            collections.OrderedDict())
+        self._max_size = max_size
+        self._size = 0
+
+    def get(self, key: bytes) -> typing.Optional[bytes]:
+        result = self._entries.get(key)
+        if result is None:
+            metrics.compile_cache_requests.inc(1.0, "miss")
+        else:
+            self._entries.move_to_end(key, last=True)
+            metrics.compile_cache_requests.inc(1.0, "hit")
+        return result
+
+    def put(self, key: bytes, result: bytes) -> None:
+        if len(result) > self._max_size or key in self._entries:
+            return
+        self._entries[key] = result
+        self._size += len(result)
+        while self._size > self._max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+        metrics.current_compile_cache.set(self._size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
 
 class Worker(pool_mod.Worker):
     def __init__(
@@ -135,31 +210,69 @@ class Worker(pool_mod.Worker):
         self._cache = collections.OrderedDict()
         self._invalidated_clients = []
         self._last_used_by_client = {}
+        # Number of cached clients referencing each schema (by digest),
+        # and each distinct set of schemas (by ClientSchema.get_schema_key).
+        self._schema_refs = collections.Counter()
+        self._schema_key_refs = collections.Counter()
+
+    def _add_refs(self, client_schema):
+        self._schema_refs.update(client_schema.get_schema_digests())
+        self._schema_key_refs[client_schema.get_schema_key()] += 1
+
+    def _remove_refs(self, client_schema):
+        for refs, keys in (
+            (self._schema_refs, client_schema.get_schema_digests()),
+            (self._schema_key_refs, [client_schema.get_schema_key()]),
+        ):
+            for key in keys:
+                refs[key] -= 1
+                if refs[key] <= 0:
+                    del refs[key]
 
     def get_client_schema(self, client_id):
         return self._cache.get(client_id)
 
     def set_client_schema(self, client_id, client_schema):
+        prev = self._cache.get(client_id)
+        if prev is not client_schema:
+            if prev is not None:
+                self._remove_refs(prev)
+            self._add_refs(client_schema)
         self._cache[client_id] = client_schema
         self._cache.move_to_end(client_id, last=False)
         self._last_used_by_client[client_id] = time.monotonic()
 
+    def has_schemas_of(self, client_schema):
+        return client_schema.get_schema_key() in self._schema_key_refs
+
+    def get_cached_schemas(self):
+        return self._schema_refs.keys()
+
     def cache_size(self):
-        return len(self._cache) - len(self._invalidated_clients)
+        return len(self._schema_key_refs)
 
     def last_used(self, client_id):
         return self._last_used_by_client.get(client_id, 0)
 
     def invalidate(self, client_id):
-        if self._cache.pop(client_id, None):
+        client_schema = self._cache.pop(client_id, None)
+        if client_schema:
             self._invalidated_clients.append(client_id)
+            self._remove_refs(client_schema)
         self._last_used_by_client.pop(client_id, None)
 
-    def invalidate_last(self, cache_size):
-        if len(self._cache) == cache_size:
-            client_id, _ = self._cache.popitem(last=True)
+    def invalidate_last(self, cache_size, client_schema):
+        # Make room for the schemas of a new client, unless the worker
+        # already has them for another client.
+        while (
+            self._cache
+            and not self.has_schemas_of(client_schema)
+            and self.cache_size() >= cache_size
+        ):
+            client_id, evicted = self._cache.popitem(last=True)
             self._invalidated_clients.append(client_id)
             self._last_used_by_client.pop(client_id, None)
+            self._remove_refs(evicted)
 
     def flush_invalidation(self):
         rv, self._invalidated_clients = self._invalidated_clients, []
@@ -192,14 +305,31 @@ class MultiSchemaPool(pool_mod.FixedPool):
     _worker_mod = "multitenant_worker"
     _workers: typing.Dict[int, Worker]  # type: ignore
     _clients: typing.Dict[int, ClientSchema]
+    _result_cache: typing.Optional[CompileResultCache]
+    _content_keys: typing.Dict[
+        tuple[int, str],
+        tuple[PickledState, ClientSchema, bytes],
+    ]
 
-    def __init__(self, cache_size, *, secret, **kwargs):
+    def __init__(
+        self,
+        cache_size,
+        *,
+        secret,
+        compile_cache_size=0,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self._catalog_version = None
         self._inited = asyncio.Event()
         self._cache_size = cache_size
         self._clients = {}
         self._secret = secret
+        self._result_cache = (
+            CompileResultCache(compile_cache_size)
+            if compile_cache_size > 0 else None
+        )
+        self._content_keys = {}
 
     def _init(self, kwargs: dict[str, typing.Any]) -> None:
         # this is deferred to _init_server()
@@ -264,14 +394,18 @@ class MultiSchemaPool(pool_mod.FixedPool):
                 (
                     dbname,
                     PickledState(
-                        state.user_schema_pickle,
+                        (
+                            None if state.user_schema_pickle is None
+                            else state_mod.SchemaPickle.new(
+                                state.user_schema_pickle)
+                        ),
                         pickle.dumps(state.reflection_cache, -1),
                         pickle.dumps(state.database_config, -1),
                     ),
                 )
                 for dbname, state in dbs.items()
             ),
-            global_schema_pickle,
+            state_mod.SchemaPickle.new(global_schema_pickle),
             system_config_pickled,
             (),
         )
@@ -296,13 +430,18 @@ class MultiSchemaPool(pool_mod.FixedPool):
             assert database_config is not None
             client_updates["dbs"] = client.dbs.set(
                 dbname,
-                PickledState(user_schema, reflection_cache, database_config),
+                PickledState(
+                    state_mod.SchemaPickle.new(user_schema),
+                    reflection_cache,
+                    database_config,
+                ),
             )
         else:
-            updates = {}
+            updates: dict[str, typing.Any] = {}
 
             if user_schema is not None:
-                updates["user_schema"] = user_schema
+                updates["user_schema"] = state_mod.SchemaPickle.new(
+                    user_schema)
             if reflection_cache is not None:
                 updates["reflection_cache"] = reflection_cache
             if database_config is not None:
@@ -313,7 +452,8 @@ class MultiSchemaPool(pool_mod.FixedPool):
                 client_updates["dbs"] = client.dbs.set(dbname, db)
 
         if global_schema is not None:
-            client_updates["global_schema"] = global_schema
+            client_updates["global_schema"] = state_mod.SchemaPickle.new(
+                global_schema)
 
         if system_config is not None:
             client_updates["instance_config"] = system_config
@@ -324,15 +464,67 @@ class MultiSchemaPool(pool_mod.FixedPool):
         else:
             return False
 
-    def _weighter(self, client_id, worker: Worker):
-        client_schema = worker.get_client_schema(client_id)
+    def _get_content_key(self, client_id: int, dbname: str) -> bytes:
+        # Hash of the pickled schemas and configuration of a branch of
+        # the client, recomputed only when the client syncs new ones.
+        client = self._clients[client_id]
+        db = client.dbs[dbname]
+        entry = self._content_keys.get((client_id, dbname))
+        if (
+            entry is not None
+            and entry[0] is db
+            and entry[1].global_schema is client.global_schema
+            and entry[1].instance_config is client.instance_config
+        ):
+            return entry[2]
+
+        hash_obj = hashlib.blake2b(digest_size=16)
+        for part in (
+            db.user_schema.digest if db.user_schema is not None else None,
+            db.reflection_cache,
+            db.database_config,
+            (
+                client.global_schema.digest
+                if client.global_schema is not None else None
+            ),
+            client.instance_config,
+        ):
+            if part is None:
+                hash_obj.update(b"\x00")
+            else:
+                hash_obj.update(b"\x01")
+                hash_obj.update(len(part).to_bytes(8, "big"))
+                hash_obj.update(part)
+        key = hash_obj.digest()
+        self._content_keys[client_id, dbname] = (db, client, key)
+        return key
+
+    def _get_result_cache_key(
+        self,
+        client_id: int,
+        method_name: str,
+        args: tuple,
+    ) -> typing.Optional[bytes]:
+        if self._result_cache is None or method_name != "compile":
+            return None
+        dbname, serialized_request = args[0], args[6]
+        # The compilation request ends with its own cache key, a hash of
+        # the query source, the session state and the schema version.
         return (
-            bool(client_schema),
-            worker.last_used(client_id)
-            if client_schema
-            else self._cache_size - worker.cache_size(),
+            self._get_content_key(client_id, dbname)
+            + bytes(serialized_request)
         )
 
+    def _weighter(self, client_id, worker: Worker):
+        # Prefer the workers that have the client's schemas, either for
+        # the client itself or for another client with identical ones.
+        if worker.get_client_schema(client_id):
+            return (2, worker.last_used(client_id))
+        room = self._cache_size - worker.cache_size()
+        if worker.has_schemas_of(self._clients[client_id]):
+            return (1, room)
+        return (0, room)
+
     async def _call_for_client(
         self,
         client_id,
@@ -347,6 +539,14 @@ class MultiSchemaPool(pool_mod.FixedPool):
                 f"failed to sync compiler server state: "
                 f"{type(ex).__name__}({ex})"
             ) from ex
+
+        cache_key = self._get_result_cache_key(client_id, method_name, args)
+        if cache_key is not None:
+            assert self._result_cache is not None
+            resp = self._result_cache.get(cache_key)
+            if resp is not None:
+                return resp
+
         worker = await self._acquire_worker(
             weighter=functools.partial(self._weighter, client_id)
         )
@@ -360,10 +560,12 @@ class MultiSchemaPool(pool_mod.FixedPool):
             else:
                 if cache is None:
                     # make room for the new client in this worker
-                    worker.invalidate_last(self._cache_size)
+                    worker.invalidate_last(self._cache_size, client_schema)
                 else:
                     # only send the difference in user schema
                     diff = client_schema.diff(cache)
+                # don't send the schemas the worker already has
+                diff = diff.strip_schemas(worker.get_cached_schemas())
                 if updated:
                     # re-pickle the request if user schema changed
                     msg = None
@@ -387,6 +589,11 @@ class MultiSchemaPool(pool_mod.FixedPool):
                     if new_pickled_state:
                         sid = worker._last_pickled_state = next_tx_state_id()
                         resp = pickle.dumps((0, (*data[0], sid)), -1)
+                    elif cache_key is not None:
+                        # Only results that don't start a transaction are
+                        # independent of the worker they came from.
+                        assert self._result_cache is not None
+                        self._result_cache.put(cache_key, bytes(resp))
             elif status == 1:
                 exc, _tb = data
                 if not isinstance(exc, state_mod.FailedStateSync):
@@ -493,6 +700,8 @@ class MultiSchemaPool(pool_mod.FixedPool):
     def client_disconnected(self, client_id):
         logger.debug("Client %d disconnected, invalidating cache.", client_id)
         self._clients.pop(client_id, None)
+        for key in [k for k in self._content_keys if k[0] == client_id]:
+            del self._content_keys[key]
         for worker in self._workers.values():
             worker.invalidate(client_id)
 
@@ -596,6 +805,7 @@ async def server_main(
     listen_port,
     pool_size,
     client_schema_cache_size,
+    compile_cache_size,
     runstate_dir,
     metrics_port,
 ):
@@ -623,6 +833,7 @@ async def server_main(
             runstate_dir=runstate_dir,
             pool_size=pool_size,
             cache_size=client_schema_cache_size,
+            compile_cache_size=compile_cache_size * 1024 * 1024,
             secret=secret.encode(),
         )
         await pool.start()
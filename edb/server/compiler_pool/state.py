@@ -17,6 +17,9 @@
 #
 
 
+from __future__ import annotations
+
+import hashlib
 import typing
 
 import immutables
@@ -44,6 +47,25 @@ class PickledDatabaseState(typing.NamedTuple):
     database_config: immutables.Map[str, config.SettingValue]
 
 
+class SchemaPickle(typing.NamedTuple):
+    """A pickled schema addressed by the hash of its content.
+
+    The compiler server leaves out ``data`` when sending a schema to a
+    worker that already holds one with the same ``digest`` for another
+    client, so that both clients share the same unpickled schema.
+    """
+
+    digest: bytes
+    data: typing.Optional[bytes]
+
+    @classmethod
+    def new(cls, data: bytes) -> SchemaPickle:
+        return cls(hashlib.blake2b(data, digest_size=16).digest(), data)
+
+    def without_data(self) -> SchemaPickle:
+        return SchemaPickle(self.digest, None)
+
+
 class FailedStateSync(Exception):
     pass
 
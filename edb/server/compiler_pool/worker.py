@@ -28,6 +28,7 @@ from edb import edgeql
 from edb import graphql
 from edb.common import uuidgen
 from edb.pgsql import params as pgparams
+from edb.schema import expr as s_expr
 from edb.schema import schema as s_schema
 from edb.server import compiler
 from edb.server import config
@@ -93,6 +94,10 @@ def __init_worker__(
     GLOBAL_SCHEMA = pickle.loads(global_schema_pickle)
     INSTANCE_CONFIG = system_config
 
+    for dbname, db in DBS.items():
+        if db.user_schema is not None:
+            _preparse_user_schema(dbname, db.user_schema)
+
     COMPILER = compiler.new_compiler(
         std_schema,
         refl_schema,
@@ -102,6 +107,20 @@ def __init_worker__(
     )
 
 
+def _preparse_user_schema(
+    dbname: str,
+    user_schema: s_schema.FlatSchema,
+    prev_user_schema: Optional[s_schema.FlatSchema] = None,
+) -> None:
+    # Parse the expressions of a newly received schema between requests,
+    # so that the first queries after a DDL don't have to.
+    worker_proc.schedule_idle(
+        dbname,
+        s_expr.preparse_schema_expressions(
+            user_schema, prev_schema=prev_user_schema),
+    )
+
+
 def __sync__(
     dbname: str,
     user_schema: Optional[bytes],
@@ -130,11 +149,14 @@ def __sync__(
                 database_config_unpacked,
             )
             DBS = DBS.set(dbname, db)
+            _preparse_user_schema(dbname, db.user_schema)
         else:
             updates = {}
 
             if user_schema is not None:
                 updates['user_schema'] = pickle.loads(user_schema)
+                _preparse_user_schema(
+                    dbname, updates['user_schema'], db.user_schema)
             if reflection_cache is not None:
                 updates['reflection_cache'] = pickle.loads(reflection_cache)
             if database_config is not None:
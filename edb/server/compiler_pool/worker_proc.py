@@ -16,6 +16,7 @@
 # limitations under the License.
 #
 
+from typing import Any, Iterator
 
 import argparse
 import gc
@@ -38,11 +39,43 @@ from . import amsg
 # is less than NUM_SPAWNS_RESET_INTERVAL seconds.
 NUM_SPAWNS_RESET_INTERVAL = 1
 
+# Generators doing background work between requests, see schedule_idle().
+_idle_jobs: dict[Any, Iterator[None]] = {}
+
+
+def schedule_idle(key, job):
+    """Run the *job* generator step by step while the worker is idle.
+
+    A job replaces any pending job scheduled with the same *key*.
+    """
+    _idle_jobs.pop(key, None)
+    _idle_jobs[key] = job
+
+
+def run_idle_step():
+    """Advance the oldest idle job by one step.
+
+    Return True if there is more work pending.
+    """
+    while _idle_jobs:
+        key, job = next(iter(_idle_jobs.items()))
+        try:
+            next(job)
+        except StopIteration:
+            del _idle_jobs[key]
+        except Exception as ex:
+            del _idle_jobs[key]
+            if debug.flags.server:
+                markup.dump(ex)
+        else:
+            return True
+    return False
+
 
 def worker(sockname, version_serial, get_handler):
     con = amsg.WorkerConnection(sockname, version_serial)
     try:
-        for req_id, req in con.iter_request():
+        for req_id, req in con.iter_request(on_idle=run_idle_step):
             try:
                 methname, args = pickle.loads(req)
                 meth = get_handler(methname)
@@ -18,6 +18,7 @@
 import os
 from .pool import Pool as Pool1Impl, _NaivePool  # NoQA
 from .pool2 import Pool as Pool2Impl
+from .demand import DemandHistory
 
 # During the transition period we allow for the pool to be swapped out. The
 # current default is to use the old pool, however this will be switched to use
@@ -30,4 +31,4 @@ else:
     Pool = Pool1Impl  # type: ignore
     Pool2 = Pool2Impl  # type: ignore
 
-__all__ = ('Pool', 'Pool2')
+__all__ = ('Pool', 'Pool2', 'DemandHistory')
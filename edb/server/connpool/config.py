@@ -24,4 +24,9 @@ MIN_IDLE_TIME_BEFORE_GC = 120
 CONNECT_FAILURE_RETRIES = 3
 STATS_COLLECT_INTERVAL = 0.1
 
+# Per-branch demand history used to pre-open connections on a cold pool
+DEMAND_SAMPLE_INTERVAL = 10
+DEMAND_PERSIST_INTERVAL = 60
+DEMAND_HISTORY_DECAY = 0.99
+
 logger = logging.getLogger("edb.server")
@@ -0,0 +1,98 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2024-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import math
+import typing
+
+from . import config
+
+
+class BlockStats(typing.Protocol):
+    # Structurally matches the BlockSnapshot of both pool implementations.
+    dbname: str
+    nconns: int
+    nwaiters: int
+
+
+class DemandHistory:
+    # Remembers how many backend connections each branch needed, so that a
+    # cold pool (after a restart or an HA switchover) can pre-open them
+    # instead of letting the first requests pay for connecting.
+    #
+    # Every sample keeps the maximum of the current demand (connections in
+    # use or idle in the block plus waiters) and the decayed previous value,
+    # so that recent peaks are remembered while branches that went quiet
+    # fade out of the history.
+
+    _demand: dict[str, float]
+    _decay: float
+
+    def __init__(
+        self,
+        *,
+        decay: float = config.DEMAND_HISTORY_DECAY,
+    ) -> None:
+        self._demand = {}
+        self._decay = decay
+
+    def record(self, blocks: typing.Iterable[BlockStats]) -> None:
+        current = {
+            block.dbname: block.nconns + block.nwaiters for block in blocks
+        }
+        for dbname in current.keys() | self._demand.keys():
+            demand = max(
+                current.get(dbname, 0),
+                self._demand.get(dbname, 0) * self._decay,
+            )
+            if demand < 0.5:
+                self._demand.pop(dbname, None)
+            else:
+                self._demand[dbname] = demand
+
+    def forget(self, dbname: str) -> None:
+        self._demand.pop(dbname, None)
+
+    def get_quotas(self, capacity: int) -> dict[str, int]:
+        """Number of connections to pre-open per branch within *capacity*.
+
+        When the remembered demand doesn't fit, the capacity is split
+        proportionally to it.
+        """
+        total = sum(self._demand.values())
+        if not total or capacity <= 0:
+            return {}
+        scale = min(1.0, capacity / total)
+        quotas = {}
+        for dbname, demand in sorted(
+            self._demand.items(), key=lambda item: -item[1]
+        ):
+            n = min(math.floor(demand * scale + 0.5), capacity)
+            if n > 0:
+                quotas[dbname] = n
+                capacity -= n
+        return quotas
+
+    def dump(self) -> dict[str, float]:
+        return dict(self._demand)
+
+    def load(self, data: typing.Mapping[str, float]) -> None:
+        for dbname, demand in data.items():
+            self._demand[dbname] = max(
+                float(demand), self._demand.get(dbname, 0)
+            )
@@ -220,7 +220,12 @@ class Block(typing.Generic[C]):
 
         return self.conn_stack.popleft()
 
-    async def try_acquire(self, *, attempts: int = 1) -> typing.Optional[C]:
+    async def try_acquire(
+        self,
+        *,
+        attempts: int = 1,
+        prefer: typing.Optional[typing.Callable[[C], bool]] = None,
+    ) -> typing.Optional[C]:
         self.conn_waiters_num += 1
         try:
             # Skip the waiters' queue if we can grab a connection from the
@@ -264,17 +269,31 @@ class Block(typing.Generic[C]):
             # woken up with an empty queue -- hence the 'try'.
             # acquire will put a while loop around this
 
-            # Yield the most recently used connection from the top of the stack
-            if self.conn_stack:
-                return self.conn_stack.pop()
-            else:
+            if not self.conn_stack:
                 return None
+
+            if prefer is not None:
+                # Yield the most recently used idle connection the caller
+                # prefers, if there is one in the stack.
+                for conn in reversed(self.conn_stack):
+                    if prefer(conn):
+                        self.conn_stack.remove(conn)
+                        return conn
+
+            # Yield the most recently used connection from the top of the stack
+            return self.conn_stack.pop()
         finally:
             self.conn_waiters_num -= 1
 
-    async def acquire(self) -> C:
+    async def acquire(
+        self,
+        *,
+        prefer: typing.Optional[typing.Callable[[C], bool]] = None,
+    ) -> C:
         attempts = 1
-        while (c := await self.try_acquire(attempts=attempts)) is None:
+        while (
+            c := await self.try_acquire(attempts=attempts, prefer=prefer)
+        ) is None:
             attempts += 1
         return c
 
@@ -1087,7 +1106,11 @@ class Pool(BasePool[C]):
 
         return None, None
 
-    async def _acquire(self, dbname: str) -> C:
+    async def _acquire(
+        self,
+        dbname: str,
+        prefer: typing.Optional[typing.Callable[[C], bool]],
+    ) -> C:
         block = self._get_block(dbname)
         block.suppressed = False
 
@@ -1116,7 +1139,7 @@ class Pool(BasePool[C]):
                 # Block has no connections at all, or not enough connections.
                 self._schedule_new_conn(block)
 
-            return await block.acquire()
+            return await block.acquire(prefer=prefer)
 
         if not block_nconns:
             # This is a block without any connections.
@@ -1124,15 +1147,15 @@ class Pool(BasePool[C]):
             # reallocated for this block.
             if not self._try_steal_conn(block):
                 self._new_blocks_waitlist[block] = True
-            return await block.acquire()
+            return await block.acquire(prefer=prefer)
 
         if block_nconns < block.quota:
             # Let's see if we can steal a connection from some block
             # that's over quota and open a new one.
             self._try_steal_conn(block)
-            return await block.acquire()
+            return await block.acquire(prefer=prefer)
 
-        return await block.acquire()
+        return await block.acquire(prefer=prefer)
 
     def _run_gc(self) -> None:
         loop = self._get_loop()
@@ -1159,11 +1182,22 @@ class Pool(BasePool[C]):
             while (conn := block.try_steal(only_older_than)) is not None:
                 self._schedule_discard(block, conn)
 
-    async def acquire(self, dbname: str) -> C:
+    async def acquire(
+        self,
+        dbname: str,
+        *,
+        prefer: typing.Optional[typing.Callable[[C], bool]] = None,
+    ) -> C:
+        """Acquire a connection to *dbname*.
+
+        If *prefer* is given, an idle connection for which it returns True
+        is handed out instead of the most recently used one, if there is
+        any.  This never makes the caller wait longer.
+        """
         self._nacquires += 1
         self._maybe_schedule_tick()
         try:
-            conn = await self._acquire(dbname)
+            conn = await self._acquire(dbname, prefer)
         finally:
             self._nacquires -= 1
 
@@ -1222,12 +1256,35 @@ class Pool(BasePool[C]):
         block.release(conn)
 
         # Only request for GC if the connection is released unused
+        self._request_gc()
+
+    def _request_gc(self) -> None:
         self._gc_requests += 1
         if self._gc_requests == 1:
             # Only schedule GC for the very first request - following
             # requests will be grouped into the next GC
             self._get_loop().call_later(self._gc_interval, self._run_gc)
 
+    def prefill(self, quotas: typing.Mapping[str, int]) -> None:
+        """Open connections ahead of demand, up to *quotas* per database.
+
+        Only the free capacity of the pool is used, and connections that
+        stay unused are garbage-collected as usual.
+        """
+        self._maybe_schedule_tick()
+        capacity = self._max_capacity - self._cur_capacity
+        for dbname, nconns in quotas.items():
+            block = self._get_block(dbname)
+            if block.suppressed:
+                continue
+            missing = min(nconns - block.count_conns(), capacity)
+            for _ in range(missing):
+                self._schedule_new_conn(block, 'prefilled')
+            capacity -= max(missing, 0)
+            if capacity <= 0:
+                break
+        self._request_gc()
+
     async def prune_inactive_connections(self, dbname: str) -> None:
         try:
             block = self._blocks[dbname]
@@ -276,9 +276,18 @@ class Pool(typing.Generic[C]):
     async def _perform_prune(self, id: int) -> None:
         self._prunes[id].set_result(None)
 
-    async def acquire(self, dbname: str) -> C:
+    async def acquire(
+        self,
+        dbname: str,
+        *,
+        prefer: typing.Optional[typing.Callable[[C], bool]] = None,
+    ) -> C:
         """Acquire a connection from the database. This connection must be
-        released."""
+        released.
+
+        The *prefer* hint is accepted for compatibility with the Python pool,
+        but the Rust pool does not support choosing a specific connection
+        yet, so it is ignored."""
         if not self._task:
             raise asyncio.CancelledError()
         for i in range(config.CONNECT_FAILURE_RETRIES + 1):
@@ -324,6 +333,32 @@ class Pool(typing.Generic[C]):
             self._pool._release(id)
         self._try_read()
 
+    def prefill(self, quotas: typing.Mapping[str, int]) -> None:
+        """Open connections ahead of demand, up to *quotas* per database.
+
+        The Rust pool only connects on demand, so this acquires and
+        immediately releases the connections within the free capacity.
+        """
+        if not self._task:
+            return
+        capacity = self._max_capacity - self._cur_capacity
+        for dbname, nconns in quotas.items():
+            for _ in range(min(nconns, capacity)):
+                self._loop.create_task(self._prefill_one(dbname))
+            capacity -= nconns
+            if capacity <= 0:
+                break
+
+    async def _prefill_one(self, dbname: str) -> None:
+        try:
+            conn = await self.acquire(dbname)
+        except Exception:
+            logger.warning(
+                f'Failed to prefill a connection to {dbname}', exc_info=True
+            )
+        else:
+            self.release(dbname, conn)
+
     async def prune_inactive_connections(self, dbname: str) -> None:
         if not self._task:
             raise asyncio.CancelledError()
@@ -32,6 +32,7 @@ cpdef enum SideEffects:
     InstanceConfigChanges = 1 << 2
     GlobalSchemaChanges = 1 << 3
     DatabaseChanges = 1 << 4
+    NetRequestsScheduled = 1 << 5
 
 
 @cython.final
@@ -72,7 +73,10 @@ cdef class Database:
     cdef:
         stmt_cache.StatementsCache _eql_to_compiled
         object _cache_locks
+        object _query_manifest
+        object _query_manifest_keys
         object _sql_to_compiled
+        object _sql_catalog_to_compiled
         DatabaseIndex _index
         object _views
         object _introspection_lock
@@ -98,9 +102,14 @@ cdef class Database:
         readonly object backend_oid_to_id
         readonly object extensions
         readonly object _feature_used_metrics
+        readonly object query_stats
 
     cdef _invalidate_caches(self)
+    cdef _drop_stale_compiled_queries(self)
+    cdef _recompile_hot_sql(self)
     cdef _cache_compiled_query(self, key, compiled)
+    cdef _set_query_manifest_keys(self, keys)
+    cdef _precompile_query_manifest(self)
     cdef _new_view(self, query_cache, protocol_version)
     cdef _remove_view(self, view)
     cdef _observe_auth_ext_config(self)
@@ -176,6 +185,7 @@ cdef class DatabaseConnectionView:
         bint _in_tx_with_sysconfig
         bint _in_tx_with_dbconfig
         bint _in_tx_with_set
+        bint _in_tx_with_net_requests
         bint _tx_error
         uint64_t _in_tx_seq
 
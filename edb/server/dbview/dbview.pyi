@@ -21,6 +21,7 @@ from typing import (
     Awaitable,
     Callable,
     Hashable,
+    Iterable,
     Iterator,
     Mapping,
     Optional,
@@ -35,9 +36,11 @@ from edb.schema import schema as s_schema
 
 from edb.server import config
 from edb.server import pgcon
+from edb.server import query_stats as query_stats_mod
 from edb.server import server
 from edb.server import tenant
 from edb.server.compiler import dbstate
+from edb.server.compiler import rpc
 from edb.server.compiler import sertypes
 
 Config: TypeAlias = Mapping[str, config.SettingValue]
@@ -48,9 +51,11 @@ class CompiledQuery:
 class Database:
     name: str
     dbver: int
+    schema_version: uuid.UUID
     db_config: Config
     extensions: set[str]
     user_config_spec: config.Spec
+    query_stats: query_stats_mod.QueryStatsTable
 
     @property
     def server(self) -> server.Server:
@@ -84,6 +89,9 @@ class Database:
         key: Hashable,
         compiled: list[dbstate.SQLQueryUnit],
         schema_version: uuid.UUID,
+        recompile_args: Optional[
+            tuple[Any, dbstate.SQLTransactionState, str]
+        ] = None,
     ) -> None:
         ...
 
@@ -93,6 +101,15 @@ class Database:
     ) -> Optional[list[dbstate.SQLQueryUnit]]:
         ...
 
+    def record_query_stats(
+        self,
+        query_id: uuid.UUID,
+        query: str,
+        tag: Optional[str],
+        timings: query_stats_mod.QueryTimings,
+    ) -> None:
+        ...
+
     def set_state_serializer(
         self,
         protocol_version: tuple[int, int],
@@ -100,6 +117,18 @@ class Database:
     ) -> None:
         pass
 
+    def set_query_manifest(
+        self,
+        requests: Iterable[rpc.CompilationRequest],
+    ) -> None:
+        ...
+
+    def get_query_manifest(self) -> list[rpc.CompilationRequest]:
+        ...
+
+    async def compile_query_manifest(self) -> list[tuple[str, Exception]]:
+        ...
+
     def hydrate_cache(self, query_cache: list[tuple[bytes, ...]]) -> None:
         ...
 
@@ -42,6 +42,7 @@ from edb.edgeql import qltypes
 from edb.schema import schema as s_schema
 from edb.schema import name as s_name
 from edb.server import compiler, defines, config, metrics, pgcon
+from edb.server import query_stats
 from edb.server.compiler import dbstate, enums, sertypes
 from edb.server.protocol import execute
 from edb.pgsql import dbops
@@ -72,9 +73,16 @@ cdef DEFAULT_STATE = json.dumps([]).encode('utf-8')
 cdef INT32_PACKER = struct.Struct('!l').pack
 
 cdef int VER_COUNTER = 0
-cdef DICTDEFAULT = (None, None)
+cdef SQL_DICTDEFAULT = (None, None, None)
 cdef object logger = logging.getLogger('edb.server')
 
+# Number of the most recently used compiled SQL queries to recompile in the
+# background after DDL, so that the hot queries of SQL clients don't all pay
+# for a compilation on their next use.  Disabled by default.
+cdef int SQL_RECOMPILE_HOT_QUERIES = int(
+    os.environ.get("EDGEDB_SERVER_SQL_RECOMPILE_HOT_QUERIES", "0")
+)
+
 # Mapping from oids of PostgreSQL types into corresponding EdgeQL type.
 # Needed only for pg types that do not exist in EdgeQL, such as pg_catalog.name
 cdef TYPES_SQL_ONLY = immutables.Map({
@@ -167,10 +175,23 @@ cdef class Database:
         self._introspection_lock = asyncio.Lock()
 
         self._eql_to_compiled = stmt_cache.StatementsCache(
-            maxsize=defines._MAX_QUERIES_CACHE_DB)
+            maxsize=defines._MAX_QUERIES_CACHE_DB,
+            maxpinned=defines._MAX_QUERY_MANIFEST_QUERIES)
         self._cache_locks = {}
+        # Queries declared ahead of time, see set_query_manifest()
+        self._query_manifest = []
+        self._query_manifest_keys = frozenset()
         self._sql_to_compiled = lru.LRUMapping(
             maxsize=defines._MAX_QUERIES_CACHE)
+        # Translations of queries that only read the emulated SQL catalogs
+        # do not depend on the user schema, so unlike _sql_to_compiled this
+        # cache is kept across DDL.  Tools like psql, DBeaver or Metabase
+        # fire dozens of such queries on every connect.
+        self._sql_catalog_to_compiled = lru.LRUMapping(
+            maxsize=defines._MAX_SQL_CATALOG_QUERIES_CACHE)
+
+        self.query_stats = query_stats.QueryStatsTable(
+            maxsize=defines._MAX_QUERY_STATS_ENTRIES)
 
         # Tracks the active transactions and their creation sequence. The
         # sequence ID is incremental-only. ID 0 is reserved as a non-exist ID.
@@ -449,9 +470,136 @@ cdef class Database:
         })
 
     cdef _invalidate_caches(self):
-        self._sql_to_compiled.clear()
+        self._drop_stale_compiled_queries()
+        self._precompile_query_manifest()
+        if self._sql_to_compiled:
+            metrics.query_cache_stale_evictions.inc(
+                len(self._sql_to_compiled),
+                self.tenant.get_instance_name(),
+                "sql",
+            )
+            if SQL_RECOMPILE_HOT_QUERIES > 0:
+                self._recompile_hot_sql()
+            self._sql_to_compiled.clear()
         self._index.invalidate_caches()
 
+    cdef _drop_stale_compiled_queries(self):
+        # Compiled EdgeQL queries are keyed by the schema version they were
+        # compiled upon, so entries of previous versions can never be hit
+        # again.  Drop the whole outdated segment at once instead of letting
+        # it age out of the LRU while pushing out fresh entries.
+        stale = [
+            query_req
+            for query_req in self._eql_to_compiled
+            if query_req.schema_version != self.schema_version
+        ]
+        if not stale:
+            return
+
+        keys = []
+        for query_req in stale:
+            unit_group = self._eql_to_compiled.pop(query_req)
+            if (
+                len(unit_group) == 1
+                and unit_group.cache_state == CacheState.Present
+            ):
+                keys.append(query_req.get_cache_key())
+                self._func_cache_gt_tx_seq.pop(query_req, None)
+            unit_group.cache_state = CacheState.Evicted
+
+        metrics.query_cache_stale_evictions.inc(
+            len(stale), self.tenant.get_instance_name(), "edgeql"
+        )
+        if keys and self.tenant.accept_new_tasks:
+            self.tenant.create_task(
+                self.tenant.evict_query_cache(self.name, keys),
+                interruptable=True,
+            )
+
+    cdef _recompile_hot_sql(self):
+        if (
+            not self.tenant.accept_new_tasks
+            or not self.lookup_config("auto_rebuild_query_cache")
+        ):
+            return
+
+        hot = []
+        # Reversed so that we pick the more recently used first.
+        for key in reversed(list(self._sql_to_compiled)):
+            _, _, recompile_args = self._sql_to_compiled[key]
+            if recompile_args is not None:
+                hot.append((key, recompile_args))
+                if len(hot) >= SQL_RECOMPILE_HOT_QUERIES:
+                    break
+        if hot:
+            self.tenant.create_task(
+                self._recompile_sql_queries(hot, self.schema_version),
+                interruptable=True,
+            )
+
+    async def _recompile_sql_queries(self, hot, schema_version):
+        compiler_pool = self.server.get_compiler_pool()
+        compile_concurrency = max(1, compiler_pool.get_size_hint() // 2)
+        concurrency_control = asyncio.Semaphore(compile_concurrency)
+
+        recompile_timeout = self.lookup_config(
+            "auto_rebuild_query_cache_timeout",
+        )
+
+        loop = asyncio.get_running_loop()
+        if recompile_timeout is not None:
+            stop_time = (
+                loop.time() + recompile_timeout.to_microseconds() / 1e6
+            )
+        else:
+            stop_time = None
+
+        user_schema_pickle = self.user_schema_pickle
+        global_schema_pickle = self._index.get_global_schema_pickle()
+        reflection_cache = self.reflection_cache
+        database_config = self.db_config
+        system_config = self._index.get_compilation_system_config()
+
+        async def recompile_sql(key, recompile_args):
+            source, tx_state, username = recompile_args
+            async with concurrency_control:
+                if (
+                    # Superseded by yet another schema change
+                    self.schema_version != schema_version
+                    or (stop_time is not None and loop.time() > stop_time)
+                ):
+                    return
+                try:
+                    async with asyncio.timeout_at(stop_time):
+                        result = await compiler_pool.compile_sql(
+                            self.name,
+                            user_schema_pickle,
+                            global_schema_pickle,
+                            reflection_cache,
+                            database_config,
+                            system_config,
+                            source,
+                            tx_state,
+                            {},
+                            self.name,
+                            username,
+                            client_id=self.tenant.client_id,
+                        )
+                except Exception:
+                    # ignore cache entry that cannot be recompiled
+                    pass
+                else:
+                    self.cache_compiled_sql(
+                        key, result, schema_version, recompile_args
+                    )
+                    metrics.sql_recompilations.inc(
+                        1.0, self.tenant.get_instance_name()
+                    )
+
+        async with asyncio.TaskGroup() as g:
+            for key, recompile_args in hot:
+                g.create_task(recompile_sql(key, recompile_args))
+
     cdef _cache_compiled_query(self, key, compiled: dbstate.QueryUnitGroup):
         # `dbver` must be the schema version `compiled` was compiled upon
         assert compiled.cacheable
@@ -461,27 +609,165 @@ cdef class Database:
             return
 
         self._eql_to_compiled[key] = compiled
+        if key in self._query_manifest_keys:
+            self._eql_to_compiled.pin(key)
 
         if self._cache_queue is not None:
             self._cache_queue.put_nowait((key, compiled))
 
-    def cache_compiled_sql(self, key, compiled: list[str], schema_version):
-        existing, ver = self._sql_to_compiled.get(key, DICTDEFAULT)
-        if existing is not None and ver == self.schema_version:
-            # We already have a cached query for a more recent DB version.
-            return
+    cdef _set_query_manifest_keys(self, keys):
+        # Only the exact cache keys of the declared queries at the current
+        # schema version and config are pinned, compilations of the same
+        # text with other options are evicted as usual.
+        self._query_manifest_keys = frozenset(keys)
+        for key in self._eql_to_compiled:
+            if key in self._query_manifest_keys:
+                self._eql_to_compiled.pin(key)
+            else:
+                self._eql_to_compiled.unpin(key)
+
+    def set_query_manifest(self, requests):
+        # Declared queries are compiled ahead of time whenever the schema
+        # changes, so that applications shipping a fixed set of queries
+        # don't pay for compiling them on first use after a migration.
+        # Their compilations are never evicted from the cache, up to
+        # _MAX_QUERY_MANIFEST_QUERIES of them.
+        self._query_manifest = list(requests)
+        self._set_query_manifest_keys(())
+
+    def get_query_manifest(self):
+        return list(self._query_manifest)
+
+    cdef _precompile_query_manifest(self):
+        if self._query_manifest and self.tenant.accept_new_tasks:
+            self.tenant.create_task(
+                self.compile_query_manifest(), interruptable=True
+            )
+
+    async def compile_query_manifest(self):
+        await self.introspection()
+
+        compiler_pool = self.server.get_compiler_pool()
+        compile_concurrency = max(1, compiler_pool.get_size_hint() // 2)
+        concurrency_control = asyncio.Semaphore(compile_concurrency)
+        failures = []
+
+        schema_version = self.schema_version
+        user_schema_pickle = self.user_schema_pickle
+        global_schema_pickle = self._index.get_global_schema_pickle()
+        reflection_cache = self.reflection_cache
+        database_config = self.db_config
+        system_config = self._index.get_compilation_system_config()
+
+        keys = []
+        for query_req in self._query_manifest:
+            query_req = copy.copy(query_req)
+            query_req.set_schema_version(schema_version)
+            query_req.set_database_config(database_config)
+            query_req.set_system_config(system_config)
+            keys.append(query_req)
+        self._set_query_manifest_keys(keys)
+
+        async def compile_request(query_req: rpc.CompilationRequest):
+            async with concurrency_control:
+                if (
+                    # Superseded by yet another schema change
+                    self.schema_version != schema_version
+                    # Already compiled by a client, or recompiled by the
+                    # connection that ran the DDL
+                    or query_req in self._eql_to_compiled
+                ):
+                    return
+                try:
+                    unit_group, _, _ = await compiler_pool.compile(
+                        self.name,
+                        user_schema_pickle,
+                        global_schema_pickle,
+                        reflection_cache,
+                        database_config,
+                        system_config,
+                        query_req.serialize(),
+                        query_req.source.text(),
+                        client_id=self.tenant.client_id,
+                    )
+                except Exception as ex:
+                    failures.append((query_req.source.text(), ex))
+                    return
+                if (
+                    self.schema_version == schema_version
+                    and unit_group.cacheable
+                ):
+                    self._cache_compiled_query(query_req, unit_group)
+                    metrics.edgeql_query_compilations.inc(
+                        1.0, self.tenant.get_instance_name(), 'manifest'
+                    )
+
+        async with asyncio.TaskGroup() as g:
+            for query_req in keys:
+                g.create_task(compile_request(query_req))
+
+        for text, ex in failures:
+            logger.warning(
+                "could not compile declared query %r of branch %r: %s",
+                text, self.name, ex,
+            )
+        return failures
+
+    def cache_compiled_sql(
+        self,
+        key,
+        compiled: list[str],
+        schema_version,
+        recompile_args=None,
+    ):
         if not all(unit.cacheable for unit in compiled):
             return
+        if all(unit.catalog_only for unit in compiled):
+            self._sql_catalog_to_compiled[key] = compiled
+            return
+
+        if schema_version != self.schema_version:
+            # The schema was changed while compiling, and the segment of the
+            # cache for that version was already dropped; an entry stored
+            # now could never be hit again.
+            return
+        if key in self._sql_to_compiled:
+            # We already have a cached query for the current DB version.
+            return
+
+        if SQL_RECOMPILE_HOT_QUERIES <= 0 or any(
+            unit.prepare is not None
+            or unit.execute is not None
+            or unit.deallocate is not None
+            for unit in compiled
+        ):
+            # Recompiling requires the inputs of the compilation, which
+            # we only keep if we can replay it out of the session context.
+            recompile_args = None
 
         # Store the matching schema version, see also the comments at origin
-        self._sql_to_compiled[key] = compiled, schema_version
+        self._sql_to_compiled[key] = compiled, schema_version, recompile_args
 
     def lookup_compiled_sql(self, key):
-        rv, cached_ver = self._sql_to_compiled.get(key, DICTDEFAULT)
+        rv, cached_ver, _ = self._sql_to_compiled.get(key, SQL_DICTDEFAULT)
         if rv is not None and cached_ver != self.schema_version:
             rv = None
+        if rv is None:
+            rv = self._sql_catalog_to_compiled.get(key)
+            if rv is not None:
+                metrics.sql_catalog_cache_hits.inc(
+                    1.0, self.tenant.get_instance_name()
+                )
         return rv
 
+    def record_query_stats(self, query_id, query, tag, timings):
+        self.query_stats.record(query_id, query, tag, timings)
+        tname = self.tenant.get_instance_name()
+        for phase in query_stats.PHASES:
+            value = getattr(timings, phase)
+            if value is not None:
+                metrics.query_phase_duration.observe(value, tname, phase)
+
     cdef _new_view(self, query_cache, protocol_version):
         view = DatabaseConnectionView(
             self, query_cache=query_cache, protocol_version=protocol_version
@@ -554,7 +840,11 @@ cdef class Database:
         yield from self._views
 
     def get_query_cache_size(self):
-        return len(self._eql_to_compiled) + len(self._sql_to_compiled)
+        return (
+            len(self._eql_to_compiled)
+            + len(self._sql_to_compiled)
+            + len(self._sql_catalog_to_compiled)
+        )
 
     async def introspection(self):
         if self.user_schema_pickle is None:
@@ -627,6 +917,7 @@ cdef class DatabaseConnectionView:
         self._in_tx_with_sysconfig = False
         self._in_tx_with_dbconfig = False
         self._in_tx_with_set = False
+        self._in_tx_with_net_requests = False
         self._in_tx_root_user_schema_pickle = None
         self._in_tx_user_schema_pickle = None
         self._in_tx_user_schema_version = None
@@ -1060,6 +1351,8 @@ cdef class DatabaseConnectionView:
             self._in_tx_with_dbconfig = True
         if query_unit.has_set:
             self._in_tx_with_set = True
+        if query_unit.schedules_net_requests:
+            self._in_tx_with_net_requests = True
         if query_unit.user_schema is not None:
             self._in_tx_dbver = next_dbver()
             self._in_tx_user_schema_pickle = query_unit.user_schema
@@ -1108,6 +1401,8 @@ cdef class DatabaseConnectionView:
                 side_effects |= SideEffects.DatabaseChanges
             if query_unit.drop_db:
                 side_effects |= SideEffects.DatabaseChanges
+            if query_unit.schedules_net_requests:
+                side_effects |= SideEffects.NetRequestsScheduled
             if query_unit.global_schema is not None:
                 side_effects |= SideEffects.GlobalSchemaChanges
                 self._db._index.update_global_schema(query_unit.global_schema)
@@ -1147,6 +1442,8 @@ cdef class DatabaseConnectionView:
                 side_effects |= SideEffects.InstanceConfigChanges
             if self._in_tx_with_dbconfig:
                 side_effects |= SideEffects.DatabaseConfigChanges
+            if self._in_tx_with_net_requests:
+                side_effects |= SideEffects.NetRequestsScheduled
             if query_unit.global_schema is not None:
                 side_effects |= SideEffects.GlobalSchemaChanges
                 self._db._index.update_global_schema(query_unit.global_schema)
@@ -1198,6 +1495,8 @@ cdef class DatabaseConnectionView:
             side_effects |= SideEffects.InstanceConfigChanges
         if self._in_tx_with_dbconfig:
             side_effects |= SideEffects.DatabaseConfigChanges
+        if self._in_tx_with_net_requests:
+            side_effects |= SideEffects.NetRequestsScheduled
         if global_schema is not None:
             side_effects |= SideEffects.GlobalSchemaChanges
             self._db._index.update_global_schema(global_schema)
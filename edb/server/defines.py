@@ -60,6 +60,14 @@ BACKEND_COMPILER_TEMPLATE_PROC_RESTART_INTERVAL = 1
 
 _MAX_QUERIES_CACHE = 1000
 _MAX_QUERIES_CACHE_DB = 1000
+_MAX_SQL_CATALOG_QUERIES_CACHE = 500
+_MAX_QUERY_STATS_ENTRIES = 1000
+# Queries of a branch's query manifest, which are never evicted from the
+# query cache, see Database.set_query_manifest()
+_MAX_QUERY_MANIFEST_QUERIES = 500
+# Memo of raw query texts to their normalized sources, see SourceCache
+_MAX_SOURCE_CACHE = 2000
+_MAX_SOURCE_CACHE_TEXT_LEN = 16384
 
 _QUERY_ROLLING_AVG_LEN = 10
 _QUERIES_ROLLING_AVG_LEN = 300
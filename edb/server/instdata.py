@@ -23,6 +23,7 @@ from typing import (
     TYPE_CHECKING,
 )
 
+import json
 
 from edb.pgsql import common as pg_common
 
@@ -46,3 +47,19 @@ async def get_instdata(
         """.encode('utf-8'),
         args=[key.encode("utf-8")],
     )
+
+
+async def set_instdata_json(
+    backend_conn: metaschema.PGConnection,
+    key: str,
+    value: Any,
+) -> None:
+    schema = pg_common.versioned_schema('edgedbinstdata')
+    await backend_conn.sql_fetch(
+        f"""
+        INSERT INTO {schema}.instdata (key, json)
+        VALUES ($1, $2::jsonb)
+        ON CONFLICT (key) DO UPDATE SET json = $2::jsonb
+        """.encode('utf-8'),
+        args=[key.encode("utf-8"), json.dumps(value).encode("utf-8")],
+    )
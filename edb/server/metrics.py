@@ -41,6 +41,18 @@ current_compiler_processes = registry.new_gauge(
     'Current number of active compiler processes.'
 )
 
+compile_cache_requests = registry.new_labeled_counter(
+    'compile_cache_requests_total',
+    'Number of compilations looked up in the compiler server result cache.',
+    labels=('result',),
+)
+
+current_compile_cache = registry.new_gauge(
+    'compile_cache_current',
+    'Current total size of the compiler server result cache.',
+    unit=prom.Unit.BYTES,
+)
+
 current_branches = registry.new_labeled_gauge(
     'branches_current',
     'Current number of branches.',
@@ -91,6 +103,27 @@ backend_query_duration = registry.new_labeled_histogram(
     labels=('tenant',),
 )
 
+backend_state_syncs = registry.new_labeled_counter(
+    'backend_state_syncs_total',
+    'Number of times the session state was checked against the state '
+    'of the backend connection before running a query.',
+    labels=('tenant', 'result')
+)
+
+backend_prepared_statements = registry.new_labeled_counter(
+    'backend_prepared_statements_total',
+    'Number of lookups of named prepared statements on backend '
+    'connections, by whether a Parse had to be sent or was avoided.',
+    labels=('tenant', 'result')
+)
+
+pipelined_queries = registry.new_labeled_counter(
+    'pipelined_queries_total',
+    'Number of queries of the binary protocol sent to the backend '
+    'together with other pipelined queries.',
+    labels=('tenant',)
+)
+
 total_client_connections = registry.new_labeled_counter(
     'client_connections_total',
     'Total number of clients.',
@@ -142,6 +175,13 @@ query_compilation_duration = registry.new_labeled_histogram(
     labels=('tenant', 'interface'),
 )
 
+query_phase_duration = registry.new_labeled_histogram(
+    'query_phase_duration',
+    'Time queries spend in each server-side phase of their execution.',
+    unit=prom.Unit.SECONDS,
+    labels=('tenant', 'phase'),
+)
+
 sql_queries = registry.new_labeled_counter(
     'sql_queries_total',
     'Number of SQL queries.',
@@ -154,6 +194,44 @@ sql_compilations = registry.new_labeled_counter(
     labels=('tenant',)
 )
 
+query_normalizations = registry.new_labeled_counter(
+    'query_normalizations_total',
+    'Number of query texts normalized or found in the normalization cache.',
+    labels=('tenant', 'interface', 'path')
+)
+
+sql_catalog_cache_hits = registry.new_labeled_counter(
+    'sql_catalog_cache_hits_total',
+    'Number of catalog-only SQL queries served from the catalog query cache.',
+    labels=('tenant',)
+)
+
+sql_recompilations = registry.new_labeled_counter(
+    'sql_recompilations_total',
+    'Number of cached SQL queries recompiled in the background after DDL.',
+    labels=('tenant',)
+)
+
+query_cache_stale_evictions = registry.new_labeled_counter(
+    'query_cache_stale_evictions_total',
+    'Number of compiled queries dropped from the cache on schema changes.',
+    labels=('tenant', 'interface')
+)
+
+sql_injected_parses = registry.new_labeled_counter(
+    'sql_injected_parses_total',
+    'Number of Parse messages injected to prepare SQL statements on a '
+    'backend connection.',
+    labels=('tenant', 'path')
+)
+
+sql_stream_pauses = registry.new_labeled_counter(
+    'sql_stream_pauses_total',
+    'Number of times relaying of SQL query results was paused because '
+    'the client was not reading them fast enough.',
+    labels=('tenant',)
+)
+
 queries_per_connection = registry.new_labeled_histogram(
     'queries_per_connection',
     'Number of queries per connection.',
@@ -234,6 +312,25 @@ auth_successful_logins = registry.new_labeled_counter(
     labels=("tenant",),
 )
 
+ai_index_embeddings = registry.new_labeled_counter(
+    'ai_index_embeddings_total',
+    'Number of embeddings stored by the index builder of the AI extension.',
+    labels=('tenant', 'provider'),
+)
+
+ai_index_queued_requests = registry.new_labeled_gauge(
+    'ai_index_queued_requests_current',
+    'Number of embeddings requests of the AI extension deferred by '
+    'the rate limits of a provider.',
+    labels=('tenant', 'provider'),
+)
+
+net_http_completions = registry.new_labeled_counter(
+    'net_http_completions_total',
+    'Number of std::net HTTP request completions written to the branches.',
+    labels=('tenant', 'mode'),
+)
+
 mt_tenants_total = registry.new_gauge(
     'mt_tenants_current',
     'Total number of currently-registered tenants.',
@@ -24,9 +24,11 @@ import typing
 import asyncio
 import logging
 import base64
+import time
 
 from edb.ir import statypes
 from edb.server import defines
+from edb.server import metrics
 from edb.server.protocol import execute
 from edb.server.http import HttpClient
 from edb.common import retryloop
@@ -38,18 +40,52 @@ if typing.TYPE_CHECKING:
 
 logger = logging.getLogger("edb.server.net_worker")
 
+# Branches are polled for pending requests when a query schedules them
+# (over EdgeQL or SQL, directly or through triggers, on this server or,
+# through a system event, on another one), and otherwise periodically as a
+# fallback.  The fallback interval starts at MIN_POLLING_INTERVAL and is
+# doubled, up to MAX_POLLING_INTERVAL, each time a branch turns out to have
+# no pending requests, so that idle branches are barely queried.
 POLLING_INTERVAL = statypes.Duration(microseconds=10 * 1_000_000)  # 10 seconds
+MIN_POLLING_INTERVAL = statypes.Duration(
+    microseconds=1 * 1_000_000
+)  # 1 second
+MAX_POLLING_INTERVAL = statypes.Duration(
+    microseconds=600 * 1_000_000
+)  # 10 minutes
+# Request completions are written back to a branch in batches of up to
+# COMPLETION_BATCH_MAX_SIZE, collected for COMPLETION_BATCH_WINDOW seconds.
+COMPLETION_BATCH_WINDOW = 0.05
+COMPLETION_BATCH_MAX_SIZE = 100
 # TODO: Make this configurable via server config
 NET_HTTP_REQUEST_TTL = statypes.Duration(
     microseconds=3600 * 1_000_000
 )  # 1 hour
 
 
-async def _http_task(tenant: edbtenant.Tenant, http_client) -> None:
+@dataclasses.dataclass
+class _BranchPolling:
+    interval: float
+    next_poll: float
+
+
+def _seconds(duration: statypes.Duration) -> float:
+    return duration.to_microseconds() / 1_000_000.0
+
+
+async def _http_task(
+    tenant: edbtenant.Tenant,
+    http_client,
+    polling: dict[str, _BranchPolling],
+    batchers: dict[str, CompletionBatcher],
+) -> None:
     http_max_connections = tenant._server.config_lookup(
         'http_max_connections', tenant.get_sys_config()
     )
     http_client._update_limit(http_max_connections)
+    scheduled = tenant.take_net_requests_scheduled()
+    now = time.monotonic()
+    dbnames = set()
     try:
         # TODO: I think this TaskGroup approach might not be the right
         # approach here. It is fragile to failures and means that slow
@@ -63,6 +99,19 @@ async def _http_task(tenant: edbtenant.Tenant, http_client) -> None:
                     # Don't run the net_worker if the database is not
                     # connectable, e.g. being dropped
                     continue
+                dbnames.add(db.name)
+                branch = polling.get(db.name)
+                if branch is None:
+                    # Poll new branches right away: requests might have
+                    # been scheduled while the server was not running.
+                    branch = _BranchPolling(
+                        interval=_seconds(MIN_POLLING_INTERVAL),
+                        next_poll=now,
+                    )
+                    polling[db.name] = branch
+                if db.name not in scheduled and branch.next_poll > now:
+                    continue
+                branch.next_poll = now + branch.interval
                 try:
                     json_bytes = await execute.parse_execute_json(
                         db,
@@ -106,51 +155,77 @@ async def _http_task(tenant: edbtenant.Tenant, http_client) -> None:
                     continue
 
                 pending_requests: list[dict] = json.loads(json_bytes)
+                batcher = batchers.get(db.name)
+                if batcher is None or batcher.db is not db:
+                    batcher = batchers[db.name] = CompletionBatcher(db)
+                if pending_requests:
+                    branch.interval = _seconds(MIN_POLLING_INTERVAL)
+                else:
+                    branch.interval = min(
+                        branch.interval * 2, _seconds(MAX_POLLING_INTERVAL)
+                    )
+                branch.next_poll = now + branch.interval
                 for pending_request in pending_requests:
                     request = ScheduledRequest(**pending_request)
-                    g.create_task(handle_request(http_client, db, request))
+                    g.create_task(
+                        handle_request(http_client, batcher, request)
+                    )
     except Exception as ex:
         logger.debug(
             "HTTP send failed (instance: %s)",
             tenant.get_instance_name(),
             exc_info=ex,
         )
+    finally:
+        # Forget about dropped branches
+        for dbname in polling.keys() - dbnames:
+            del polling[dbname]
+        for dbname in batchers.keys() - dbnames:
+            del batchers[dbname]
 
 
 def create_http(tenant: edbtenant.Tenant):
     return tenant.get_http_client(originator="std::net")
 
 
+async def _http_loop(tenant: edbtenant.Tenant) -> None:
+    http_client = create_http(tenant)
+    polling: dict[str, _BranchPolling] = {}
+    batchers: dict[str, CompletionBatcher] = {}
+
+    while tenant.accept_new_tasks:
+        try:
+            await _http_task(tenant, http_client, polling, batchers)
+        except Exception as ex:
+            logger.debug("HTTP worker failed", exc_info=ex)
+
+        next_poll = min(
+            (branch.next_poll for branch in polling.values()),
+            # Look for new branches every now and then
+            default=time.monotonic() + _seconds(POLLING_INTERVAL),
+        )
+        await tenant.wait_for_net_requests(next_poll - time.monotonic())
+
+
 async def http(server: edbserver.BaseServer) -> None:
-    tenant_http = dict()
+    tenant_tasks: dict[edbtenant.Tenant, asyncio.Task] = dict()
 
     while True:
-        tenant_set = set()
         try:
-            tasks = []
             for tenant in server.iter_tenants():
-                if tenant.accept_new_tasks:
-                    tenant_set.add(tenant)
-                    if tenant not in tenant_http:
-                        tenant_http[tenant] = create_http(tenant)
-                    tasks.append(
-                        tenant.create_task(
-                            _http_task(tenant, tenant_http[tenant]),
-                            interruptable=True,
-                        )
+                task = tenant_tasks.get(tenant)
+                if (task is None or task.done()) and tenant.accept_new_tasks:
+                    tenant_tasks[tenant] = tenant.create_task(
+                        _http_loop(tenant), interruptable=True
                     )
-            # Remove unused tenant_http entries
-            for tenant in list(tenant_http.keys()):
-                if tenant not in tenant_set:
-                    del tenant_http[tenant]
-            if tasks:
-                await asyncio.wait(tasks)
+            # Remove the tasks of stopped tenants
+            for tenant, task in list(tenant_tasks.items()):
+                if task.done():
+                    del tenant_tasks[tenant]
         except Exception as ex:
             logger.debug("HTTP worker failed", exc_info=ex)
         finally:
-            await asyncio.sleep(
-                POLLING_INTERVAL.to_microseconds() / 1_000_000.0
-            )
+            await asyncio.sleep(_seconds(POLLING_INTERVAL))
 
 
 @dataclasses.dataclass
@@ -166,13 +241,65 @@ class ScheduledRequest:
             self.body = base64.b64decode(self.body).decode('utf-8').encode()
 
 
+@dataclasses.dataclass
+class RequestCompletion:
+    id: str
+    state: str
+    response_status: typing.Optional[int] = None
+    response_body: typing.Optional[bytes] = None
+    response_headers: typing.Optional[list[tuple[str, str]]] = None
+    failure: typing.Optional[dict[str, str]] = None
+
+
+class CompletionBatcher:
+    """Buffers the request completions of a branch to write them in bulk.
+
+    The first completion of a batch waits for COMPLETION_BATCH_WINDOW
+    seconds, or until the batch has COMPLETION_BATCH_MAX_SIZE entries,
+    and then writes the whole batch in one statement; the other writers
+    of the batch wait for that to finish.
+    """
+
+    def __init__(self, db: dbview.Database) -> None:
+        self.db = db
+        self._batch: list[RequestCompletion] = []
+        self._batch_full = asyncio.Event()
+        self._batch_done: typing.Optional[asyncio.Future[None]] = None
+
+    async def write(self, completion: RequestCompletion) -> None:
+        self._batch.append(completion)
+        if self._batch_done is not None:
+            if len(self._batch) >= COMPLETION_BATCH_MAX_SIZE:
+                self._batch_full.set()
+            await asyncio.shield(self._batch_done)
+            return
+
+        done = asyncio.get_running_loop().create_future()
+        self._batch_done = done
+        batch_full = self._batch_full
+        try:
+            try:
+                await asyncio.wait_for(
+                    batch_full.wait(), COMPLETION_BATCH_WINDOW
+                )
+            except TimeoutError:
+                pass
+            batch = self._batch
+            self._batch = []
+            self._batch_full = asyncio.Event()
+            self._batch_done = None
+            await _update_requests(self.db, batch)
+        finally:
+            if not done.done():
+                done.set_result(None)
+
+
 async def handle_request(
-    client: HttpClient, db: dbview.Database, request: ScheduledRequest
+    client: HttpClient,
+    completions: CompletionBatcher,
+    request: ScheduledRequest,
 ) -> None:
-    response_status = None
-    response_body = None
-    response_headers = None
-    failure = None
+    completion = RequestCompletion(id=request.id, state='Completed')
 
     try:
         headers = (
@@ -187,47 +314,48 @@ async def handle_request(
             headers=headers,
         )
         response_status, response_bytes, response_hdict = response
-        response_body = bytes(response_bytes)
-        response_headers = list(response_hdict.items())
-        request_state = 'Completed'
+        completion.response_status = response_status
+        completion.response_body = bytes(response_bytes)
+        completion.response_headers = list(response_hdict.items())
     except Exception as ex:
-        request_state = 'Failed'
-        failure = {
+        completion.state = 'Failed'
+        completion.failure = {
             'kind': 'NetworkError',
             'message': str(ex),
         }
 
-    def _warn(e):
-        logger.warning(
-            "Failed to update std::net::http record, retrying. Reason: %s", e
-        )
+    await completions.write(completion)
 
-    async def _update_request():
-        rloop = retryloop.RetryLoop(
-            backoff=retryloop.exp_backoff(),
-            timeout=300,
-            ignore=(Exception,),
-            retry_cb=_warn,
-        )
-        async for iteration in rloop:
-            async with iteration:
-                await execute.parse_execute_json(
-                    db,
-                    """
+
+async def _update_requests(
+    db: dbview.Database, completions: list[RequestCompletion]
+) -> None:
+    if len(completions) > 1:
+        try:
+            await execute.parse_execute_json(
+                db,
+                """
+                with
+                    nh as module std::net::http,
+                    net as module std::net,
+                for completion in json_array_unpack(<json>$completions)
+                union (
                     with
-                        nh as module std::net::http,
-                        net as module std::net,
-                        state := <net::RequestState>$state,
+                        state := <net::RequestState><str>completion['state'],
                         failure := <
-                            optional tuple<
+                            tuple<
                                 kind: net::RequestFailureKind,
                                 message: str
                             >
-                        >to_json(<str>$failure),
-                        response_status := <optional int16>$response_status,
-                        response_body := <optional bytes>$response_body,
-                        response_headers :=
-                            <optional array<tuple<str, str>>>$response_headers,
+                        >completion['failure'],
+                        response_status :=
+                            <int16>completion['response_status'],
+                        response_body := std::enc::base64_decode(
+                            <str>completion['response_body']
+                        ),
+                        response_headers := <array<tuple<str, str>>>(
+                            completion['response_headers']
+                        ),
                         response := (
                             if state = net::RequestState.Completed
                             then (
@@ -240,28 +368,121 @@ async def handle_request(
                             )
                             else (<nh::Response>{})
                         ),
-                    update nh::ScheduledRequest filter .id = <uuid>$id
+                    update nh::ScheduledRequest
+                    filter .id = <uuid>completion['id']
                     set {
                         state := state,
                         response := response,
                         failure := failure,
                         updated_at := datetime_of_statement(),
-                    };
-                    """,
-                    variables={
-                        'id': request.id,
-                        'state': request_state,
-                        'response_status': response_status,
-                        'response_body': response_body,
-                        'response_headers': response_headers,
-                        'failure': json.dumps(failure),
-                    },
-                    cached_globally=True,
-                    tx_isolation=defines.TxIsolationLevel.RepeatableRead,
-                    query_tag='gel/net',
-                )
+                    }
+                );
+                """,
+                variables={
+                    'completions': [
+                        dataclasses.asdict(completion)
+                        for completion in completions
+                    ],
+                },
+                cached_globally=True,
+                tx_isolation=defines.TxIsolationLevel.RepeatableRead,
+                query_tag='gel/net',
+            )
+            metrics.net_http_completions.inc(
+                len(completions), db.tenant.get_instance_name(), 'bulk'
+            )
+            return
+        except Exception as ex:
+            # Retry the requests one by one, so that a single bad
+            # completion doesn't prevent the others from being written.
+            logger.debug(
+                "Bulk update of std::net::http records failed, "
+                "retrying one by one (branch: %s)",
+                db.name,
+                exc_info=ex,
+            )
+
+    metrics.net_http_completions.inc(
+        len(completions),
+        db.tenant.get_instance_name(),
+        'fallback' if len(completions) > 1 else 'single',
+    )
+    results = await asyncio.gather(
+        *(_update_request(db, completion) for completion in completions),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(
+                "Failed to update std::net::http record. Reason: %s", result
+            )
+
+
+async def _update_request(
+    db: dbview.Database, completion: RequestCompletion
+) -> None:
+    def _warn(e):
+        logger.warning(
+            "Failed to update std::net::http record, retrying. Reason: %s", e
+        )
 
-    await _update_request()
+    rloop = retryloop.RetryLoop(
+        backoff=retryloop.exp_backoff(),
+        timeout=300,
+        ignore=(Exception,),
+        retry_cb=_warn,
+    )
+    async for iteration in rloop:
+        async with iteration:
+            await execute.parse_execute_json(
+                db,
+                """
+                with
+                    nh as module std::net::http,
+                    net as module std::net,
+                    state := <net::RequestState>$state,
+                    failure := <
+                        optional tuple<
+                            kind: net::RequestFailureKind,
+                            message: str
+                        >
+                    >to_json(<str>$failure),
+                    response_status := <optional int16>$response_status,
+                    response_body := <optional bytes>$response_body,
+                    response_headers :=
+                        <optional array<tuple<str, str>>>$response_headers,
+                    response := (
+                        if state = net::RequestState.Completed
+                        then (
+                            insert nh::Response {
+                                created_at := datetime_of_statement(),
+                                status := assert_exists(response_status),
+                                body := response_body,
+                                headers := response_headers,
+                            }
+                        )
+                        else (<nh::Response>{})
+                    ),
+                update nh::ScheduledRequest filter .id = <uuid>$id
+                set {
+                    state := state,
+                    response := response,
+                    failure := failure,
+                    updated_at := datetime_of_statement(),
+                };
+                """,
+                variables={
+                    'id': completion.id,
+                    'state': completion.state,
+                    'response_status': completion.response_status,
+                    'response_body': completion.response_body,
+                    'response_headers': completion.response_headers,
+                    'failure': json.dumps(completion.failure),
+                },
+                cached_globally=True,
+                tx_isolation=defines.TxIsolationLevel.RepeatableRead,
+                query_tag='gel/net',
+            )
 
 
 async def _delete_requests(
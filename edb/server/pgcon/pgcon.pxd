@@ -117,6 +117,14 @@ cdef class PGConnection:
 
         stmt_cache.StatementsCache prep_stmts
         list last_parse_prep_stmts
+        int prep_stmts_base_size
+        object prep_stmts_evicted
+        int prep_stmts_lookups
+        int prep_stmts_window_reparses
+        double prep_stmts_avg_sql_len
+        readonly uint64_t prep_stmts_hits
+        readonly uint64_t prep_stmts_misses
+        readonly uint64_t prep_stmts_reparses
 
         list log_listeners
 
@@ -156,7 +164,10 @@ cdef class PGConnection:
     cdef fallthrough_idle(self)
 
     cdef bint before_prepare(
-        self, bytes stmt_name, int dbver, WriteBuffer outbuf)
+        self, bytes stmt_name, int dbver, WriteBuffer outbuf,
+        bint track=*)
+    cdef adapt_stmt_cache_size(self)
+    cdef inline note_parse(self, bytes stmt_name, ssize_t sql_len)
     cdef write_sync(self, WriteBuffer outbuf)
     cdef send_sync(self)
 
@@ -167,6 +178,7 @@ cdef class PGConnection:
         ssize_t start, ssize_t end, int dbver, object parse_array,
         object query_prefix,
         bint needs_commit_state,
+        bint sync_units=?,
     )
 
     cdef _rewrite_copy_data(
@@ -47,6 +47,7 @@ class PGConnection(asyncio.Protocol):
     backend_secret: int
     is_ssl: bool
     last_init_con_data: object
+    last_state: Optional[bytes]
 
     def __init__(self, dbname): ...
     async def close(self): ...
@@ -83,6 +84,7 @@ class PGConnection(asyncio.Protocol):
         state: Optional[bytes] = None,
         tx_isolation: edbdef.TxIsolationLevel | None = None,
     ) -> list[bytes]: ...
+    async def sql_copy_in_data(self, sql: bytes, data: bytes) -> int: ...
     async def sql_describe(
         self,
         sql: bytes,
@@ -92,6 +94,7 @@ class PGConnection(asyncio.Protocol):
     def add_log_listener(self, cb: Callable[[str, str], None]) -> None: ...
     def get_server_parameter_status(self, parameter: str) -> Optional[str]: ...
     def set_stmt_cache_size(self, size: int) -> None: ...
+    def get_stmt_cache_stats(self) -> dict[str, int]: ...
     def set_server(self, server: object) -> None: ...
     async def signal_sysevent(self, event: str, *, dbname: str) -> None: ...
     def abort(self) -> None: ...
@@ -24,6 +24,7 @@ from typing import (
 )
 
 import asyncio
+import collections
 import contextlib
 import decimal
 import codecs
@@ -88,6 +89,17 @@ from . import errors as pgerror
 
 DEF DATA_BUFFER_SIZE = 100_000
 DEF PREP_STMTS_CACHE = 100
+# The prepared statements cache of a connection is resized at most once
+# per PREP_STMTS_WINDOW lookups, growing up to PREP_STMTS_MAX_GROWTH times
+# the configured size if the connection keeps re-parsing statements it has
+# evicted before.  The growth is further capped by PREP_STMTS_MEMORY_BUDGET,
+# which is compared against a rough estimate of the backend memory held by
+# a prepared statement: PREP_STMTS_SQL_FACTOR times its average SQL length.
+DEF PREP_STMTS_WINDOW = 256
+DEF PREP_STMTS_GROW_THRESHOLD = 0.05
+DEF PREP_STMTS_MAX_GROWTH = 8
+DEF PREP_STMTS_MEMORY_BUDGET = 16 * 1024 * 1024
+DEF PREP_STMTS_SQL_FACTOR = 10
 
 DEF COPY_SIGNATURE = b"PGCOPY\n\377\r\n\0"
 
@@ -227,6 +239,14 @@ cdef class PGConnection:
         self.msg_waiter = None
 
         self.prep_stmts = stmt_cache.StatementsCache(maxsize=PREP_STMTS_CACHE)
+        self.prep_stmts_base_size = PREP_STMTS_CACHE
+        self.prep_stmts_evicted = collections.OrderedDict()
+        self.prep_stmts_lookups = 0
+        self.prep_stmts_window_reparses = 0
+        self.prep_stmts_avg_sql_len = 0
+        self.prep_stmts_hits = 0
+        self.prep_stmts_misses = 0
+        self.prep_stmts_reparses = 0
 
         self.connected_fut = self.loop.create_future()
         self.connected = False
@@ -309,6 +329,64 @@ cdef class PGConnection:
 
     cpdef set_stmt_cache_size(self, int maxsize):
         self.prep_stmts.resize(maxsize)
+        self.prep_stmts_base_size = maxsize
+        self.prep_stmts_evicted.clear()
+        self.prep_stmts_lookups = 0
+        self.prep_stmts_window_reparses = 0
+
+    def get_stmt_cache_stats(self):
+        return dict(
+            size=len(self.prep_stmts),
+            maxsize=self.prep_stmts.get_maxsize(),
+            base_maxsize=self.prep_stmts_base_size,
+            parses_avoided=self.prep_stmts_hits,
+            parses=self.prep_stmts_misses,
+            reparses=self.prep_stmts_reparses,
+        )
+
+    cdef adapt_stmt_cache_size(self):
+        # Called once per PREP_STMTS_WINDOW lookups: grow the cache while
+        # a noticeable share of the Parses in the window were for statements
+        # we evicted ourselves, shrink it back when there were none.
+        cdef:
+            int maxsize = self.prep_stmts.get_maxsize()
+            int limit = self.prep_stmts_base_size * PREP_STMTS_MAX_GROWTH
+            int budget
+            int new_size = maxsize
+
+        if self.prep_stmts_avg_sql_len > 0:
+            budget = <int>(
+                PREP_STMTS_MEMORY_BUDGET
+                / (self.prep_stmts_avg_sql_len * PREP_STMTS_SQL_FACTOR)
+            )
+            limit = max(min(limit, budget), self.prep_stmts_base_size)
+
+        if (
+            self.prep_stmts_window_reparses
+            >= PREP_STMTS_WINDOW * PREP_STMTS_GROW_THRESHOLD
+        ):
+            new_size = min(maxsize * 2, limit)
+        elif self.prep_stmts_window_reparses == 0:
+            new_size = max(maxsize // 2, self.prep_stmts_base_size)
+        else:
+            new_size = min(maxsize, limit)
+
+        if new_size != maxsize:
+            if self.debug:
+                self.debug_print(
+                    f"resizing ps cache from {maxsize} to {new_size}")
+            self.prep_stmts.resize(new_size)
+
+        self.prep_stmts_lookups = 0
+        self.prep_stmts_window_reparses = 0
+
+    cdef inline note_parse(self, bytes stmt_name, ssize_t sql_len):
+        if stmt_name:
+            # Exponential moving average of the SQL size of named
+            # statements, used to keep the adaptive cache within budget.
+            self.prep_stmts_avg_sql_len += (
+                (sql_len - self.prep_stmts_avg_sql_len) / 16
+            )
 
     @property
     def is_ssl(self):
@@ -472,6 +550,7 @@ cdef class PGConnection:
         bytes stmt_name,
         int dbver,
         WriteBuffer outbuf,
+        bint track=True,
     ):
         cdef bint parse = 1
 
@@ -481,6 +560,14 @@ cdef class PGConnection:
                 self.debug_print(f"discarding ps {stmt_name_to_clean!r}")
             outbuf.write_buffer(
                 self.make_clean_stmt_message(stmt_name_to_clean))
+            # Remember the names of evicted statements for a while, so that
+            # we can tell when the cache is too small for the workload.
+            self.prep_stmts_evicted[stmt_name_to_clean] = None
+            if (
+                len(self.prep_stmts_evicted)
+                > self.prep_stmts.get_maxsize()
+            ):
+                self.prep_stmts_evicted.popitem(last=False)
 
         if stmt_name in self.prep_stmts:
             if self.prep_stmts[stmt_name] == dbver:
@@ -492,6 +579,25 @@ cdef class PGConnection:
                     self.make_clean_stmt_message(stmt_name))
                 del self.prep_stmts[stmt_name]
 
+        if not track:
+            return parse
+
+        if parse:
+            self.prep_stmts_misses += 1
+            if self.prep_stmts_evicted.pop(stmt_name, False) is None:
+                self.prep_stmts_reparses += 1
+                self.prep_stmts_window_reparses += 1
+            metrics.backend_prepared_statements.inc(
+                1.0, self.get_tenant_label(), 'parsed')
+        else:
+            self.prep_stmts_hits += 1
+            metrics.backend_prepared_statements.inc(
+                1.0, self.get_tenant_label(), 'avoided')
+
+        self.prep_stmts_lookups += 1
+        if self.prep_stmts_lookups >= PREP_STMTS_WINDOW:
+            self.adapt_stmt_cache_size()
+
         return parse
 
     cdef write_sync(self, WriteBuffer outbuf):
@@ -635,9 +741,14 @@ cdef class PGConnection:
         ssize_t start, ssize_t end, int dbver, object parse_array,
         object query_prefix,
         bint needs_commit_state,
+        bint sync_units = False,
     ):
         # parse_array is an array of booleans for output with the same size as
-        # the query_unit_group, indicating if each unit is freshly parsed
+        # the query_unit_group, indicating if each unit is freshly parsed.
+        #
+        # With sync_units, every unit is followed by its own SYNC, so that
+        # the units run in separate implicit transactions, and one of them
+        # failing doesn't abort the others.
         cdef:
             WriteBuffer out
             WriteBuffer buf
@@ -696,6 +807,7 @@ cdef class PGConnection:
                         self.get_tenant_label(),
                         'compiled',
                     )
+                    self.note_parse(stmt_name, len(sql))
 
                 buf = WriteBuffer.new_message(b'B')
                 buf.write_bytestring(b'')  # portal name
@@ -729,12 +841,15 @@ cdef class PGConnection:
                 buf.write_int32(0)  # limit: 0 - return all rows
                 out.write_buffer(buf.end_message())
 
+            if sync_units:
+                self.write_sync(out)
+
             idx += 1
 
-        if sync:
-            self.write_sync(out)
-        else:
+        if not sync:
             out.write_bytes(FLUSH_MESSAGE)
+        elif not sync_units:
+            self.write_sync(out)
 
         self.write(out)
 
@@ -1157,6 +1272,7 @@ cdef class PGConnection:
                 metrics.query_size.observe(
                     len(sqls[0]), self.get_tenant_label(), 'compiled'
                 )
+                self.note_parse(stmt_name, len(sqls[0]))
 
         assert bind_data is not None
         if stmt_name == b'' and msgs_num > 1:
@@ -1537,6 +1653,82 @@ cdef class PGConnection:
             )
             await self.after_command()
 
+    async def sql_copy_in_data(self, sql: bytes, data: bytes) -> int:
+        """Execute a script with a COPY ... FROM STDIN, sending *data*.
+
+        *data* must be in the format the COPY expects.  Returns the row
+        count reported by the last command of the script.
+        """
+        cdef:
+            WriteBuffer out
+            WriteBuffer buf
+            ssize_t pos
+
+        self.before_command()
+        started_at = time.monotonic()
+        try:
+            out = WriteBuffer.new()
+            buf = WriteBuffer.new_message(b'Q')
+            buf.write_bytestring(sql)
+            out.write_buffer(buf.end_message())
+            self.waiting_for_sync += 1
+            self.write(out)
+
+            exc = None
+            row_count = 0
+            while True:
+                if not self.buffer.take_message():
+                    await self.wait_for_message()
+                mtype = self.buffer.get_message_type()
+
+                try:
+                    if mtype == b'G':
+                        # CopyInResponse
+                        self.buffer.discard_message()
+                        out = WriteBuffer.new()
+                        pos = 0
+                        while pos < len(data):
+                            buf = WriteBuffer.new_message(b'd')
+                            buf.write_bytes(data[pos:pos + DATA_BUFFER_SIZE])
+                            out.write_buffer(buf.end_message())
+                            pos += DATA_BUFFER_SIZE
+                        buf = WriteBuffer.new_message(b'c')
+                        out.write_buffer(buf.end_message())
+                        self.write(out)
+
+                    elif mtype == b'C':
+                        # CommandComplete
+                        tag = self.buffer.read_null_str()
+                        count = tag.rpartition(b' ')[2]
+                        row_count = int(count) if count.isdigit() else 0
+
+                    elif mtype == b'D' or mtype == b'T' or mtype == b'I':
+                        # DataRow, RowDescription or EmptyQueryResponse
+                        self.buffer.discard_message()
+
+                    elif mtype == b'E':
+                        # ErrorResponse
+                        exc = self.parse_error_message()
+
+                    elif mtype == b'Z':
+                        self.parse_sync_message()
+                        break
+
+                    else:
+                        self.fallthrough()
+
+                finally:
+                    self.buffer.finish_message()
+
+            if exc is not None:
+                raise exc[0](fields=exc[1])
+            return row_count
+        finally:
+            metrics.backend_query_duration.observe(
+                time.monotonic() - started_at, self.get_tenant_label()
+            )
+            await self.after_command()
+
     async def sql_apply_state(
         self,
         dbv: pg_ext.ConnectionView,
@@ -1593,6 +1785,123 @@ cdef class PGConnection:
         finally:
             await self.after_command()
 
+    async def sql_copy_in(
+        self,
+        query_unit,
+        fe_conn: pg_ext.PgConnection,
+        dbv: pg_ext.ConnectionView,
+    ):
+        """Execute COPY ... FROM STDIN, relaying the data sent by the client.
+
+        The query of *query_unit* is a script that loads the data into a
+        staging table and then moves it into the subject table, so it is
+        sent with the simple query protocol.  Of the responses, only the
+        CopyInResponse and the final CommandComplete are relayed; the caller
+        is responsible for ReadyForQuery.
+        """
+        cdef:
+            WriteBuffer buf, msg_buf
+            int32_t field_size
+            int64_t row_count = 0
+
+        self.before_command()
+        try:
+            buf = WriteBuffer.new()
+            state = None
+            if not dbv.in_tx():
+                state = dbv.serialize_state()
+                self._build_apply_sql_state_req(state, buf)
+                self.write_sync(buf)
+
+            msg_buf = WriteBuffer.new_message(b'Q')
+            msg_buf.write_bytestring(query_unit.query.encode('utf-8'))
+            buf.write_buffer(msg_buf.end_message())
+            self.write(buf)
+            # A simple query is concluded by ReadyForQuery, just like a SYNC.
+            self.waiting_for_sync += 1
+
+            if state is not None:
+                await self._parse_apply_state_resp(
+                    2 if state != EMPTY_SQL_STATE else 1
+                )
+                await self.wait_for_sync()
+                self.last_state = state
+                self.state_reset_needs_commit = (
+                    dbv.needs_commit_after_state_sync())
+
+            er = None
+            while True:
+                if not self.buffer.take_message():
+                    await self.wait_for_message()
+                mtype = self.buffer.get_message_type()
+
+                if mtype == b'G':
+                    # CopyInResponse: the columns of the staging table
+                    # match the ones requested by the client, so it can be
+                    # relayed as is.
+                    buf = WriteBuffer.new()
+                    self.buffer.redirect_messages(buf, mtype, 0)
+                    fe_conn.write(buf)
+                    fe_conn.flush()
+
+                    # CopyData, concluded by CopyDone or CopyFail.  If the
+                    # backend fails the COPY early, it discards the rest of
+                    # the data, so just keep streaming it.
+                    while True:
+                        buf = WriteBuffer.new()
+                        done = await fe_conn.read_copy_in_data(buf)
+                        if buf.len() > 0:
+                            self.write(buf)
+                        if done:
+                            break
+
+                elif mtype == b'D':
+                    # DataRow with the number of inserted rows, injected
+                    # into the resolved INSERT (which is a SELECT over
+                    # DML CTEs, so its CommandComplete tag doesn't carry
+                    # the count).  Simple queries return it in text format.
+                    data = self.buffer.consume_message()
+                    field_size = read_int32(data[2:6])
+                    row_count = int(data[6:6 + field_size])
+
+                elif mtype == b'T' or mtype == b'C':
+                    # RowDescription or CommandComplete of one of
+                    # the statements of the script
+                    self.buffer.discard_message()
+
+                elif mtype == b'E':
+                    # ErrorResponse
+                    er = self.parse_error_message()
+
+                elif mtype == b'Z':
+                    self.parse_sync_message()
+                    break
+
+                else:
+                    self.fallthrough()
+
+            if er is not None:
+                fe_conn.on_error(query_unit)
+                dbv.on_error()
+                # The position would point into the script rather than
+                # the query of the client.
+                er[1].pop('P', None)
+                raise er[0](fields=er[1])
+
+            fe_conn.on_success(query_unit)
+            dbv.on_success(query_unit)
+
+            tag = query_unit.command_complete_tag
+            msg_buf = WriteBuffer.new_message(b'C')
+            msg_buf.write_str(f'{tag.prefix}{row_count}', "utf-8")
+            fe_conn.write(msg_buf.end_message())
+        finally:
+            if not dbv.in_tx():
+                self.last_state = dbv.serialize_state()
+                self.state_reset_needs_commit = (
+                    dbv.needs_commit_after_state_sync())
+            await self.after_command()
+
     def _write_sql_extended_query(
         self,
         actions,
@@ -1632,6 +1941,12 @@ cdef class PGConnection:
                             self.debug_print(
                                 'Parse cache hit', action.stmt_name, sql_text)
                         action.frontend_only = True
+                if action.is_injected():
+                    metrics.sql_injected_parses.inc(
+                        1.0,
+                        self.get_tenant_label(),
+                        'cache' if action.is_frontend_only() else 'backend',
+                    )
                 if not action.is_frontend_only():
                     prepared.add(action.stmt_name)
                     msg_buf = WriteBuffer.new_message(b'P')
@@ -1642,6 +1957,7 @@ cdef class PGConnection:
                     metrics.query_size.observe(
                         len(sql_text), self.get_tenant_label(), 'compiled'
                     )
+                    self.note_parse(action.stmt_name, len(sql_text))
                     if self.debug:
                         self.debug_print(
                             'Parse', action.stmt_name, sql_text, data
@@ -1737,7 +2053,8 @@ cdef class PGConnection:
                     action.query_unit is not None
                     and action.query_unit.deallocate is not None
                     and self.before_prepare(
-                        action.query_unit.deallocate.be_stmt_name, dbver, buf
+                        action.query_unit.deallocate.be_stmt_name, dbver, buf,
+                        False,
                     )
                 ):
                     # This prepared statement does not actually exist
@@ -2203,12 +2520,20 @@ cdef class PGConnection:
                         if self.debug:
                             self.debug_print('REDIRECT OTHER MSG', mtype)
                         messages_redirected = self.buffer.redirect_messages(
-                            buf, mtype, 0
+                            buf, mtype, DATA_BUFFER_SIZE
                         )
 
                         # DataRow
                         if mtype == b'D':
                             row_count += messages_redirected
+
+                        if buf.len() >= DATA_BUFFER_SIZE:
+                            # Stream large results (e.g. COPY TO STDOUT)
+                            # instead of accumulating them in memory.
+                            fe_conn.write(buf)
+                            fe_conn.flush()
+                            buf = WriteBuffer.new()
+                            await self._wait_for_frontend(fe_conn)
                     else:
                         logger.warning(
                             f"discarding unexpected backend message: "
@@ -2220,6 +2545,22 @@ cdef class PGConnection:
             fe_conn.write(buf)
         return rv, False
 
+    async def _wait_for_frontend(
+        self, frontend.AbstractFrontendConnection fe_conn
+    ):
+        # If the client is not keeping up with the results, stop reading
+        # from the backend until the frontend transport drains, so that
+        # the server memory stays bounded.
+        waiter = fe_conn.write_waiter()
+        if waiter is None:
+            return
+        metrics.sql_stream_pauses.inc(1.0, self.get_tenant_label())
+        self.transport.pause_reading()
+        try:
+            await waiter
+        finally:
+            self.transport.resume_reading()
+
     def _write_error_position(
         self,
         msg_buf: WriteBuffer,
@@ -2921,6 +3262,9 @@ cdef class PGConnection:
                     dbname = event_payload['dbname']
                     keys = event_payload.get('keys')
                     self.tenant.on_remote_query_cache_change(dbname, keys=keys)
+                elif event == 'net-requests-scheduled':
+                    dbname = event_payload['dbname']
+                    self.tenant.on_remote_net_requests_scheduled(dbname)
                 else:
                     raise AssertionError(f'unexpected system event: {event!r}')
 
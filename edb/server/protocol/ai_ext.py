@@ -31,13 +31,20 @@ from typing import (
 )
 
 import abc
+import array
 import asyncio
+import collections
 import contextlib
 import contextvars
+import hashlib
 import itertools
 import json
 import logging
+import struct
+import sys
 import uuid
+import weakref
+import zlib
 
 import tiktoken
 from mistral_common.tokens.tokenizers import mistral as mistral_tokenizer
@@ -51,6 +58,7 @@ from edb.common import uuidgen
 
 from edb.server import compiler, http
 from edb.server import defines as edbdef
+from edb.server import metrics
 from edb.server.compiler import sertypes
 from edb.server.protocol import execute
 from edb.server.protocol import request_scheduler as rs
@@ -64,6 +72,18 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger("edb.server.ai_ext")
 
+# Number of pending embeddings fetched at once for each model.
+_PENDING_EMBEDDINGS_PAGE_SIZE = 500
+_NIL_UUID = uuid.UUID(int=0)
+
+_COPY_BINARY_HEADER = b'PGCOPY\n\377\r\n\0' + struct.pack('!ii', 0, 0)
+_COPY_BINARY_TRAILER = struct.pack('!h', -1)
+# Field count of the tuple and length of the uuid field
+_COPY_ID_FIELD_HEADER = struct.pack('!hi', 2, 16)
+
+# Size in bytes of the in-memory embeddings cache of each tenant.
+_EMBEDDINGS_CACHE_SIZE = 32 * 1024 * 1024
+
 
 class AIExtError(Exception):
     http_status: ClassVar[http.HTTPStatus] = (
@@ -300,7 +320,8 @@ async def _ext_ai_index_builder_controller_loop(
                     models = await _ext_ai_fetch_active_models(pgconn)
                     if models:
                         if not holding_lock:
-                            holding_lock = await _ext_ai_lock(tenant, pgconn)
+                            holding_lock = await _ext_ai_lock(
+                                tenant, dbname, pgconn)
                         if holding_lock:
                             provider_contexts = _prepare_provider_contexts(
                                 db,
@@ -320,7 +341,7 @@ async def _ext_ai_index_builder_controller_loop(
                             finally:
                                 if not sleep_timer.is_ready_and_urgent():
                                     await asyncutil.deferred_shield(
-                                        _ext_ai_unlock(tenant))
+                                        _ext_ai_unlock(tenant, dbname))
                                     holding_lock = False
             except Exception:
                 logger.exception(f"caught error in {task_name}")
@@ -368,27 +389,45 @@ async def _ext_ai_fetch_active_models(
 # in the index builder job above guarding multiple alternating database pgcons
 # and outgoing HTTP requests (free up pgcons while waiting for a response from
 # external services), so that different Gel tenants on the same backend
-# run this job exclusively.
+# run this job exclusively on a given branch.  Index builders of different
+# branches run concurrently, sharing the rate limits of the providers through
+# the tenant-wide provider budgets below.
 #
 # The following implementation is also safe to be used by multiple tasks within
 # the same tenant (though at the time of writing, there is only one such task
-# per tenant). To achieve this, we added an extra query on pg_locks to check if
+# per branch). To achieve this, we added an extra query on pg_locks to check if
 # it's already held by another task, because advisory locks allow reentrancy
 # from the same session (the same sys_pgcon). And to avoid racing conditions,
 # we use another advisory lock over the 2 queries of check-and-lock in the
 # local session. This also means, one must use _ext_ai_lock() instead of an
 # individual lock of the 2 locks here to avoid misuse.
 #
+# The lock of a branch is the 64-bit key made of a hash of the branch name in
+# the upper half (classid in pg_locks) and _EXT_AI_ADVISORY_LOCK in the lower
+# half (objid in pg_locks).
+#
 # If you are editing the magic numbers here: make sure it fits in a Postgres
 # Oid type (uint32), or you'll need to change the `classid` query below.
 _EXT_AI_ADVISORY_LOCK = b"3987734540"
 _EXT_AI_ADVISORY_LOCK_LOCK = b"3987734541"
 
 
+def _ext_ai_lock_key(
+    tenant: srv_tenant.Tenant,
+    dbname: str,
+) -> tuple[bytes, bytes]:
+    # Keep the key positive in a signed bigint
+    branch_key = zlib.crc32(tenant.get_pg_dbname(dbname).encode()) & 0x7fffffff
+    key = (branch_key << 32) | int(_EXT_AI_ADVISORY_LOCK)
+    return str(key).encode(), str(branch_key).encode()
+
+
 async def _ext_ai_lock(
     tenant: srv_tenant.Tenant,
+    dbname: str,
     pgconn: pgcon.PGConnection,
 ) -> bool:
+    key, branch_key = _ext_ai_lock_key(tenant, dbname)
     # We use transaction-level advisory locks to ensure releasing
     await pgconn.sql_execute(b"START TRANSACTION")
     try:
@@ -407,16 +446,15 @@ async def _ext_ai_lock(
                         pg_locks
                     WHERE
                         locktype = 'advisory'
-                        AND classid = 0
+                        AND classid = \
+                ''' + branch_key + b'''
                         AND objid = \
                 ''' + _EXT_AI_ADVISORY_LOCK + b')')
             if lock_free == b'\x01':
                 async with tenant.use_sys_pgcon() as syscon:
                     # The long-term holding lock must be on session-level
                     b = await syscon.sql_fetch_val(
-                        b"SELECT pg_try_advisory_lock("
-                        + _EXT_AI_ADVISORY_LOCK
-                        + b")"
+                        b"SELECT pg_try_advisory_lock(" + key + b")"
                     )
                     return b == b'\x01'
     finally:
@@ -427,10 +465,77 @@ async def _ext_ai_lock(
 
 async def _ext_ai_unlock(
     tenant: srv_tenant.Tenant,
+    dbname: str,
 ) -> None:
+    key, _ = _ext_ai_lock_key(tenant, dbname)
     async with tenant.use_sys_pgcon() as syscon:
         await syscon.sql_fetch_val(
-            b"SELECT pg_advisory_unlock(" + _EXT_AI_ADVISORY_LOCK + b")")
+            b"SELECT pg_advisory_unlock(" + key + b")")
+
+
+@dataclass
+class ProviderBudget:
+    """Rate limits of a provider account, shared by all branches using it.
+
+    The index builders of the branches of a tenant which are configured
+    with the same provider account share the same rs.Service, so that its
+    rate limits are learned once and its budget is shared between them.
+    """
+
+    service: rs.Service
+    # Number of embeddings requests deferred by the rate limits, per branch
+    deferred_requests: dict[str, int] = field(default_factory=dict)
+
+
+_provider_budgets: weakref.WeakKeyDictionary[
+    srv_tenant.Tenant, dict[tuple[str, str], ProviderBudget]
+] = weakref.WeakKeyDictionary()
+
+
+def _get_provider_budget(
+    db: dbview.Database,
+    provider_name: str,
+) -> ProviderBudget:
+    try:
+        provider_cfg = _get_provider_config(db=db, provider_name=provider_name)
+    except AIExtError:
+        # Not configured: keep it to the branch
+        account = f"branch:{db.name}"
+    else:
+        account = hashlib.sha256(
+            "\0".join((
+                provider_cfg.api_url,
+                provider_cfg.client_id,
+                provider_cfg.secret,
+            )).encode()
+        ).hexdigest()
+
+    budgets = _provider_budgets.setdefault(db.tenant, {})
+    budget = budgets.get((provider_name, account))
+    if budget is None:
+        budget = ProviderBudget(
+            service=rs.Service(
+                limits={'requests': None, 'tokens': None},
+            ),
+        )
+        budgets[(provider_name, account)] = budget
+    return budget
+
+
+def _update_queue_depth_metric(
+    tenant: srv_tenant.Tenant,
+    provider_name: str,
+) -> None:
+    budgets = _provider_budgets.get(tenant, {})
+    metrics.ai_index_queued_requests.set(
+        sum(
+            sum(budget.deferred_requests.values())
+            for (name, _), budget in budgets.items()
+            if name == provider_name
+        ),
+        tenant.get_instance_name(),
+        provider_name,
+    )
 
 
 def _prepare_provider_contexts(
@@ -459,21 +564,27 @@ def _prepare_provider_contexts(
         if provider_name not in models_by_provider
     }
     for unused_provider_name in unused_provider_names:
-        provider_schedulers.pop(unused_provider_name, None)
+        unused_scheduler = provider_schedulers.pop(unused_provider_name, None)
+        if unused_scheduler is not None:
+            unused_scheduler.set_budget(None)
 
     # Create contexts
     provider_contexts = {}
 
     for provider_name, provider_models in models_by_provider.items():
+        budget = _get_provider_budget(db, provider_name)
         if provider_name not in provider_schedulers:
             # Create new schedulers if necessary
             provider_schedulers[provider_name] = ProviderScheduler(
-                service=rs.Service(
-                    limits={'requests': None, 'tokens': None},
-                ),
+                service=budget.service,
                 provider_name=provider_name,
+                db=db,
+                budget=budget,
             )
         provider_scheduler = provider_schedulers[provider_name]
+        if provider_scheduler.budget is not budget:
+            # The provider account was reconfigured
+            provider_scheduler.set_budget(budget)
 
         if not provider_scheduler.timer.is_ready():
             continue
@@ -531,6 +642,10 @@ class ProviderContext(rs.Context):
 class ProviderScheduler(rs.Scheduler[EmbeddingsData]):
 
     provider_name: str = ''
+    db: Optional[dbview.Database] = None
+
+    # The provider budget shared with the other branches of the tenant
+    budget: Optional[ProviderBudget] = None
 
     # If a text is too long for a model, it will be excluded from embeddings
     # to prevent pointlessly wasting requests and tokens.
@@ -538,6 +653,10 @@ class ProviderScheduler(rs.Scheduler[EmbeddingsData]):
     # flag is on, previously excluded inputs will be truncated and processed.
     model_excluded_ids: dict[str, list[str]] = field(default_factory=dict)
 
+    # Pending embeddings are fetched in pages ordered by object id; this is
+    # the last id of the previous page of each model.
+    model_pending_cursors: dict[str, uuid.UUID] = field(default_factory=dict)
+
     async def get_params(
         self, context: rs.Context,
     ) -> Optional[Sequence[EmbeddingsParams]]:
@@ -549,6 +668,7 @@ class ProviderScheduler(rs.Scheduler[EmbeddingsData]):
             self.provider_name,
             context.provider_models,
             self.model_excluded_ids,
+            self.model_pending_cursors,
             tokens_rate_limit=(
                 self.service.limits['tokens'].total
                 if self.service.limits['tokens'] is not None else
@@ -556,9 +676,24 @@ class ProviderScheduler(rs.Scheduler[EmbeddingsData]):
             ),
         )
 
+    def set_budget(self, budget: Optional[ProviderBudget]) -> None:
+        self._set_deferred_requests(0)
+        if budget is not None:
+            self.service = budget.service
+        self.budget = budget
+
+    def _set_deferred_requests(self, count: int) -> None:
+        if self.db is None or self.budget is None:
+            return
+        self.budget.deferred_requests[self.db.name] = count
+        _update_queue_depth_metric(self.db.tenant, self.provider_name)
+
     def finalize(self, execution_report: rs.ExecutionReport) -> None:
         task_name = _task_name.get()
 
+        self._set_deferred_requests(
+            execution_report.deferred_costs.get('requests', 0))
+
         for message in execution_report.known_error_messages:
             logger.error(
                 f"{task_name}: "
@@ -570,10 +705,12 @@ class ProviderScheduler(rs.Scheduler[EmbeddingsData]):
 @dataclass(frozen=True, kw_only=True)
 class EmbeddingsParams(rs.Params[EmbeddingsData]):
     pgconn: pgcon.PGConnection
+    tenant_name: str
     http_client: http.HttpClient
+    cache: EmbeddingsCache
     provider: ProviderConfig
     model_name: str
-    inputs: list[tuple[PendingEmbedding, str]]
+    inputs: list[EmbeddingsInput]
     token_count: int
     shortening: Optional[int]
     user: Optional[str]
@@ -598,15 +735,16 @@ class EmbeddingsRequest(rs.Request[EmbeddingsData]):
             result = await _generate_embeddings(
                 self.params.provider,
                 self.params.model_name,
-                [input[1] for input in self.params.inputs],
+                [input.text for input in self.params.inputs],
                 self.params.shortening,
                 self.params.user,
                 self.params.http_client,
             )
             result.pgconn = self.params.pgconn
-            result.pending_entries = [
-                input[0] for input in self.params.inputs
-            ]
+            result.tenant_name = self.params.tenant_name
+            result.provider_name = self.params.provider.name
+            result.cache = self.params.cache
+            result.inputs = self.params.inputs
             return result
         except AIExtError as e:
             logger.error(f"{task_name}: {e}")
@@ -622,35 +760,29 @@ class EmbeddingsRequest(rs.Request[EmbeddingsData]):
 class EmbeddingsResult(rs.Result[EmbeddingsData]):
 
     pgconn: Optional[Any] = None
-    pending_entries: Optional[list[PendingEmbedding]] = None
+    tenant_name: str = ''
+    provider_name: str = ''
+    cache: Optional[EmbeddingsCache] = None
+    inputs: Optional[list[EmbeddingsInput]] = None
 
     async def finalize(self) -> None:
         if isinstance(self.data, rs.Error):
             return
-        if self.pgconn is None or self.pending_entries is None:
+        if self.pgconn is None or self.inputs is None:
             return
 
-        # Entries must line up with the embeddings data:
-        # - `_generate_embeddings` produces produces embeddings data matching
-        #   the order of its inputs
-        #
-        # Entries must be grouped by target rel:
-        # - `_generate_embeddings_params` sorts inputs by target rel before
-        groups = itertools.groupby(
-            self.pending_entries, key=lambda e: (e.target_rel, e.target_attr),
+        # Inputs line up with the embeddings data: `_generate_embeddings`
+        # produces embeddings data matching the order of its inputs.
+        embeddings = _decode_embeddings(self.data.embeddings)
+        updates: list[tuple[PendingEmbedding, array.array[float]]] = []
+        for input, embedding in zip(self.inputs, embeddings):
+            if self.cache is not None:
+                self.cache.put(input.cache_key, embedding)
+            updates.extend((entry, embedding) for entry in input.entries)
+
+        await _store_embeddings(
+            self.pgconn, self.tenant_name, self.provider_name, updates,
         )
-        offset = 0
-        for (rel, attr), items in groups:
-            ids = [item.id for item in items]
-            await _update_embeddings_in_db(
-                self.pgconn,
-                rel,
-                attr,
-                ids,
-                self.data.embeddings,
-                offset,
-            )
-            offset += len(ids)
 
 
 async def _generate_embeddings_params(
@@ -660,6 +792,7 @@ async def _generate_embeddings_params(
     provider_name: str,
     provider_models: list[str],
     model_excluded_ids: dict[str, list[str]],
+    model_pending_cursors: dict[str, uuid.UUID],
     *,
     tokens_rate_limit: Optional[int | Literal['unlimited']],
 ) -> Optional[list[EmbeddingsParams]]:
@@ -709,6 +842,7 @@ async def _generate_embeddings_params(
         for model_name in provider_models
     }
 
+    cache = _get_embeddings_cache(db.tenant)
     model_pending_entries: dict[str, list[PendingEmbedding]] = {}
 
     for model_name in provider_models:
@@ -718,7 +852,7 @@ async def _generate_embeddings_params(
         )
 
         pending_entries = await _get_pending_embeddings(
-            pgconn, model_name, model_excluded_ids
+            pgconn, model_name, model_excluded_ids, model_pending_cursors
         )
 
         if not pending_entries:
@@ -736,6 +870,8 @@ async def _generate_embeddings_params(
         model_list.extend(pending_entries)
 
     embeddings_params: list[EmbeddingsParams] = []
+    # Pending embeddings of texts found in the embeddings cache
+    cached_updates: list[tuple[PendingEmbedding, array.array[float]]] = []
 
     for model_name, pending_entries in model_pending_entries.items():
         groups = itertools.groupby(
@@ -744,11 +880,12 @@ async def _generate_embeddings_params(
         for shortening, part_iter in groups:
             part = list(part_iter)
 
-            input_texts: list[str] = []
-            input_entries: list[PendingEmbedding] = []
+            inputs: list[EmbeddingsInput] = []
+            input_indexes: dict[bytes, int] = {}
             total_token_count: int = 0
             for pending_entry in part:
                 text = pending_entry.text
+                token_count = 0
 
                 if model_name in model_tokenizers:
                     tokenizer = model_tokenizers[model_name]
@@ -761,11 +898,11 @@ async def _generate_embeddings_params(
                         text = tokenizer.shorten_to_token_length(
                             text, truncate_length
                         )
-                        total_token_count += truncate_length
+                        token_count = truncate_length
                     else:
-                        current_token_count = len(tokenizer.encode(text))
+                        token_count = len(tokenizer.encode(text))
 
-                        if current_token_count > truncate_length:
+                        if token_count > truncate_length:
                             # If the text is too long, mark it as excluded and
                             # skip.
                             if model_name not in model_excluded_ids:
@@ -775,10 +912,30 @@ async def _generate_embeddings_params(
                             )
                             continue
 
-                        total_token_count += current_token_count
+                cache_key = EmbeddingsCache.make_key(
+                    provider_cfg, model_name, shortening, text
+                )
+                embedding = cache.get(cache_key)
+                if embedding is not None:
+                    cached_updates.append((pending_entry, embedding))
+                    continue
+
+                index = input_indexes.get(cache_key)
+                if index is not None:
+                    # The same text is requested only once per page
+                    inputs[index].entries.append(pending_entry)
+                    continue
+
+                input_indexes[cache_key] = len(inputs)
+                inputs.append(EmbeddingsInput(
+                    text=text,
+                    cache_key=cache_key,
+                    entries=[pending_entry],
+                ))
+                total_token_count += token_count
 
-                input_texts.append(text)
-                input_entries.append(pending_entry)
+            if not inputs:
+                continue
 
             if model_name in model_tokenizers:
                 tokenizer = model_tokenizers[model_name]
@@ -790,25 +947,20 @@ async def _generate_embeddings_params(
 
                 # Group the input into batches based on token count
                 batches = _batch_embeddings_inputs(
-                    tokenizer, input_texts, max_batch_tokens
+                    tokenizer, [input.text for input in inputs],
+                    max_batch_tokens,
                 )
 
                 for batch_input_indexes, batch_token_count in batches:
-                    inputs = [
-                        (input_entries[index], input_texts[index])
-                        for index in batch_input_indexes
-                    ]
-
-                    # Sort the batches by target_rel. This groups embeddings
-                    # for each table together.
-                    # This is necessary for `EmbeddingsResult.finalize()`
-                    inputs.sort(key=lambda e: e[0].target_rel)
-
                     embeddings_params.append(EmbeddingsParams(
                         pgconn=pgconn,
+                        tenant_name=db.tenant.get_instance_name(),
+                        cache=cache,
                         provider=provider_cfg,
                         model_name=model_name,
-                        inputs=inputs,
+                        inputs=[
+                            inputs[index] for index in batch_input_indexes
+                        ],
                         token_count=batch_token_count,
                         shortening=shortening,
                         user=None,
@@ -816,14 +968,10 @@ async def _generate_embeddings_params(
                     ))
 
             else:
-                inputs = list(zip(input_entries, input_texts))
-                # Sort the inputs by target_rel. This groups embeddings
-                # for each table together.
-                # This is necessary for `EmbeddingsResult.finalize()`
-                inputs.sort(key=lambda e: e[0].target_rel)
-
                 embeddings_params.append(EmbeddingsParams(
                     pgconn=pgconn,
+                    tenant_name=db.tenant.get_instance_name(),
+                    cache=cache,
                     provider=provider_cfg,
                     model_name=model_name,
                     inputs=inputs,
@@ -833,6 +981,17 @@ async def _generate_embeddings_params(
                     http_client=http_client,
                 ))
 
+    if cached_updates:
+        logger.debug(
+            f"{task_name} reusing {len(cached_updates)} cached embeddings"
+        )
+        await _store_embeddings(
+            pgconn,
+            db.tenant.get_instance_name(),
+            provider_name,
+            cached_updates,
+        )
+
     return embeddings_params
 
 
@@ -846,31 +1005,34 @@ class PendingEmbedding:
     truncate_to_max: bool
 
 
+@dataclass(frozen=True, kw_only=True)
+class EmbeddingsInput:
+    text: str
+    cache_key: bytes
+    # All pending embeddings of the same text share the result
+    entries: list[PendingEmbedding]
+
+
 async def _get_pending_embeddings(
     pgconn: pgcon.PGConnection,
     model_name: str,
     model_excluded_ids: dict[str, list[str]],
+    model_pending_cursors: dict[str, uuid.UUID],
 ) -> list[PendingEmbedding]:
     task_name = _task_name.get()
 
-    where_clause = ""
-    if (
-        model_name in model_excluded_ids
-        and (excluded_ids := model_excluded_ids[model_name])
-    ):
+    excluded_ids = model_excluded_ids.get(model_name, [])
+    if excluded_ids:
         # Only exclude long text if it won't be auto-truncated.
         logger.debug(
             f"{task_name} skipping {len(excluded_ids)} indexes "
             f"for {model_name!r}"
         )
-        where_clause = (f"""
-            WHERE
-                q."id" not in ({','.join(
-                    "'" + excluded_id + "'"
-                    for excluded_id in excluded_ids
-                )})
-                OR q."truncate_to_max"
-        """)
+
+    # Keyset pagination: continue after the last entry of the previous
+    # page, so that entries which are excluded or still being processed
+    # don't have to be scanned over again.
+    cursor = model_pending_cursors.get(model_name, _NIL_UUID)
 
     entries = await pgconn.sql_fetch(
         f"""
@@ -887,16 +1049,35 @@ async def _get_pending_embeddings(
                     "truncate_to_max"
                 FROM
                     edgedbext."ai_pending_embeddings_{model_name}"
+                WHERE
+                    "id" > $1::text::uuid
+                    AND (
+                        "truncate_to_max"
+                        OR NOT ("id" = ANY($2::text::uuid[]))
+                    )
+                ORDER BY
+                    "id"
                 LIMIT
-                    500
+                    {_PENDING_EMBEDDINGS_PAGE_SIZE}
             ) AS q
-        {where_clause}
         ORDER BY
             q."target_dims_shortening"
         """.encode(),
+        args=(
+            str(cursor).encode(),
+            f'{{{",".join(excluded_ids)}}}'.encode(),
+        ),
         tx_isolation=edbdef.TxIsolationLevel.RepeatableRead,
     )
 
+    if len(entries) < _PENDING_EMBEDDINGS_PAGE_SIZE:
+        # Reached the end, start over from the beginning next time.
+        model_pending_cursors.pop(model_name, None)
+    else:
+        model_pending_cursors[model_name] = max(
+            uuidgen.from_bytes(entry[0]) for entry in entries
+        )
+
     if not entries:
         return []
 
@@ -986,55 +1167,168 @@ def _batch_embeddings_inputs(
     return batches
 
 
+class EmbeddingsCache:
+    """An in-memory LRU cache of embeddings of a tenant.
+
+    Embeddings are keyed by the provider, the model, the requested
+    dimensions and a hash of the text, so that identical texts (re-indexed
+    after an update, duplicated across objects or repeated in RAG queries)
+    are only sent to the provider once.
+
+    The cache is bounded by the total size of the keys and the vectors, as
+    the number of dimensions varies widely between models.
+    """
+
+    def __init__(self, *, maxbytes: int = _EMBEDDINGS_CACHE_SIZE) -> None:
+        self._entries: collections.OrderedDict[
+            bytes, array.array[float]
+        ] = collections.OrderedDict()
+        self._maxbytes = maxbytes
+        self._nbytes = 0
+
+    @staticmethod
+    def make_key(
+        provider: ProviderConfig,
+        model_name: str,
+        shortening: Optional[int],
+        text: str,
+    ) -> bytes:
+        h = hashlib.sha256()
+        for part in (provider.name, provider.api_url, model_name):
+            h.update(part.encode())
+            h.update(b'\0')
+        h.update(str(shortening).encode())
+        h.update(b'\0')
+        h.update(text.encode())
+        return h.digest()
+
+    @staticmethod
+    def _entry_size(key: bytes, embedding: array.array[float]) -> int:
+        return len(key) + embedding.itemsize * len(embedding)
+
+    def get(self, key: bytes) -> Optional[array.array[float]]:
+        embedding = self._entries.get(key)
+        if embedding is not None:
+            self._entries.move_to_end(key)
+        return embedding
+
+    def put(self, key: bytes, embedding: array.array[float]) -> None:
+        nbytes = self._entry_size(key, embedding)
+        if nbytes > self._maxbytes:
+            return
+        prev = self._entries.pop(key, None)
+        if prev is not None:
+            self._nbytes -= self._entry_size(key, prev)
+        self._entries[key] = embedding
+        self._nbytes += nbytes
+        # Evict the least recently used entries
+        while self._nbytes > self._maxbytes:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._nbytes -= self._entry_size(evicted_key, evicted)
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_embeddings_caches: weakref.WeakKeyDictionary[
+    srv_tenant.Tenant, EmbeddingsCache
+] = weakref.WeakKeyDictionary()
+
+
+def _get_embeddings_cache(tenant: srv_tenant.Tenant) -> EmbeddingsCache:
+    try:
+        return _embeddings_caches[tenant]
+    except KeyError:
+        cache = _embeddings_caches[tenant] = EmbeddingsCache()
+        return cache
+
+
+def _decode_embeddings(embeddings: bytes) -> list[array.array[float]]:
+    # Single precision is what pgvector stores anyway, and halves the
+    # memory of the cached embeddings.
+    return [
+        array.array('f', item['embedding'])
+        for item in json.loads(embeddings)['data']
+    ]
+
+
+def _encode_vector(embedding: array.array[float]) -> bytes:
+    """Encode an embedding in pgvector's binary format.
+
+    The vector is the number of dimensions and an unused int16 followed
+    by the float4 values, all in network byte order.
+    """
+    # Always a copy: the embedding may be shared with the cache and other
+    # rows of the same text, so it must not be byteswapped in place.
+    values = array.array('f', embedding)
+    if sys.byteorder == 'little':
+        values.byteswap()
+    return struct.pack('!hh', len(values), 0) + values.tobytes()
+
+
+async def _store_embeddings(
+    pgconn: pgcon.PGConnection,
+    tenant_name: str,
+    provider_name: str,
+    updates: list[tuple[PendingEmbedding, array.array[float]]],
+) -> None:
+    updates.sort(key=lambda u: (u[0].target_rel, u[0].target_attr))
+    groups = itertools.groupby(
+        updates, key=lambda u: (u[0].target_rel, u[0].target_attr),
+    )
+    for (rel, attr), items in groups:
+        ids = []
+        vectors = []
+        for entry, embedding in items:
+            ids.append(entry.id)
+            vectors.append(_encode_vector(embedding))
+        await _update_embeddings_in_db(pgconn, rel, attr, ids, vectors)
+
+    metrics.ai_index_embeddings.inc(len(updates), tenant_name, provider_name)
+
+
 async def _update_embeddings_in_db(
     pgconn: pgcon.PGConnection,
     rel: str,
     attr: str,
     ids: list[uuid.UUID],
-    embeddings: bytes,
-    offset: int,
+    vectors: list[bytes],
 ) -> int:
-    id_array = '", "'.join(id.hex for id in ids)
-    entries = await pgconn.sql_fetch_val(
+    # Build the data in the binary COPY format: the header, then a
+    # tuple of two fields for every embedding, then the trailer.
+    data = [_COPY_BINARY_HEADER]
+    for id, vector in zip(ids, vectors):
+        data.append(_COPY_ID_FIELD_HEADER)
+        data.append(id.bytes)
+        data.append(struct.pack('!i', len(vector)))
+        data.append(vector)
+    data.append(_COPY_BINARY_TRAILER)
+
+    return await pgconn.sql_copy_in_data(
         f"""
-        WITH upd AS (
-            UPDATE {rel} AS target
-            SET
-                {attr} = (
-                    (embeddings.data ->> 'embedding')::edgedb.vector)
-            FROM
-                (
-                    SELECT
-                        row_number() over () AS n,
-                        j.data
-                    FROM
-                        (SELECT
-                            data
-                        FROM
-                            json_array_elements(($1::json) -> 'data') AS data
-                        OFFSET
-                            $3::text::int
-                        ) AS j
-                ) AS embeddings,
-                unnest($2::text::text[]) WITH ORDINALITY AS ids(id, n)
-            WHERE
-                embeddings."n" = ids."n"
-                AND target."id" = ids."id"::uuid
-            RETURNING
-                target."id"
-        )
-        SELECT count(*)::text FROM upd
+        CREATE TEMPORARY TABLE "_edgedb_ai_embeddings" (
+            "id" uuid,
+            "embedding" edgedb.vector
+        ) ON COMMIT DROP;
+
+        COPY pg_temp."_edgedb_ai_embeddings"
+        FROM STDIN (FORMAT binary);
+
+        UPDATE {rel} AS target
+        SET
+            {attr} = embeddings."embedding"
+        FROM
+            pg_temp."_edgedb_ai_embeddings" AS embeddings
+        WHERE
+            target."id" = embeddings."id";
         """.encode(),
-        args=(
-            embeddings,
-            f'{{"{id_array}"}}'.encode(),
-            str(offset).encode(),
-        ),
-        tx_isolation=edbdef.TxIsolationLevel.RepeatableRead,
+        b''.join(data),
     )
 
-    return int(entries.decode())
-
 
 async def _generate_embeddings(
     provider: ProviderConfig,
@@ -1063,6 +1357,77 @@ async def _generate_embeddings(
         )
 
 
+async def _generate_cached_embeddings(
+    tenant: srv_tenant.Tenant,
+    provider: ProviderConfig,
+    model_name: str,
+    inputs: list[str],
+    shortening: Optional[int],
+    user: Optional[str],
+    http_client: http.HttpClient,
+) -> bytes:
+    """Generate embeddings of the inputs, reusing the cached ones.
+
+    Only the texts missing from the embeddings cache are sent to the
+    provider.  Returns the response of the provider as is if nothing was
+    cached, or an equivalent response including the cached embeddings.
+    """
+    cache = _get_embeddings_cache(tenant)
+    keys = [
+        EmbeddingsCache.make_key(provider, model_name, shortening, input)
+        for input in inputs
+    ]
+    embeddings = [cache.get(key) for key in keys]
+
+    missing: dict[bytes, str] = {}
+    for key, input, embedding in zip(keys, inputs, embeddings):
+        if embedding is None:
+            missing.setdefault(key, input)
+
+    response: dict[str, Any] = {
+        "object": "list",
+        "model": model_name,
+        "usage": {"prompt_tokens": 0, "total_tokens": 0},
+    }
+    if missing:
+        result = await _generate_embeddings(
+            provider,
+            model_name,
+            list(missing.values()),
+            shortening,
+            user,
+            http_client,
+        )
+        if isinstance(result.data, rs.Error):
+            raise AIProviderError(result.data.message)
+
+        generated = dict(
+            zip(missing, _decode_embeddings(result.data.embeddings))
+        )
+        for key, embedding in generated.items():
+            cache.put(key, embedding)
+
+        if len(generated) == len(inputs):
+            return result.data.embeddings
+
+        response = json.loads(result.data.embeddings)
+        embeddings = [
+            generated[key] if embedding is None else embedding
+            for key, embedding in zip(keys, embeddings)
+        ]
+
+    data = []
+    for index, embedding in enumerate(embeddings):
+        assert embedding is not None
+        data.append({
+            "object": "embedding",
+            "index": index,
+            "embedding": embedding.tolist(),
+        })
+    response["data"] = data
+    return json.dumps(response).encode()
+
+
 async def _generate_openai_embeddings(
     provider: ProviderConfig,
     model_name: str,
@@ -2296,6 +2661,12 @@ async def _handle_embeddings_request(
                 'missing or empty required "inputs" value in request'
             )
 
+        if not isinstance(inputs, list):
+            inputs = [inputs]
+
+        if not all(isinstance(input, str) for input in inputs):
+            raise TypeError('"inputs" must be a string or a list of strings')
+
         model_name = body.get("model")
         if not model_name:
             raise TypeError(
@@ -2318,10 +2689,8 @@ async def _handle_embeddings_request(
 
     provider = _get_provider_config(db, provider_name)
 
-    if not isinstance(inputs, list):
-        inputs = [inputs]
-
-    result = await _generate_embeddings(
+    embeddings = await _generate_cached_embeddings(
+        tenant,
         provider,
         model_name,
         inputs,
@@ -2329,12 +2698,10 @@ async def _handle_embeddings_request(
         user,
         http_client=tenant.get_http_client(originator="ai/embeddings"),
     )
-    if isinstance(result.data, rs.Error):
-        raise AIProviderError(result.data.message)
 
     response.status = http.HTTPStatus.OK
     response.content_type = b'application/json'
-    response.body = result.data.embeddings
+    response.body = embeddings
 
 
 async def _edgeql_query_json(
@@ -2586,7 +2953,8 @@ async def _generate_embeddings_for_type(
         shortening = index["index_embedding_dimensions"]
     else:
         shortening = None
-    result = await _generate_embeddings(
+    return await _generate_cached_embeddings(
+        db.tenant,
         provider,
         index["model"],
         [content],
@@ -2594,6 +2962,3 @@ async def _generate_embeddings_for_type(
         None,
         http_client,
     )
-    if isinstance(result.data, rs.Error):
-        raise AIProviderError(result.data.message)
-    return result.data.embeddings
@@ -60,6 +60,7 @@ cdef class EdgeConnection(frontend.FrontendConnection):
 
         dbview.CompiledQuery _last_anon_compiled
         int64_t _last_anon_compiled_hash
+        object _last_anon_compile_time
 
         bint query_cache_enabled
 
@@ -78,6 +79,8 @@ cdef class EdgeConnection(frontend.FrontendConnection):
     cdef inline dbview.DatabaseConnectionView get_dbview(self)
 
     cdef parse_execute_request(self)
+    cdef _complete_execute(self, compiled, query_req, timings)
+    cdef bint _is_pipelinable(self, tuple request)
     cdef parse_cardinality(self, bytes card)
     cdef char render_cardinality(self, query_unit) except -1
 
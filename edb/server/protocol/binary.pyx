@@ -73,9 +73,11 @@ from edb.server.compiler cimport rpc
 from edb.server.protocol cimport auth_helpers
 from edb.server.protocol import execute
 from edb.server.protocol cimport frontend
+from edb.server.cache import source_cache
 from edb.server.pgcon cimport pgcon
 from edb.server.pgcon import errors as pgerror
 from edb.server import metrics
+from edb.server import query_stats
 
 from edb.schema import objects as s_obj
 
@@ -101,6 +103,14 @@ cdef object FMT_BINARY = compiler.OutputFormat.BINARY
 cdef object LANG_EDGEQL = compiler.InputLanguage.EDGEQL
 cdef object LANG_SQL = compiler.InputLanguage.SQL
 
+cdef object SOURCE_CACHE = source_cache.SourceCache(
+    maxsize=edbdef._MAX_SOURCE_CACHE,
+    max_text_len=edbdef._MAX_SOURCE_CACHE_TEXT_LEN,
+)
+
+# Maximum number of pipelined Execute messages sent to the backend at once.
+cdef int MAX_PIPELINED_QUERIES = 64
+
 cdef tuple DUMP_VER_MIN = (0, 7)
 cdef tuple DUMP_VER_MAX = edbdef.CURRENT_PROTOCOL
 
@@ -141,6 +151,7 @@ cdef class EdgeConnection(frontend.FrontendConnection):
         self._dbview = None
 
         self._last_anon_compiled = None
+        self._last_anon_compile_time = None
 
         self.query_cache_enabled = not (debug.flags.disable_qcache or
                                         debug.flags.edgeql_compile)
@@ -160,6 +171,11 @@ cdef class EdgeConnection(frontend.FrontendConnection):
     cdef is_in_tx(self):
         return self.get_dbview().in_tx()
 
+    cdef pgcon_state_hint(self):
+        if self._dbview is None or self._dbview.in_tx():
+            return None
+        return self._dbview.serialize_state()
+
     cdef inline dbview.DatabaseConnectionView get_dbview(self):
         if self._dbview is None:
             raise RuntimeError('Cannot access dbview while it is None')
@@ -444,7 +460,12 @@ cdef class EdgeConnection(frontend.FrontendConnection):
         self.buffer.finish_message()
         return client_final
 
-    async def _execute_script(self, compiled: object, bind_args: bytes):
+    async def _execute_script(
+        self,
+        compiled: object,
+        bind_args: bytes,
+        timings: object = None,
+    ):
         cdef:
             pgcon.PGConnection conn
             dbview.DatabaseConnectionView dbv
@@ -453,7 +474,12 @@ cdef class EdgeConnection(frontend.FrontendConnection):
             raise ConnectionAbortedError
 
         dbv = self.get_dbview()
+        started_at = time.monotonic()
         async with self.with_pgcon() as conn:
+            if timings is not None:
+                now = time.monotonic()
+                timings.pgcon_wait = now - started_at
+                started_at = now
             await execute.execute_script(
                 conn,
                 dbv,
@@ -461,6 +487,8 @@ cdef class EdgeConnection(frontend.FrontendConnection):
                 bind_args,
                 fe_conn=self,
             )
+            if timings is not None:
+                timings.execute = time.monotonic() - started_at
 
     def _tokenize(
         self,
@@ -471,17 +499,26 @@ cdef class EdgeConnection(frontend.FrontendConnection):
         if lang is LANG_EDGEQL:
             if debug.flags.edgeql_disable_normalization:
                 return edgeql.Source.from_string(text)
-            else:
-                return edgeql.NormalizedSource.from_string(text)
+            factory = edgeql.NormalizedSource
+            interface = 'edgeql'
         elif lang is LANG_SQL:
             if debug.flags.edgeql_disable_normalization:
                 return pgparser.Source.from_string(text)
-            else:
-                return pgparser.NormalizedSource.from_string(text)
+            factory = pgparser.NormalizedSource
+            interface = 'sql'
         else:
             raise errors.UnsupportedFeatureError(
                 f"unsupported input language: {lang}")
 
+        source, cached = SOURCE_CACHE.get(factory, text)
+        metrics.query_normalizations.inc(
+            1.0,
+            self.get_tenant_label(),
+            interface,
+            'cache' if cached else 'normalizer',
+        )
+        return source
+
     async def _suppress_tx_timeout(self):
         async with self.with_pgcon() as conn:
             await conn.sql_execute(b'''
@@ -752,13 +789,19 @@ cdef class EdgeConnection(frontend.FrontendConnection):
         compiled: dbview.CompiledQuery,
         bind_args: bytes,
         use_prep_stmt: bint,
+        timings: object = None,
     ):
         cdef:
             dbview.DatabaseConnectionView dbv
             pgcon.PGConnection conn
 
         dbv = self.get_dbview()
+        started_at = time.monotonic()
         async with self.with_pgcon() as conn:
+            if timings is not None:
+                now = time.monotonic()
+                timings.pgcon_wait = now - started_at
+                started_at = now
             await execute.execute(
                 conn,
                 dbv,
@@ -766,7 +809,14 @@ cdef class EdgeConnection(frontend.FrontendConnection):
                 bind_args,
                 fe_conn=self,
                 use_prep_stmt=use_prep_stmt,
+                timings=timings,
             )
+            if timings is not None:
+                # Argument recoding is accounted for separately
+                timings.execute = (
+                    time.monotonic() - started_at
+                    - (timings.recode_args or 0.0)
+                )
 
         query_unit = compiled.query_unit_group[0]
         if query_unit.config_requires_restart:
@@ -873,7 +923,7 @@ cdef class EdgeConnection(frontend.FrontendConnection):
             role_name=self.username,
             branch_name=self.dbname,
         )
-        return rv, allow_capabilities
+        return rv, allow_capabilities, (state_tid, state_data)
 
     cdef get_checked_tag(self, dict annotations):
         tag = annotations.get("tag")
@@ -903,8 +953,14 @@ cdef class EdgeConnection(frontend.FrontendConnection):
         _dbview = self.get_dbview()
         if _dbview.get_state_serializer() is None:
             await _dbview.reload_state_serializer()
-        query_req, allow_capabilities = self.parse_execute_request()
+        query_req, allow_capabilities, _ = self.parse_execute_request()
+        started_at = time.monotonic()
         compiled = await self._parse(query_req, allow_capabilities)
+        if compiled.request is not None:
+            # Only freshly compiled queries carry the request
+            self._last_anon_compile_time = time.monotonic() - started_at
+        else:
+            self._last_anon_compile_time = None
 
         buf = self.make_command_data_description_msg(compiled)
 
@@ -919,7 +975,7 @@ cdef class EdgeConnection(frontend.FrontendConnection):
         self.write(buf)
         self.flush()
 
-    async def execute(self):
+    async def _read_execute_request(self):
         cdef:
             rpc.CompilationRequest query_req
             dbview.DatabaseConnectionView _dbview
@@ -937,12 +993,13 @@ cdef class EdgeConnection(frontend.FrontendConnection):
         _dbview = self.get_dbview()
         if _dbview.get_state_serializer() is None:
             await _dbview.reload_state_serializer()
-        query_req, allow_capabilities = self.parse_execute_request()
+        query_req, allow_capabilities, state = self.parse_execute_request()
         in_tid = self.buffer.read_bytes(16)
         out_tid = self.buffer.read_bytes(16)
         args = self.buffer.read_len_prefixed_bytes()
         self.buffer.finish_message()
 
+        timings = query_stats.QueryTimings()
         if (
             self._last_anon_compiled is not None and
             hash(query_req) == self._last_anon_compiled_hash and
@@ -951,13 +1008,17 @@ cdef class EdgeConnection(frontend.FrontendConnection):
         ):
             compiled = self._last_anon_compiled
             query_unit_group = compiled.query_unit_group
+            timings.compile = self._last_anon_compile_time
         else:
             query_unit_group = _dbview.lookup_compiled_query(query_req)
             if query_unit_group is None:
                 if self.debug:
                     self.debug_print('EXECUTE /CACHE MISS', query_req.source.text())
 
+                started_at = time.monotonic()
                 compiled = await self._parse(query_req, allow_capabilities)
+                if compiled.request is not None:
+                    timings.compile = time.monotonic() - started_at
                 query_unit_group = compiled.query_unit_group
                 if self._cancelled:
                     raise ConnectionAbortedError
@@ -980,6 +1041,36 @@ cdef class EdgeConnection(frontend.FrontendConnection):
             "disabled by the client",
         )
 
+        return compiled, query_req, in_tid, out_tid, args, timings, state
+
+    async def execute(self):
+        request = await self._read_execute_request()
+
+        # If the client has already sent a Sync and more messages after
+        # this Execute, try to pipeline the queries to the backend.  The
+        # Sync message is 5 bytes long, so anything more is the start of
+        # another message.
+        if (
+            self.buffer._length > 5
+            and self._is_pipelinable(request)
+            and self.buffer.take_message_type(b'S')
+        ):
+            await self._execute_pipelined(request)
+        else:
+            await self._execute_request(request)
+
+    async def _execute_request(self, tuple request):
+        cdef:
+            rpc.CompilationRequest query_req
+            dbview.DatabaseConnectionView _dbview
+            bytes in_tid
+            bytes out_tid
+            bytes args
+
+        compiled, query_req, in_tid, out_tid, args, timings, _ = request
+        query_unit_group = compiled.query_unit_group
+        _dbview = self.get_dbview()
+
         if query_unit_group.in_type_id != in_tid:
             self.write(self.make_command_data_description_msg(compiled))
             raise errors.ParameterTypeMismatchError(
@@ -1006,28 +1097,212 @@ cdef class EdgeConnection(frontend.FrontendConnection):
         ):
             assert len(query_unit_group) == 1
             await self._execute_rollback(compiled)
+            timings = None
         elif len(query_unit_group) > 1 or force_script:
-            await self._execute_script(compiled, args)
+            await self._execute_script(compiled, args, timings)
         else:
             use_prep = (
                 len(query_unit_group) == 1
                 and bool(query_unit_group[0].sql_hash)
             )
-            await self._execute(compiled, args, use_prep)
+            await self._execute(compiled, args, use_prep, timings)
 
         if self._cancelled:
             raise ConnectionAbortedError
 
+        self._complete_execute(compiled, query_req, timings)
+
+    cdef _complete_execute(self, compiled, query_req, timings):
+        cdef dbview.DatabaseConnectionView _dbview = self.get_dbview()
+
+        query_unit_group = compiled.query_unit_group
+        if timings is not None:
+            query_id = None
+            if len(query_unit_group) == 1:
+                query_id = query_unit_group[0].stats_id
+            if query_id is None:
+                query_id = query_req.get_cache_key()
+            _dbview._db.record_query_stats(
+                query_id, query_req.source.text(), compiled.tag, timings
+            )
+
         if _dbview.is_state_desc_changed():
             self.write(self.make_state_data_description_msg())
         self.write(
             self.make_command_complete_msg(
-                compiled.query_unit_group.capabilities,
-                compiled.query_unit_group[-1].status,
+                query_unit_group.capabilities,
+                query_unit_group[-1].status,
             )
         )
         self.flush()
 
+    cdef bint _is_pipelinable(self, tuple request):
+        cdef dbview.DatabaseConnectionView _dbview = self.get_dbview()
+
+        compiled = request[0]
+        in_tid = request[2]
+        query_unit_group = compiled.query_unit_group
+        if (
+            _dbview.in_tx()
+            or len(query_unit_group) != 1
+            or query_unit_group.capabilities != 0
+            or query_unit_group.in_type_id != in_tid
+            or compiled.extra_type_oids
+        ):
+            return False
+
+        query_unit = query_unit_group[0]
+        return bool(
+            query_unit.sql
+            and query_unit.sql_hash
+            and query_unit.is_transactional
+            and not query_unit.needs_readback
+            and not query_unit.is_explain
+            and not query_unit.run_and_rollback
+            and not query_unit.config_ops
+        )
+
+    async def _execute_pipelined(self, tuple request):
+        # Executes a series of pipelined Execute + Sync messages of
+        # read-only queries outside of a transaction in one round trip to
+        # the backend.  The Sync after the first Execute is already taken.
+        cdef:
+            dbview.DatabaseConnectionView dbv
+            pgcon.PGConnection conn
+            bint last_synced = True
+            list requests = [request]
+            ssize_t completed = 0
+
+        self.buffer.consume_message()
+
+        next_request = None
+        pending_error = None
+        while (
+            len(requests) < MAX_PIPELINED_QUERIES
+            and self.buffer.take_message_type(b'O')
+        ):
+            try:
+                self.check_readiness()
+                next_request = await self._read_execute_request()
+            except (ConnectionError, asyncio.CancelledError):
+                raise
+            except Exception as ex:
+                # Report it after the results of the preceding queries
+                pending_error = ex
+                break
+
+            if (
+                not self._is_pipelinable(next_request)
+                or next_request[0].tag != request[0].tag
+                or next_request[6] != request[6]
+            ):
+                # Execute it after the pipelined queries as usual; the
+                # whole pipeline runs with the state of its first query.
+                break
+
+            requests.append(next_request)
+            next_request = None
+            if not self.buffer.take_message_type(b'S'):
+                last_synced = False
+                break
+            self.buffer.consume_message()
+
+        dbv = self.get_dbview()
+        # Reading the requests after the first one has decoded their
+        # state into the view, put back the state of the pipeline.
+        dbv.decode_state(*request[6])
+        timings = [r[5] for r in requests]
+        started_at = time.monotonic()
+
+        def before_query(idx):
+            compiled, _, _, out_tid, _, _, _ = requests[idx]
+            query_unit_group = compiled.query_unit_group
+            if (
+                query_unit_group.out_type_id != out_tid
+                or query_unit_group.warnings
+            ):
+                self.write(self.make_command_data_description_msg(compiled))
+
+        async def after_query(idx, error):
+            nonlocal completed, started_at, unsynced_error
+            now = time.monotonic()
+            timings[idx].execute = now - started_at
+            started_at = now
+            completed = idx + 1
+            unsynced_error = await self._complete_pipelined(
+                requests[idx],
+                error,
+                synced=last_synced or completed < len(requests),
+            )
+
+        if self.debug:
+            self.debug_print('EXECUTE PIPELINE', len(requests))
+        if len(requests) > 1:
+            metrics.pipelined_queries.inc(
+                len(requests), self.get_tenant_label(),
+            )
+
+        error = None
+        unsynced_error = None
+        try:
+            async with self.with_pgcon() as conn:
+                now = time.monotonic()
+                timings[0].pgcon_wait = now - started_at
+                started_at = now
+                await execute.execute_pipeline(
+                    conn,
+                    dbv,
+                    [r[0] for r in requests],
+                    [r[4] for r in requests],
+                    fe_conn=self,
+                    before_query=before_query,
+                    after_query=after_query,
+                )
+        except (ConnectionError, asyncio.CancelledError):
+            raise
+        except Exception as ex:
+            if self._cancelled and \
+                    isinstance(ex, pgerror.BackendQueryCancelledError):
+                raise
+            error = ex
+
+        if self._cancelled or self._con_status == EDGECON_BAD:
+            raise ConnectionAbortedError
+
+        if error is not None:
+            # The pipeline failed as a whole, e.g. on the state restore
+            for idx in range(completed, len(requests)):
+                unsynced_error = await self._complete_pipelined(
+                    requests[idx],
+                    error,
+                    synced=last_synced or idx + 1 < len(requests),
+                )
+
+        if unsynced_error is not None:
+            # Let main_step() report the error of the last query and skip
+            # to its Sync.
+            raise unsynced_error
+        elif pending_error is not None:
+            raise pending_error
+        elif next_request is not None:
+            dbv.decode_state(*next_request[6])
+            await self._execute_request(next_request)
+
+    async def _complete_pipelined(self, tuple request, error, bint synced):
+        # Returns the error of a query which is not followed by a Sync yet,
+        # it is up to the caller to report it.
+        compiled, query_req, _, _, _, timings, _ = request
+        if error is None:
+            self._complete_execute(compiled, query_req, timings)
+        elif not synced:
+            return error
+        else:
+            self.write_edgedb_error(await self.interpret_error(error))
+        if synced:
+            self.write(self.sync_status())
+            self.flush()
+        return None
+
     async def sync(self):
         self.buffer.consume_message()
         self.write(self.sync_status())
@@ -30,6 +30,7 @@ import decimal
 import hashlib
 import json
 import logging
+import time
 
 import immutables
 
@@ -240,6 +241,7 @@ async def execute(
     fe_conn: frontend.AbstractFrontendConnection = None,
     use_prep_stmt: bint = False,
     tx_isolation: edbdef.TxIsolationLevel | None = None,
+    timings: object = None,
 ):
     cdef:
         bytes state = None, orig_state = None
@@ -259,10 +261,18 @@ async def execute(
     data = None
 
     try:
-        if be_conn.last_state == state:
-            # the current status in be_conn is in sync with dbview, skip the
-            # state restoring
-            state = None
+        if state is not None:
+            if be_conn.last_state == state:
+                # the current status in be_conn is in sync with dbview, skip
+                # the state restoring
+                state = None
+                metrics.backend_state_syncs.inc(
+                    1.0, tenant.get_instance_name(), 'avoided')
+            else:
+                metrics.backend_state_syncs.inc(
+                    1.0, tenant.get_instance_name(), 'applied')
+                if timings is not None:
+                    timings.state_synced = True
         dbv.start(query_unit)
         if query_unit.create_db_template:
             await tenant.on_before_create_db_from_template(
@@ -296,8 +306,12 @@ async def execute(
                             new_types = ddl_ret['new_types']
                 else:
                     data_types = []
+                    if timings is not None:
+                        started_at = time.monotonic()
                     bound_args_buf = args_ser.recode_bind_args(
                         dbv, compiled, bind_args, None, data_types)
+                    if timings is not None:
+                        timings.recode_args = time.monotonic() - started_at
 
                     assert not (query_unit.database_config
                                 and query_unit.needs_readback), (
@@ -438,6 +452,112 @@ async def execute(
     return data
 
 
+async def execute_pipeline(
+    be_conn: pgcon.PGConnection,
+    dbv: dbview.DatabaseConnectionView,
+    list compiled_queries,
+    list bind_args,
+    *,
+    fe_conn: frontend.AbstractFrontendConnection,
+    before_query: object,
+    after_query: object,
+):
+    """Execute pipelined read-only queries outside of a transaction.
+
+    All queries are sent to the backend in one write, each followed by its
+    own SYNC, so that they run in separate implicit transactions, just like
+    if they were executed one by one.  The results are forwarded to
+    *fe_conn* in order: ``before_query(index)`` is called before the
+    results of each query, and ``await after_query(index, error)`` after
+    them, where *error* is the backend error of the query if it failed.
+
+    The session state of *dbv* is synced once for the whole pipeline, so
+    all the queries must share the same state.
+    """
+    cdef:
+        bytes state = None
+        bint needs_commit_state = False
+        int dbver = dbv.dbver
+        dbview.CompiledQuery compiled
+
+    assert not dbv.in_tx()
+
+    state = dbv.serialize_state()
+    needs_commit_state = dbv.needs_commit_after_state_sync()
+    if be_conn.last_state == state:
+        state = None
+        metrics.backend_state_syncs.inc(
+            1.0, dbv.tenant.get_instance_name(), 'avoided')
+    else:
+        metrics.backend_state_syncs.inc(
+            1.0, dbv.tenant.get_instance_name(), 'applied')
+
+    unit_group = compiler.QueryUnitGroup()
+    bind_datas = []
+    for compiled, args in zip(compiled_queries, bind_args):
+        unit_group.append(compiled.query_unit_group[0], serialize=False)
+        bind_datas.append(args_ser.recode_bind_args(dbv, compiled, args))
+
+    # All queries have the same tag
+    compiled = compiled_queries[0]
+    query_prefix = compiled.make_query_prefix()
+
+    async with be_conn.parse_execute_script_context():
+        parse_array = [False] * len(unit_group)
+        be_conn.send_query_unit_group(
+            unit_group,
+            True,  # sync
+            bind_datas,
+            state,
+            0,  # start
+            len(unit_group),  # end
+            dbver,
+            parse_array,
+            query_prefix,
+            # Restore the state in a separate implicit transaction, so that
+            # it is not rolled back along with a failing query.
+            state is not None,
+            True,  # sync_units
+        )
+        if state is not None:
+            await be_conn.wait_for_state_resp(
+                state,
+                state_sync=True,
+                needs_commit_state=needs_commit_state,
+            )
+
+        for idx, query_unit in enumerate(unit_group):
+            compiled = compiled_queries[idx]
+            before_query(idx)
+
+            error = None
+            dbv.start(query_unit)
+            try:
+                try:
+                    fe_output = query_unit.output_format != FMT_NONE
+                    await be_conn.wait_for_command(
+                        query_unit,
+                        parse_array[idx],
+                        dbver,
+                        ignore_data=not fe_output,
+                        fe_conn=fe_conn if fe_output else None,
+                    )
+                finally:
+                    await be_conn.wait_for_sync()
+            except pgerror.BackendError as ex:
+                if query_unit.source_map:
+                    ex._from_sql = True
+                dbv.on_error()
+                error = ex
+            else:
+                dbv.on_success(query_unit, None)
+                if compiled.recompiled_cache:
+                    for req, qu_group in compiled.recompiled_cache:
+                        dbv.cache_compiled_query(req, qu_group)
+
+            await after_query(idx, error)
+
+
 async def execute_script(
     conn: pgcon.PGConnection,
     dbv: dbview.DatabaseConnectionView,
@@ -473,10 +593,16 @@ async def execute_script(
     data = None
 
     try:
-        if conn.last_state == state:
-            # the current status in be_conn is in sync with dbview, skip the
-            # state restoring
-            state = None
+        if state is not None:
+            if conn.last_state == state:
+                # the current status in be_conn is in sync with dbview, skip
+                # the state restoring
+                state = None
+                metrics.backend_state_syncs.inc(
+                    1.0, dbv.tenant.get_instance_name(), 'avoided')
+            else:
+                metrics.backend_state_syncs.inc(
+                    1.0, dbv.tenant.get_instance_name(), 'applied')
         async with conn.parse_execute_script_context():
             parse_array = [False] * len(unit_group)
             for idx, query_unit in enumerate(unit_group):
@@ -754,6 +880,9 @@ def signal_side_effects(dbv, side_effects):
             interruptable=False,
         )
 
+    if side_effects & dbview.SideEffects.NetRequestsScheduled:
+        tenant.on_local_net_requests_scheduled(dbv.dbname)
+
 
 async def parse_execute_json(
     db: dbview.Database,
@@ -26,6 +26,7 @@ cdef class AbstractFrontendConnection:
 
     cdef write(self, WriteBuffer buf)
     cdef flush(self)
+    cdef write_waiter(self)
 
 
 cdef class FrontendConnection(AbstractFrontendConnection):
@@ -42,6 +43,8 @@ cdef class FrontendConnection(AbstractFrontendConnection):
         pgcon.PGConnection _pinned_pgcon
         bint _pinned_pgcon_in_tx
         int _get_pgcon_cc
+        bint _pgcon_affinity
+        pgcon.PGConnection _last_pgcon
 
         object _transport
         WriteBuffer _write_buf
@@ -75,6 +78,7 @@ cdef class FrontendConnection(AbstractFrontendConnection):
     cdef stop_connection(self)
     cdef abort_pinned_pgcon(self)
     cdef is_in_tx(self)
+    cdef pgcon_state_hint(self)
 
     cdef WriteBuffer _make_authentication_sasl_initial(self, list methods)
     cdef _expect_sasl_initial_response(self)
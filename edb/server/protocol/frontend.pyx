@@ -44,6 +44,11 @@ cdef class AbstractFrontendConnection:
     cdef flush(self):
         raise NotImplementedError
 
+    cdef write_waiter(self):
+        # A future to await before writing more, if the transport
+        # is over its high-water mark; None otherwise.
+        return None
+
 
 cdef class FrontendConnection(AbstractFrontendConnection):
     interface = "frontend"
@@ -67,6 +72,10 @@ cdef class FrontendConnection(AbstractFrontendConnection):
         self._pinned_pgcon = None
         self._pinned_pgcon_in_tx = False
         self._get_pgcon_cc = 0
+        # When set, prefer the backend connection this frontend connection
+        # used last, if it is idle in the pool.
+        self._pgcon_affinity = False
+        self._last_pgcon = None
 
         self.connection_made_at = connection_made_at
         self._query_count = 0
@@ -102,6 +111,11 @@ cdef class FrontendConnection(AbstractFrontendConnection):
     cdef is_in_tx(self):
         return False
 
+    cdef pgcon_state_hint(self):
+        # The serialized session state the next query will sync the backend
+        # connection to, if known; used to pick a connection already in it.
+        return None
+
     # backend connection
 
     def __del__(self):
@@ -129,7 +143,17 @@ cdef class FrontendConnection(AbstractFrontendConnection):
                 return self._pinned_pgcon
             if self._pinned_pgcon is not None:
                 raise RuntimeError('there is already a pinned pgcon')
-            conn = await self.tenant.acquire_pgcon(self.dbname)
+            if self._pgcon_affinity and self._last_pgcon is not None:
+                last_pgcon = self._last_pgcon
+                conn = await self.tenant.acquire_pgcon(
+                    self.dbname, prefer=lambda c: c is last_pgcon
+                )
+            else:
+                conn = await self.tenant.acquire_pgcon(
+                    self.dbname, state=self.pgcon_state_hint()
+                )
+            if self._pgcon_affinity:
+                self._last_pgcon = conn
             self._pinned_pgcon = conn
             conn.pinned_by = self
             return conn
@@ -183,6 +207,7 @@ cdef class FrontendConnection(AbstractFrontendConnection):
     def on_aborted_pgcon(self, pgcon.PGConnection conn):
         try:
             self._pinned_pgcon = None
+            self._last_pgcon = None
 
             if not self._pgcon_released_in_connection_lost:
                 self.tenant.release_pgcon(self.dbname, conn, discard=True)
@@ -199,6 +224,7 @@ cdef class FrontendConnection(AbstractFrontendConnection):
             self.tenant.release_pgcon(
                 self.dbname, self._pinned_pgcon, discard=True)
             self._pinned_pgcon = None
+            self._last_pgcon = None
 
     # I/O write methods, implements AbstractFrontendConnection
 
@@ -221,6 +247,11 @@ cdef class FrontendConnection(AbstractFrontendConnection):
             self._write_buf = None
             self._transport.write(memoryview(buf))
 
+    cdef write_waiter(self):
+        if self._write_waiter is not None and not self._write_waiter.done():
+            return self._write_waiter
+        return None
+
     def pause_writing(self):
         if self._write_waiter and not self._write_waiter.done():
             return
@@ -71,6 +71,7 @@ cdef class PgConnection(frontend.FrontendConnection):
         dict sql_prepared_stmts_map
         dict wrapping_prepared_stmts
         bint ignore_till_sync
+        bint _net_requests_scheduled
 
         object sslctx
         object endpoint_security
@@ -79,3 +80,4 @@ cdef class PgConnection(frontend.FrontendConnection):
         bint _disable_normalization
 
     cdef inline WriteBuffer ready_for_query(self)
+    cdef _signal_net_requests(self)
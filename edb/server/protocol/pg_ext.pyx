@@ -43,6 +43,7 @@ import edb.pgsql.parser.parser as pg_parser
 cimport edb.pgsql.parser.parser as pg_parser
 from edb.server import args as srvargs
 from edb.server import defines, metrics
+from edb.server.cache import source_cache
 from edb.server import tenant as edbtenant
 from edb.server.compiler import dbstate
 from edb.server.pgcon import errors as pgerror
@@ -53,8 +54,22 @@ DEFAULT_SETTINGS = dbstate.DEFAULT_SQL_SETTINGS
 DEFAULT_FE_SETTINGS = dbstate.DEFAULT_SQL_FE_SETTINGS
 
 cdef object logger = logging.getLogger('edb.server')
+cdef object SOURCE_CACHE = source_cache.SourceCache(
+    maxsize=defines._MAX_SOURCE_CACHE,
+    max_text_len=defines._MAX_SOURCE_CACHE_TEXT_LEN,
+)
 cdef object DEFAULT_STATE = json.dumps(dict(DEFAULT_SETTINGS)).encode('utf-8')
 
+# Relay COPY FROM STDIN data to the backend in chunks of this size.
+cdef int COPY_IN_BUFFER_SIZE = 100_000
+
+# SQL sessions that prepare many statements pay for re-injected Parse
+# messages whenever they land on a different backend connection.  When
+# enabled, a session prefers the backend connection it used last, if idle.
+cdef bint PGCON_AFFINITY = (
+    os.environ.get("EDGEDB_SERVER_SQL_PGCON_AFFINITY", "") == "1"
+)
+
 encodings.aliases.aliases["sql_ascii"] = "ascii"
 
 
@@ -385,6 +400,9 @@ cdef class PgConnection(frontend.FrontendConnection):
         # on *other* prepared statements.
         self.wrapping_prepared_stmts = {}
         self.ignore_till_sync = False
+        # Set when a query inserting std::net requests is executed, until
+        # its transaction is over, see _signal_net_requests().
+        self._net_requests_scheduled = False
 
         self.sslctx = sslctx
         self.endpoint_security = endpoint_security
@@ -392,6 +410,7 @@ cdef class PgConnection(frontend.FrontendConnection):
 
         self._disable_cache = debug.flags.disable_qcache
         self._disable_normalization = debug.flags.edgeql_disable_normalization
+        self._pgcon_affinity = PGCON_AFFINITY
 
     cdef _main_task_created(self):
         self.server.on_pgext_client_connected(self)
@@ -830,6 +849,16 @@ cdef class PgConnection(frontend.FrontendConnection):
             self.write(self.ready_for_query())
             self.flush()
             self.request_stop()
+        if self._net_requests_scheduled:
+            self._signal_net_requests()
+
+    cdef _signal_net_requests(self):
+        # Wake the net worker up for the requests inserted through SQL once
+        # their transaction is over.  It just finds nothing to do if the
+        # transaction was rolled back.
+        if not self._dbview.in_tx():
+            self._net_requests_scheduled = False
+            self.tenant.on_local_net_requests_scheduled(self.dbname)
 
     async def _main_step(self, char mtype):
         cdef:
@@ -890,12 +919,16 @@ cdef class PgConnection(frontend.FrontendConnection):
             else:
                 async with self.with_pgcon() as conn:
                     try:
-                        _, rq_sent = await conn.sql_extended_query(
-                            actions,
-                            self,
-                            self.database.dbver,
-                            dbv,
-                        )
+                        if isinstance(actions, dbstate.SQLQueryUnit):
+                            await conn.sql_copy_in(actions, self, dbv)
+                            rq_sent = False
+                        else:
+                            _, rq_sent = await conn.sql_extended_query(
+                                actions,
+                                self,
+                                self.database.dbver,
+                                dbv,
+                            )
                     except Exception as ex:
                         self.write_error(ex)
                         self.write(self.ready_for_query())
@@ -943,7 +976,64 @@ cdef class PgConnection(frontend.FrontendConnection):
                 )
             raise pgerror.FeatureNotSupported()
 
-    async def simple_query(self, query_str: str) -> list[PGMessage]:
+    async def read_copy_in_data(self, WriteBuffer buf):
+        """Move COPY data sent by the client into *buf*.
+
+        Waits for at least one message.  Returns True once the data has
+        been concluded with CopyDone or CopyFail.
+        """
+        cdef:
+            char mtype
+            WriteBuffer msg_buf
+
+        if not self.buffer.take_message():
+            await self.wait_for_message(report_idling=False)
+
+        while True:
+            mtype = self.buffer.get_message_type()
+            if mtype == b'd':  # CopyData
+                self.buffer.redirect_messages(buf, mtype, COPY_IN_BUFFER_SIZE)
+                if buf.len() >= COPY_IN_BUFFER_SIZE:
+                    return False
+            elif mtype == b'c' or mtype == b'f':  # CopyDone or CopyFail
+                self.buffer.redirect_messages(buf, mtype, 0)
+                return True
+            elif mtype == b'H' or mtype == b'S':
+                # Flush and Sync are ignored in the copy-in mode
+                self.buffer.discard_message()
+            else:
+                self.buffer.discard_message()
+                msg_buf = WriteBuffer.new_message(b'f')  # CopyFail
+                msg_buf.write_str(
+                    f"unexpected message type {chr(mtype)!r} "
+                    f"during COPY from stdin",
+                    "utf-8",
+                )
+                buf.write_buffer(msg_buf.end_message())
+                return True
+
+            if not self.buffer.take_message():
+                return False
+
+    def _normalize(self, query_str: str) -> pg_parser.NormalizedSource:
+        source, cached = SOURCE_CACHE.get(
+            pg_parser.NormalizedSource, query_str)
+        metrics.query_normalizations.inc(
+            1.0,
+            self.get_tenant_label(),
+            'sql',
+            'cache' if cached else 'normalizer',
+        )
+        return source
+
+    async def simple_query(
+        self, query_str: str
+    ) -> list[PGMessage] | dbstate.SQLQueryUnit:
+        """Compile *query_str* into a pipeline of extended query actions.
+
+        COPY ... FROM STDIN cannot be pipelined, so its query unit is
+        returned instead, to be executed with PGConnection.sql_copy_in().
+        """
         cdef:
             PreparedStmt stmt
 
@@ -953,7 +1043,7 @@ cdef class PgConnection(frontend.FrontendConnection):
         if self._disable_normalization:
             source = pg_parser.Source.from_string(query_str)
         else:
-            source = pg_parser.NormalizedSource.from_string(query_str)
+            source = self._normalize(query_str)
         query_units = await self.compile(source, dbv)
 
         # TODO: currently, normalization does not work with multiple queries
@@ -968,6 +1058,14 @@ cdef class PgConnection(frontend.FrontendConnection):
             len(query_units), self.tenant.get_instance_name()
         )
         self._query_count += len(query_units)
+        if any(qu.schedules_net_requests for qu in query_units):
+            self._net_requests_scheduled = True
+
+        if any(qu.copy_from for qu in query_units):
+            if len(query_units) > 1 or already_in_implicit_tx:
+                raise pgerror.FeatureNotSupported(
+                    "COPY FROM STDIN must be the only statement of a query")
+            return query_units[0]
 
         if not already_in_implicit_tx:
             actions.append(PGMessage(PGAction.START_IMPLICIT_TX))
@@ -1224,6 +1322,8 @@ cdef class PgConnection(frontend.FrontendConnection):
                         )
                     )
                     dbv.on_success(unit)
+                    if unit.schedules_net_requests:
+                        self._net_requests_scheduled = True
 
             elif mtype == b'C':  # Close
                 kind = self.buffer.read_byte()
@@ -1298,7 +1398,9 @@ cdef class PgConnection(frontend.FrontendConnection):
         """Make sure given *stmt_name* is known by Postgres
 
         Frontend SQL connections do not normally own Postgres connections,
-        so there is no affinity between them.  Thus, whenever we receive
+        so there is no affinity between them (unless the optional
+        EDGEDB_SERVER_SQL_PGCON_AFFINITY mode is on, which only makes it
+        likely, not guaranteed).  Thus, whenever we receive
         a message operating on some prepared statement, we must ensure
         that this statement has been prepared in the currently active
         Postgres connection.  We rely on pgcon LRU to actually make a
@@ -1478,7 +1580,7 @@ cdef class PgConnection(frontend.FrontendConnection):
         if self._disable_normalization:
             source = pg_parser.Source.from_string(query_str)
         else:
-            source = pg_parser.NormalizedSource.from_string(query_str)
+            source = self._normalize(query_str)
 
         query_units = await self.compile(
             source, dbv, ignore_cache=force_recompilation
@@ -1489,6 +1591,9 @@ cdef class PgConnection(frontend.FrontendConnection):
                 "cannot insert multiple commands into a prepared "
                 "statement",
             )
+        if query_units[0].copy_from:
+            raise pgerror.FeatureNotSupported(
+                "COPY FROM STDIN is supported only in simple query protocol")
 
         return await self._parse_unit(
             stmt_name,
@@ -1581,6 +1686,7 @@ cdef class PgConnection(frontend.FrontendConnection):
         # schema update, we're only storing an outdated cache entry, and
         # the next identical query could get recompiled on the new schema.
         schema_version = self.database.schema_version
+        tx_state = dbv.fe_transaction_state()
         compiler_pool = self.server.get_compiler_pool()
         started_at = time.monotonic()
         try:
@@ -1592,7 +1698,7 @@ cdef class PgConnection(frontend.FrontendConnection):
                 self.database.db_config,
                 self.database._index.get_compilation_system_config(),
                 source,
-                dbv.fe_transaction_state(),
+                tx_state,
                 self.sql_prepared_stmts_map,
                 self.dbname,
                 self.username,
@@ -1604,7 +1710,9 @@ cdef class PgConnection(frontend.FrontendConnection):
                 self.tenant.get_instance_name(),
                 "sql",
                 )
-        self.database.cache_compiled_sql(key, result, schema_version)
+        self.database.cache_compiled_sql(
+            key, result, schema_version, (source, tx_state, self.username)
+        )
         metrics.sql_compilations.inc(
             len(result), self.tenant.get_instance_name()
         )
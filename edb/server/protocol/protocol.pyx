@@ -742,6 +742,12 @@ cdef class HttpProtocol:
             ):
                 return
 
+            if (
+                system_api.requires_superuser(path_parts[1:])
+                and not await self._check_http_superuser(request, response)
+            ):
+                return
+
             # System API request
             await system_api.handle_request(
                 request,
@@ -1024,6 +1030,37 @@ cdef class HttpProtocol:
 
         return True
 
+    async def _check_http_superuser(
+        self,
+        HttpRequest request,
+        HttpResponse response,
+    ):
+        # Authenticate the user of the request like the per-branch HTTP
+        # endpoints do, and require it to be a superuser.
+        if self.tenant is None:
+            self._not_found(request, response)
+            return False
+
+        if not await self._check_http_auth(
+            request, response, self.tenant.default_database
+        ):
+            return False
+
+        scheme, auth_payload = auth_helpers.extract_token_from_auth_data(
+            request.authorization)
+        username, _ = auth_helpers.extract_http_user(
+            scheme, auth_payload, request.params)
+        username = self.tenant.resolve_user_name(username)
+        role = self.tenant.get_roles().get(username)
+        if role is None or not role['superuser']:
+            response.body = (
+                f'role {username!r} is not a superuser'.encode("utf-8"))
+            response.status = http.HTTPStatus.FORBIDDEN
+            response.close_connection = True
+            return False
+
+        return True
+
 def get_request_url(request, is_tls):
     request_url = request.url
     default_schema = b"https" if is_tls else b"http"
@@ -30,6 +30,7 @@ from typing import (
 
 import abc
 import asyncio
+import collections
 import copy
 import random
 
@@ -162,6 +163,7 @@ class Scheduler(abc.ABC, Generic[_T]):
             error_count = 1
 
         elif len(request_params) > 0:
+            self.service.update_remaining_budget()
             try:
                 execution_report = await execute_no_sleep(
                     request_params, service=self.service,
@@ -198,6 +200,14 @@ class Scheduler(abc.ABC, Generic[_T]):
             deferred_costs = execution_report.deferred_costs
             success_count = execution_report.success_count
 
+            self.service.record_spent_costs({
+                limit_name: sum(
+                    params.costs().get(limit_name, 0)
+                    for params in request_params
+                ) - deferred_costs.get(limit_name, 0)
+                for limit_name in self.service.limits
+            })
+
         # Update when this service should be processed again
         self.timer = self.service.next_delay(
             success_count, deferred_costs, error_count, context.naptime
@@ -250,6 +260,42 @@ class Service:
     # The upper bound for delays
     delay_max: Final[float] = 60.0
 
+    # The costs spent during the last minute, as (time, cost) pairs.
+    # A Service may be shared by several schedulers, e.g. using the same
+    # API account, which then share its rate limits through this budget.
+    spent_costs: dict[str, collections.deque[tuple[float, int]]] = field(
+        default_factory=dict
+    )
+
+    def record_spent_costs(self, costs: dict[str, int]) -> None:
+        now = asyncio.get_running_loop().time()
+        for limit_name, cost in costs.items():
+            spent = self.spent_costs.setdefault(
+                limit_name, collections.deque()
+            )
+            if cost > 0:
+                spent.append((now, cost))
+
+    def update_remaining_budget(self) -> None:
+        """Set the remaining limits from the costs spent in the last minute.
+
+        Limits with no costs recorded yet are left as they are.
+        """
+        now = asyncio.get_running_loop().time()
+        for limit_name, spent in self.spent_costs.items():
+            while spent and spent[0][0] <= now - 60.0:
+                spent.popleft()
+
+            service_limit = self.limits.get(limit_name)
+            if service_limit is None or not isinstance(
+                service_limit.total, int
+            ):
+                continue
+
+            service_limit.remaining = max(
+                service_limit.total - sum(cost for _, cost in spent), 0
+            )
+
     def next_delay(
         self,
         success_count: int,
@@ -17,10 +17,13 @@
 #
 
 from __future__ import annotations
-from typing import Type, TYPE_CHECKING
+from typing import Any, Type, TYPE_CHECKING
 import http
 import json
 
+import immutables
+
+from edb import edgeql
 from edb import errors
 
 from edb.common import debug
@@ -33,9 +36,28 @@ from . import execute
 
 if TYPE_CHECKING:
     from edb.server import tenant as edbtenant, server as edbserver
+    from edb.server.dbview import dbview
     from edb.server.protocol import protocol
 
 
+# Endpoints that expose or declare the queries run on the branches.
+# Besides the authentication of the HTTP_HEALTH transport, they require
+# the request to be authenticated as a superuser, just like
+# sys::QueryStats does.
+_SUPERUSER_PATHS = (
+    ['query-stats'],
+    ['query-manifest'],
+)
+
+# The body of a query manifest is parsed in memory and its queries are
+# pinned in the query cache, so both are capped.
+_MAX_QUERY_MANIFEST_SIZE = 1024 * 1024
+
+
+def requires_superuser(path_parts: list[str]) -> bool:
+    return path_parts in _SUPERUSER_PATHS
+
+
 async def handle_request(
     request: protocol.HttpRequest,
     response: protocol.HttpResponse,
@@ -74,6 +96,26 @@ async def handle_request(
                     handle_liveness_query(request, response, tenant),
                     interruptable=False,
                 )
+        elif (
+            path_parts == ['query-stats']
+            and request.method == b'GET'
+            and tenant is not None
+        ):
+            handle_query_stats(response, tenant)
+        elif (
+            path_parts == ['query-manifest']
+            and request.method == b'GET'
+            and tenant is not None
+        ):
+            handle_query_manifest(response, tenant)
+        elif (
+            path_parts == ['query-manifest']
+            and request.method == b'POST'
+            and tenant is not None
+        ):
+            await handle_query_manifest_update(
+                request, response, server, tenant
+            )
         else:
             _response(
                 response,
@@ -172,6 +214,158 @@ async def handle_compiler_query(
         _response_ok(response, b'"OK"')
 
 
+def handle_query_stats(
+    response: protocol.HttpResponse,
+    tenant: edbtenant.Tenant,
+) -> None:
+    stats = {db.name: db.query_stats.to_json() for db in tenant.iter_dbs()}
+    _response_ok(response, json.dumps(stats).encode())
+
+
+def _describe_manifest_request(
+    query_req: compiler.CompilationRequest,
+) -> dict[str, Any]:
+    return {
+        'query': query_req.source.text(),
+        'output_format': query_req.output_format.value.lower(),
+        'expect_one': query_req.expect_one,
+        'implicit_limit': query_req.implicit_limit,
+        'inline_typeids': query_req.inline_typeids,
+        'inline_typenames': query_req.inline_typenames,
+        'inline_objectids': query_req.inline_objectids,
+        'role': query_req.role_name,
+    }
+
+
+def _make_manifest_request(
+    server: edbserver.BaseServer,
+    tenant: edbtenant.Tenant,
+    db: dbview.Database,
+    query: str | dict[str, Any],
+    role: str,
+) -> compiler.CompilationRequest:
+    if isinstance(query, str):
+        query = {'query': query}
+    role = query.get('role', role)
+    if role not in tenant.get_roles():
+        raise ValueError(f'role {role!r} does not exist')
+    unknown = query.keys() - {
+        'query', 'output_format', 'expect_one', 'implicit_limit',
+        'inline_typeids', 'inline_typenames', 'inline_objectids', 'role',
+    }
+    if unknown:
+        raise ValueError(f'unknown options: {", ".join(sorted(unknown))}')
+
+    # Mirror what a client in the default session state would send over
+    # the binary protocol, so that the precompiled entries are hit.
+    return compiler.CompilationRequest(
+        source=edgeql.NormalizedSource.from_string(query['query']),
+        protocol_version=edbdef.CURRENT_PROTOCOL,
+        schema_version=db.schema_version,
+        compilation_config_serializer=server.compilation_config_serializer,
+        output_format=compiler.OutputFormat(
+            query.get('output_format', 'binary').upper()
+        ),
+        expect_one=bool(query.get('expect_one', False)),
+        implicit_limit=int(query.get('implicit_limit', 0)),
+        inline_typeids=bool(query.get('inline_typeids', False)),
+        inline_typenames=bool(query.get('inline_typenames', False)),
+        inline_objectids=bool(query.get('inline_objectids', True)),
+        modaliases=immutables.Map({None: edbdef.DEFAULT_MODULE_ALIAS}),
+        session_config=immutables.Map(),
+        role_name=role,
+        branch_name=db.name,
+    )
+
+
+def handle_query_manifest(
+    response: protocol.HttpResponse,
+    tenant: edbtenant.Tenant,
+) -> None:
+    manifest = {}
+    for db in tenant.iter_dbs():
+        if requests := db.get_query_manifest():
+            manifest[db.name] = [
+                _describe_manifest_request(query_req)
+                for query_req in requests
+            ]
+    _response_ok(response, json.dumps(manifest).encode())
+
+
+async def handle_query_manifest_update(
+    request: protocol.HttpRequest,
+    response: protocol.HttpResponse,
+    server: edbserver.BaseServer,
+    tenant: edbtenant.Tenant,
+) -> None:
+    try:
+        if len(request.body) > _MAX_QUERY_MANIFEST_SIZE:
+            raise ValueError(
+                f'larger than {_MAX_QUERY_MANIFEST_SIZE} bytes'
+            )
+        manifest = json.loads(request.body)
+        dbname = tenant.resolve_branch_name(
+            database=None, branch=manifest['branch']
+        )
+        role = manifest['role']
+        if not isinstance(role, str):
+            raise TypeError('"role" must be a string')
+        queries = manifest['queries']
+        if not isinstance(queries, list):
+            raise TypeError('"queries" must be a list')
+        if len(queries) > edbdef._MAX_QUERY_MANIFEST_QUERIES:
+            raise ValueError(
+                f'more than {edbdef._MAX_QUERY_MANIFEST_QUERIES} queries'
+            )
+    except (ValueError, TypeError, KeyError) as ex:
+        _response_error(
+            response,
+            http.HTTPStatus.BAD_REQUEST,
+            f'invalid query manifest: {ex}',
+            errors.InputDataError,
+        )
+        return
+
+    db = tenant.maybe_get_db(dbname=dbname)
+    if db is None:
+        _response_error(
+            response,
+            http.HTTPStatus.NOT_FOUND,
+            f'branch {dbname!r} does not exist',
+            errors.UnknownDatabaseError,
+        )
+        return
+
+    try:
+        requests = [
+            _make_manifest_request(server, tenant, db, query, role)
+            for query in queries
+        ]
+    except (
+        ValueError, TypeError, KeyError, errors.EdgeQLSyntaxError
+    ) as ex:
+        _response_error(
+            response,
+            http.HTTPStatus.BAD_REQUEST,
+            f'invalid query manifest: {ex}',
+            errors.InputDataError,
+        )
+        return
+
+    db.set_query_manifest(requests)
+    failures = await db.compile_query_manifest()
+    _response_ok(
+        response,
+        json.dumps({
+            'queries': len(requests),
+            'errors': [
+                {'query': text, 'message': str(ex)}
+                for text, ex in failures
+            ],
+        }).encode(),
+    )
+
+
 async def handle_liveness_query(
     request: protocol.HttpRequest,
     response: protocol.HttpResponse,
@@ -0,0 +1,196 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2024-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""In-server aggregated statistics of the server-side query phases.
+
+sys::QueryStats only sees the time spent in the backend.  This module
+keeps, per branch, the time each query spent in the server before and
+around the backend execution, keyed by the same query ID whenever the
+compiler provided one.
+"""
+
+from __future__ import annotations
+from typing import Any, Optional
+
+import collections
+import datetime
+import math
+import uuid
+
+
+PHASES = (
+    # Compiling the query, including the wait for a compiler worker;
+    # only recorded on query cache misses.
+    'compile',
+    # Waiting for a backend connection from the pool.
+    'pgcon_wait',
+    # Recoding the client arguments into the backend format.
+    'recode_args',
+    # Running the query on the backend connection, including the state
+    # sync and forwarding the results to the client.
+    'execute',
+)
+
+
+class PhaseStats:
+
+    __slots__ = ('count', 'total', 'min', 'max', '_sum_sq')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+        self._sum_sq = 0.0
+
+    def add(self, value: float) -> None:
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+        self._sum_sq += value * value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def stddev(self) -> float:
+        # Population standard deviation, like in sys::QueryStats.
+        if not self.count:
+            return 0.0
+        mean = self.mean
+        return math.sqrt(max(self._sum_sq / self.count - mean * mean, 0.0))
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.mean,
+            'stddev': self.stddev,
+        }
+
+
+class QueryStatsEntry:
+
+    __slots__ = (
+        'query', 'tag', 'calls', 'cache_hits', 'cache_misses',
+        'state_syncs', 'phases', 'stats_since',
+    )
+
+    def __init__(self, query: str, tag: Optional[str]) -> None:
+        self.query = query
+        self.tag = tag
+        self.calls = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.state_syncs = 0
+        self.phases = {phase: PhaseStats() for phase in PHASES}
+        self.stats_since = datetime.datetime.now(datetime.timezone.utc)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            'query': self.query,
+            'tag': self.tag,
+            'calls': self.calls,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'state_syncs': self.state_syncs,
+            'stats_since': self.stats_since.isoformat(),
+            **{
+                phase: stats.to_json()
+                for phase, stats in self.phases.items()
+            },
+        }
+
+
+class QueryTimings:
+    """Durations of the server-side phases of one query execution.
+
+    Phases that were not run are left as None.
+    """
+
+    __slots__ = PHASES + ('state_synced',)
+
+    def __init__(self) -> None:
+        self.compile: Optional[float] = None
+        self.pgcon_wait: Optional[float] = None
+        self.recode_args: Optional[float] = None
+        self.execute: Optional[float] = None
+        self.state_synced = False
+
+
+class QueryStatsTable:
+    """Bounded table of per-query phase statistics of a branch.
+
+    The least recently executed queries are dropped first when the table
+    is full.
+    """
+
+    def __init__(self, *, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._entries: collections.OrderedDict[
+            uuid.UUID, QueryStatsEntry
+        ] = collections.OrderedDict()
+
+    def record(
+        self,
+        query_id: uuid.UUID,
+        query: str,
+        tag: Optional[str],
+        timings: QueryTimings,
+    ) -> None:
+        entry = self._entries.get(query_id)
+        if entry is None:
+            entry = QueryStatsEntry(query, tag)
+            self._entries[query_id] = entry
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(query_id)
+
+        entry.calls += 1
+        if timings.compile is None:
+            entry.cache_hits += 1
+        else:
+            entry.cache_misses += 1
+        if timings.state_synced:
+            entry.state_syncs += 1
+        for phase in PHASES:
+            value = getattr(timings, phase)
+            if value is not None:
+                entry.phases[phase].add(value)
+
+    def reset(self, query_id: Optional[uuid.UUID] = None) -> None:
+        if query_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(query_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def to_json(self) -> list[dict[str, Any]]:
+        return [
+            {'id': str(query_id), **entry.to_json()}
+            for query_id, entry in self._entries.items()
+        ]
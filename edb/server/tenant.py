@@ -69,6 +69,7 @@ from . import pgcon
 from . import compiler as edbcompiler
 from . import pgconnparams
 
+from .connpool import config as connpool_config
 from .ha import adaptive as adaptive_ha
 from .ha import base as ha_base
 from .http import HttpClient
@@ -119,6 +120,7 @@ class Tenant(ha_base.ClusterProtocol):
     _max_backend_connections: int
     _suggested_client_pool_size: int
     _pg_pool: connpool.Pool
+    _pg_demand: connpool.DemandHistory
     _pg_unavailable_msg: str | None
     _init_con_data: list[config.ConState]
     _init_con_sql: bytes | None
@@ -145,6 +147,11 @@ class Tenant(ha_base.ClusterProtocol):
 
     _http_client: HttpClient | None
 
+    # Branches with newly scheduled std::net requests, waiting to be
+    # polled by the net worker.
+    _net_requests_scheduled: set[str]
+    _net_requests_wakeup: asyncio.Event
+
     _sidechannel_email_configs: list[Any]
 
     def __init__(
@@ -204,8 +211,11 @@ class Tenant(ha_base.ClusterProtocol):
             # 1 connection is reserved for the system DB
             max_capacity=max_backend_connections - 1,
         )
+        self._pg_demand = connpool.DemandHistory()
         self._pg_unavailable_msg = None
         self._block_new_connections = set()
+        self._net_requests_scheduled = set()
+        self._net_requests_wakeup = asyncio.Event()
         self._report_config_data = {}
         self._init_con_data = []
         self._init_con_sql = None
@@ -330,6 +340,65 @@ class Tenant(ha_base.ClusterProtocol):
                 call_on_switch_over=False
             )
 
+    def _prefill_pg_pool(self) -> None:
+        if self._dbindex is None:
+            return
+        quotas = {
+            dbname: nconns
+            for dbname, nconns in self._pg_demand.get_quotas(
+                self._pg_pool.max_capacity
+            ).items()
+            if (
+                dbname not in defines.EDGEDB_SPECIAL_DBS
+                and self._dbindex.has_db(dbname)
+            )
+        }
+        if quotas:
+            logger.info("prefilling backend connections: %r", quotas)
+            self._pg_pool.prefill(quotas)
+
+    async def _track_pg_demand(self) -> None:
+        # Periodically sample how many backend connections each branch
+        # needs, and persist the history in the backend, so that we can
+        # prefill the pool on restart or after an HA switchover.
+        try:
+            async with self.use_sys_pgcon() as syscon:
+                data = await instdata.get_instdata(
+                    syscon, 'pg_pool_demand', 'json')
+            if data:
+                self._pg_demand.load(json.loads(data))
+        except Exception:
+            logger.warning(
+                "could not load the backend connection demand history",
+                exc_info=True,
+            )
+        self._prefill_pg_pool()
+
+        last_saved = time.monotonic()
+        while self._running:
+            await asyncio.sleep(connpool_config.DEMAND_SAMPLE_INTERVAL)
+            now = time.monotonic()
+            self._pg_demand.record(
+                self._pg_pool._build_snapshot(now=now).blocks)
+            if (
+                self.is_readonly()
+                or now - last_saved < connpool_config.DEMAND_PERSIST_INTERVAL
+            ):
+                continue
+            last_saved = now
+            try:
+                async with self.use_sys_pgcon() as syscon:
+                    await instdata.set_instdata_json(
+                        syscon, 'pg_pool_demand', self._pg_demand.dump())
+            except Exception:
+                metrics.background_errors.inc(
+                    1.0, self._instance_name, "track_pg_demand"
+                )
+                logger.warning(
+                    "could not save the backend connection demand history",
+                    exc_info=True,
+                )
+
     def get_active_pgcon_num(self) -> int:
         return self._pg_pool.active_conns
 
@@ -655,6 +724,7 @@ class Tenant(ha_base.ClusterProtocol):
         assert self._dbindex is not None
         for db in self._dbindex.iter_dbs():
             db.start_stop_extensions()
+        self.create_task(self._track_pg_demand(), interruptable=True)
 
     def stop_accepting_connections(self) -> None:
         self._accepting_connections = False
@@ -990,6 +1060,8 @@ class Tenant(ha_base.ClusterProtocol):
             # connection is lost during this await.
             await self.__sys_pgcon.listen_for_sysevent()
             self.set_pg_unavailable_msg(None)
+            # After an HA switchover, the pool is empty - warm it up.
+            self._prefill_pg_pool()
         finally:
             self._sys_pgcon_ready_evt.set()
 
@@ -1027,14 +1099,26 @@ class Tenant(ha_base.ClusterProtocol):
         finally:
             self.release_pgcon(dbname, conn, discard=discard)
 
-    async def acquire_pgcon(self, dbname: str) -> pgcon.PGConnection:
+    async def acquire_pgcon(
+        self,
+        dbname: str,
+        *,
+        prefer: Optional[Callable[[pgcon.PGConnection], bool]] = None,
+        state: Optional[bytes] = None,
+    ) -> pgcon.PGConnection:
         if self._pg_unavailable_msg is not None:
             raise errors.BackendUnavailableError(
                 "Postgres is not available: " + self._pg_unavailable_msg
             )
 
+        if state is not None and prefer is None:
+            # Prefer an idle connection that was last synced to the same
+            # session state, so that we don't have to restore it again.
+            def prefer(conn: pgcon.PGConnection) -> bool:
+                return conn.last_state == state
+
         for _ in range(self._pg_pool.max_capacity):
-            conn = await self._pg_pool.acquire(dbname)
+            conn = await self._pg_pool.acquire(dbname, prefer=prefer)
             if not conn.is_healthy():
                 logger.warning("acquired an unhealthy pgcon; discard now")
             elif conn.last_init_con_data is not self._init_con_data:
@@ -1825,6 +1909,7 @@ class Tenant(ha_base.ClusterProtocol):
             if self._dbindex.has_db(dbname):
                 self._dbindex.unregister_db(dbname)
             self._block_new_connections.discard(dbname)
+            self._pg_demand.forget(dbname)
         except Exception:
             metrics.background_errors.inc(
                 1.0, self._instance_name, "on_after_drop_db"
@@ -2089,6 +2174,49 @@ class Tenant(ha_base.ClusterProtocol):
 
         self.create_task(task(), interruptable=True)
 
+    def on_local_net_requests_scheduled(self, dbname: str) -> None:
+        if not self._accept_new_tasks:
+            return
+
+        if dbname not in self._net_requests_scheduled:
+            # Other servers are only notified once per net worker wakeup.
+            self.create_task(
+                self.signal_sysevent('net-requests-scheduled', dbname=dbname),
+                interruptable=False,
+            )
+        self._wake_net_worker(dbname)
+
+    def on_remote_net_requests_scheduled(self, dbname: str) -> None:
+        # Triggered by a postgres notification event 'net-requests-scheduled'
+        # on the __edgedb_sysevent__ channel
+        if not self._accept_new_tasks:
+            return
+
+        self._wake_net_worker(dbname)
+
+    def _wake_net_worker(self, dbname: str) -> None:
+        self._net_requests_scheduled.add(dbname)
+        self._net_requests_wakeup.set()
+
+    def take_net_requests_scheduled(self) -> set[str]:
+        """Return the branches that got new std::net requests.
+
+        Called by the net worker, which is woken up again by the next
+        scheduled request.
+        """
+        rv = self._net_requests_scheduled
+        self._net_requests_scheduled = set()
+        self._net_requests_wakeup.clear()
+        return rv
+
+    async def wait_for_net_requests(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(
+                self._net_requests_wakeup.wait(), max(timeout, 0)
+            )
+        except TimeoutError:
+            pass
+
     def get_debug_info(self) -> dict[str, Any]:
         from . import smtp
 
@@ -2112,6 +2240,13 @@ class Tenant(ha_base.ClusterProtocol):
                 dsn=pgaddr.to_dsn(),
             ),
             pg_pool=self._pg_pool._build_snapshot(now=time.monotonic()),
+            pg_stmt_caches=[
+                dict(
+                    backend_pid=conn.backend_pid,
+                    **conn.get_stmt_cache_stats(),
+                )
+                for conn in self._pg_pool.iterate_connections()
+            ],
         )
 
         dbs = {}
@@ -0,0 +1,105 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2024-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from __future__ import annotations
+
+import statistics
+import time
+
+import click
+
+from edb.edgeql import compiler as qlcompiler
+from edb.edgeql import parser as qlparser
+from edb.edgeql.compiler import context as qlcontext
+from edb.schema import ddl as s_ddl
+from edb.schema import schema as s_schema
+from edb.testbase import lang as tb_lang
+
+from edb.tools.edb import edbcommands
+
+
+def _make_schema(ntypes: int, nprops: int) -> s_schema.Schema:
+    decls = ['abstract type Base { property name: str; }']
+    for i in range(ntypes):
+        props = ''.join(
+            f'property p{j}: str; ' for j in range(nprops)
+        )
+        decls.append(
+            f'type T{i} extending Base {{ {props}'
+            f'link next: T{(i + 1) % ntypes}; multi link others: Base; }}'
+        )
+
+    std_schema = tb_lang._load_std_schema()
+    schema, _ = s_ddl.apply_sdl(
+        qlparser.parse_sdl(f'module default {{ {" ".join(decls)} }}'),
+        base_schema=std_schema,
+        current_schema=s_schema.ChainedSchema(
+            std_schema, s_schema.EMPTY_SCHEMA, s_schema.EMPTY_SCHEMA),
+    )
+    return schema
+
+
+@edbcommands.command("bench-compiler")
+@click.option('--types', 'ntypes', type=int, default=500,
+              help='number of object types in the schema')
+@click.option('--props', 'nprops', type=int, default=20,
+              help='number of properties per object type')
+@click.option('--queries', 'nqueries', type=int, default=20,
+              help='number of distinct queries to compile')
+@click.option('--rounds', type=int, default=10,
+              help='number of times each query is compiled')
+def main(ntypes: int, nprops: int, nqueries: int, rounds: int) -> None:
+    """Benchmark EdgeQL to IR compilation on a large schema.
+
+    Compares compiling with the schema-level caches (TypeRefs, access
+    policy analysis) scoped to one compilation with the ones shared
+    between compilations against the same schema.
+    """
+    click.echo(f'building a schema of {ntypes} types...')
+    schema = _make_schema(ntypes, nprops)
+
+    step = max(ntypes // nqueries, 1)
+    queries = [
+        qlparser.parse_query(
+            f'select T{i} {{ name, p0, p{nprops - 1}, '
+            f'next: {{ name, p1 }}, others: {{ name }} }} '
+            f'filter .p0 = "x"'
+        )
+        for i in range(0, ntypes, step)[:nqueries]
+    ]
+    options = qlcompiler.CompilerOptions(modaliases={None: 'default'})
+
+    for shared in (False, True):
+        qlcontext._shared_schema_caches.clear()
+        timings = []
+        for _ in range(rounds):
+            for query in queries:
+                if not shared:
+                    qlcontext._shared_schema_caches.clear()
+                started_at = time.perf_counter()
+                qlcompiler.compile_ast_to_ir(query, schema, options=options)
+                timings.append(time.perf_counter() - started_at)
+
+        mode = 'shared' if shared else 'per-compilation'
+        click.echo(
+            f'{mode:>16} schema cache: '
+            f'mean {statistics.mean(timings) * 1000:.2f}ms, '
+            f'median {statistics.median(timings) * 1000:.2f}ms, '
+            f'total {sum(timings):.2f}s over {len(timings)} compilations'
+        )
@@ -0,0 +1,123 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2024-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from __future__ import annotations
+from typing import Callable, Optional, TypeVar
+
+import time
+
+import click
+
+from edb.edgeql import ast as qlast
+from edb.edgeql import parser as qlparser
+from edb.schema import ddl as s_ddl
+from edb.schema import delta as s_delta
+from edb.schema import schema as s_schema
+from edb.testbase import lang as tb_lang
+
+from edb.tools.edb import edbcommands
+
+
+T = TypeVar('T')
+
+
+def _make_sdl(
+    ntypes: int, nprops: int, nmodules: int, changed: int = 0
+) -> str:
+    modules: list[list[str]] = [[] for _ in range(nmodules)]
+    for i in range(ntypes):
+        props = ''.join(f'property p{j}: str; ' for j in range(nprops))
+        if i < changed:
+            props += 'property extra: int64; '
+        target = (i + 1) % ntypes
+        modules[i % nmodules].append(
+            f'type T{i} {{ {props}'
+            f'link next: m{target % nmodules}::T{target}; }}'
+        )
+    return ' '.join(
+        f'module m{n} {{ {" ".join(decls)} }}'
+        for n, decls in enumerate(modules)
+    )
+
+
+def _timed(phase: str, fn: Callable[[], T]) -> T:
+    started_at = time.perf_counter()
+    result = fn()
+    click.echo(f'{phase:>28}: {time.perf_counter() - started_at:.2f}s')
+    return result
+
+
+@edbcommands.command("bench-migration")
+@click.option('--types', 'ntypes', type=int, default=1000,
+              help='number of object types in the target schema')
+@click.option('--props', 'nprops', type=int, default=10,
+              help='number of properties per object type')
+@click.option('--modules', 'nmodules', type=int, default=10,
+              help='number of modules the types are spread over')
+@click.option('--changed', 'nchanged', type=int, default=10,
+              help='number of types altered by the follow-up migration')
+def main(ntypes: int, nprops: int, nmodules: int, nchanged: int) -> None:
+    """Benchmark the phases of a migration of an empty schema.
+
+    Mirrors what START MIGRATION, DESCRIBE CURRENT MIGRATION AS JSON,
+    POPULATE MIGRATION and COMMIT MIGRATION do to a synthetic schema,
+    then times the diff of a follow-up migration that adds a property
+    to some of the types.
+    """
+    std_schema = tb_lang._load_std_schema()
+    schema = s_schema.ChainedSchema(
+        std_schema, s_schema.EMPTY_SCHEMA, s_schema.EMPTY_SCHEMA)
+    modaliases: dict[Optional[str], str] = {None: 'default'}
+
+    sdl = qlparser.parse_sdl(_make_sdl(ntypes, nprops, nmodules))
+    target, _ = _timed('target schema (apply_sdl)', lambda: s_ddl.apply_sdl(
+        sdl, base_schema=std_schema, current_schema=schema))
+
+    diff = _timed('diff (delta_schemas)', lambda: s_ddl.delta_schemas(
+        schema, target, generate_prompts=True))
+
+    stmts = _timed('DDL (statements_from_delta)', lambda: (
+        s_ddl.statements_from_delta(schema, target, diff, uppercase=True)))
+    click.echo(f'{"":>28}  {len(stmts)} proposed steps')
+
+    def prompt(ddl_ast: qlast.DDLOperation) -> None:
+        cmd = s_ddl.cmd_from_ddl(ddl_ast, schema=schema, modaliases=modaliases)
+        assert isinstance(cmd, s_delta.ObjectCommand)
+        cmd.get_user_prompt()
+
+    def prompt_all() -> None:
+        for _, ddl_ast, _ in stmts:
+            prompt(ddl_ast)
+
+    if stmts:
+        _timed('prompt of the first step', lambda: prompt(stmts[0][1]))
+        _timed('prompts of all steps', prompt_all)
+
+    ddl_text = '\n'.join(text for text, _, _ in stmts)
+    applied, _ = _timed(
+        'apply (apply_ddl_script_ex)', lambda: s_ddl.apply_ddl_script_ex(
+            ddl_text, schema=schema, modaliases=modaliases))
+
+    sdl = qlparser.parse_sdl(_make_sdl(ntypes, nprops, nmodules, nchanged))
+    target, _ = _timed('altered schema (apply_sdl)', lambda: s_ddl.apply_sdl(
+        sdl, base_schema=std_schema, current_schema=applied))
+
+    diff = _timed('follow-up diff', lambda: s_ddl.delta_schemas(
+        applied, target, generate_prompts=True))
+    click.echo(f'{"":>28}  {len(diff.get_subcommands())} top-level commands')
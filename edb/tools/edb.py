@@ -86,6 +86,8 @@ from . import gen_sql_introspection  # noqa
 from . import gen_rust_ast  # noqa
 from . import ast_inheritance_graph  # noqa
 from . import parser_demo  # noqa
+from . import bench_compiler  # noqa
+from . import bench_migration  # noqa
 from . import ls_forbidden_functions  # noqa
 from . import redo_metaschema  # noqa
 from . import ls  # noqa
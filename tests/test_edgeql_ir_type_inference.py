@@ -19,11 +19,16 @@
 
 import os.path
 import textwrap
+from unittest import mock
 
 from edb.testbase import lang as tb
 
 from edb.edgeql import compiler
 from edb.edgeql import parser as qlparser
+from edb.edgeql.compiler import context as qlcontext
+from edb.edgeql.compiler import policies as policies_mod
+from edb.schema import objtypes as s_objtypes
+from edb.schema import schema as s_schema
 
 
 class TestEdgeQLTypeInference(tb.BaseEdgeQLCompilerTest):
@@ -120,3 +125,90 @@ class TestEdgeQLTypeInference(tb.BaseEdgeQLCompilerTest):
 % OK %
         __derived__::(default:Card | default:User)
         """
+
+    def test_edgeql_ir_type_inference_shared_typeref_cache(self):
+        schema = s_schema.ChainedSchema(
+            s_schema.EMPTY_SCHEMA, self.schema, s_schema.EMPTY_SCHEMA)
+        options = compiler.CompilerOptions(modaliases={None: 'default'})
+
+        def compile(schema):
+            return compiler.compile_ast_to_ir(
+                qlparser.parse_query('SELECT Card'), schema, options=options)
+
+        # Compilations against the same schema reuse the TypeRefs
+        # of the schema objects...
+        self.assertIs(compile(schema).expr.typeref,
+                      compile(schema).expr.typeref)
+
+        # ... but not the ones of a schema that isn't chained.
+        ir_1 = compile(self.schema)
+        ir_2 = compile(self.schema)
+        self.assertIsNot(ir_1.expr.typeref, ir_2.expr.typeref)
+        self.assertEqual(ir_1.expr.typeref.id, ir_2.expr.typeref.id)
+
+
+class TestEdgeQLSharedPolicyCache(tb.BaseEdgeQLCompilerTest):
+    """Unit tests for the access policy analysis shared by compilations."""
+
+    SCHEMA = '''
+        type Base {
+            property name -> str;
+            access policy base_ok allow all using (.name != 'x');
+        };
+        type Child extending Base {
+            access policy child_ok allow select using (exists .name);
+        };
+        type Other extending Base;
+    '''
+
+    def test_edgeql_ir_type_inference_shared_policy_cache(self):
+        schema = s_schema.ChainedSchema(
+            s_schema.EMPTY_SCHEMA, self.schema, s_schema.EMPTY_SCHEMA)
+        cache = qlcontext.get_shared_schema_cache(schema)
+        assert cache is not None
+        base = self.schema.get('default::Base', type=s_objtypes.ObjectType)
+        child = self.schema.get('default::Child', type=s_objtypes.ObjectType)
+
+        def compile(apply_access_policies):
+            options = compiler.CompilerOptions(
+                modaliases={None: 'default'},
+                apply_user_access_policies=apply_access_policies,
+            )
+            return compiler.compile_ast_to_ir(
+                qlparser.parse_query('SELECT Base'), schema, options=options)
+
+        compile(True)
+        policies = cache.access_policies[(base.id, True, True)]
+        self.assertEqual(
+            {str(pol.get_shortname(self.schema).name) for pol in policies},
+            {'base_ok'},
+        )
+        self.assertTrue(cache.own_policies[(child.id, base.id, True, True)])
+        self.assertIn(base.id, cache.policy_subjects)
+        self.assertIsNone(cache.overlapping_descendants[base.id])
+
+        # Compiling again against the same schema reuses the shared
+        # entries instead of analyzing the policies again.
+        with (
+            mock.patch.object(
+                policies_mod, '_get_access_policies',
+                wraps=policies_mod._get_access_policies,
+            ) as get_access_policies,
+            mock.patch.object(
+                policies_mod, '_has_own_policies',
+                wraps=policies_mod._has_own_policies,
+            ) as has_own_policies,
+        ):
+            compile(True)
+        get_access_policies.assert_not_called()
+        has_own_policies.assert_not_called()
+        self.assertIs(
+            cache.access_policies[(base.id, True, True)], policies)
+
+        # The policy options are a part of the keys, so disabling the
+        # user access policies doesn't get the results cached above.
+        compile(False)
+        self.assertEqual(cache.access_policies[(base.id, True, False)], ())
+        self.assertFalse(cache.own_policies[(child.id, base.id, True, False)])
+        self.assertIs(
+            cache.access_policies[(base.id, True, True)], policies)
@@ -16,6 +16,7 @@
 # limitations under the License.
 #
 
+import array
 import json
 import pathlib
 import unittest
@@ -479,6 +480,65 @@ class TestExtAI(tb.BaseHttpExtensionTest):
                 delete Astronomy;
             ''')
 
+    async def test_ext_ai_indexing_06(self):
+        # Objects with the same content share one embeddings request input
+        content = 'Skies on Saturn are pale gold'
+        try:
+            await self.con.execute(
+                f"""
+                for i in range_unpack(range(0, 3)) union (
+                    insert Astronomy {{
+                        content := '{content}'
+                    }}
+                );
+                """,
+            )
+
+            async for tr in self.try_until_succeeds(
+                ignore=(AssertionError,),
+                timeout=30.0,
+            ):
+                async with tr:
+                    await self.assert_query_result(
+                        r'''
+                        with
+                            result := ext::ai::search(
+                                Astronomy, <array<float32>>$qv)
+                        select
+                            result.object {
+                                content,
+                                distance := result.distance,
+                            }
+                        filter
+                            exists result.distance
+                        ''',
+                        [
+                            {
+                                'content': content,
+                                'distance': 0.3789409965918812,
+                            },
+                        ] * 3,
+                        variables={
+                            "qv": [1 for i in range(10)],
+                        }
+                    )
+
+            base_url = self.mock_server.get_base_url().rstrip("/")
+            requests = self.mock_server.requests[
+                ("POST", base_url, "/v1/embeddings")
+            ]
+            inputs = [
+                input
+                for request in requests
+                for input in json.loads(request.body)['input']
+            ]
+            self.assertEqual(inputs.count(content), 1)
+
+        finally:
+            await self.con.execute('''
+                delete Astronomy;
+            ''')
+
     async def test_ext_ai_index_custom_dimensions(self):
         await self.assert_query_result(
             """
@@ -583,3 +643,66 @@ class TestExtAIUtils(unittest.TestCase):
                 ([3, 2], 7),
             ],
         )
+
+    def test_embeddings_cache_01(self):
+        provider = ai_ext.ProviderConfig(
+            name='custom::test',
+            display_name='Test',
+            api_url='http://localhost/v1',
+            client_id='',
+            secret='',
+            api_style=ai_ext.ApiStyle.OpenAI,
+        )
+        key = ai_ext.EmbeddingsCache.make_key(provider, 'model', None, 'abc')
+        self.assertEqual(
+            key,
+            ai_ext.EmbeddingsCache.make_key(provider, 'model', None, 'abc'),
+        )
+        self.assertNotEqual(
+            key,
+            ai_ext.EmbeddingsCache.make_key(provider, 'model', None, 'abd'),
+        )
+        self.assertNotEqual(
+            key,
+            ai_ext.EmbeddingsCache.make_key(provider, 'model2', None, 'abc'),
+        )
+        self.assertNotEqual(
+            key,
+            ai_ext.EmbeddingsCache.make_key(provider, 'model', 3, 'abc'),
+        )
+
+        # Room for two entries of a 1-byte key and 2 float4 dimensions
+        cache = ai_ext.EmbeddingsCache(maxbytes=2 * (1 + 2 * 4))
+        self.assertIsNone(cache.get(key))
+        cache.put(b'1', array.array('f', [1.0, 1.0]))
+        cache.put(b'2', array.array('f', [2.0, 2.0]))
+        self.assertEqual(cache.nbytes, 18)
+        # Least recently used entries are evicted first
+        self.assertEqual(cache.get(b'1'), array.array('f', [1.0, 1.0]))
+        cache.put(b'3', array.array('f', [3.0, 3.0]))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.nbytes, 18)
+        self.assertIsNone(cache.get(b'2'))
+        self.assertEqual(cache.get(b'1'), array.array('f', [1.0, 1.0]))
+        self.assertEqual(cache.get(b'3'), array.array('f', [3.0, 3.0]))
+
+        # Larger vectors take the room of several smaller ones
+        cache.put(b'4', array.array('f', [4.0, 4.0, 4.0]))
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.nbytes, 13)
+        # and entries larger than the whole cache are not kept at all
+        cache.put(b'5', array.array('f', [5.0] * 5))
+        self.assertIsNone(cache.get(b'5'))
+        self.assertEqual(len(cache), 1)
+
+    def test_embeddings_encode_vector_01(self):
+        embedding = array.array('f', [1.0, 2.0])
+        encoded = ai_ext._encode_vector(embedding)
+        self.assertEqual(
+            encoded,
+            b'\x00\x02\x00\x00'  # dimensions and the unused int16
+            b'\x3f\x80\x00\x00\x40\x00\x00\x00',
+        )
+        # The same (cached) embedding can be encoded again, unchanged
+        self.assertEqual(ai_ext._encode_vector(embedding), encoded)
+        self.assertEqual(embedding, array.array('f', [1.0, 2.0]))
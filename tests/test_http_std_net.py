@@ -19,8 +19,11 @@
 
 import typing
 import json
+import ssl
+import unittest
 
 from edb.testbase import http as tb
+from edb.testbase import server as tb_server
 
 
 class StdNetTestCase(tb.BaseHttpTest):
@@ -254,3 +257,162 @@ class StdNetTestCase(tb.BaseHttpTest):
         self.assertIsNotNone(table_result.failure)
         self.assertEqual(str(table_result.failure.kind), 'NetworkError')
         self.assertIsNone(table_result.response)
+
+    async def test_http_std_net_con_schedule_request_wakeup_01(self):
+        assert self.mock_server is not None
+
+        example_request = (
+            'GET',
+            self.base_url,
+            '/test-wakeup-01',
+        )
+        url = f"{example_request[1]}{example_request[2]}"
+        self.mock_server.register_route_handler(*example_request)(
+            ("ok", 200)
+        )
+
+        # Scheduled requests wake the net worker up, so they should be
+        # sent well before the next periodic poll of the branch.
+        async with self.con.transaction():
+            await self.con.query(
+                """
+                select std::net::http::schedule_request(<str>$url)
+                """,
+                url=url,
+            )
+
+        requests_for_example = None
+        async for tr in self.try_until_succeeds(
+            delay=0.2, timeout=5, ignore=(KeyError,)
+        ):
+            async with tr:
+                requests_for_example = self.mock_server.requests[
+                    example_request
+                ]
+
+        assert requests_for_example is not None
+        self.assertEqual(len(requests_for_example), 1)
+
+    async def test_http_std_net_con_schedule_request_wakeup_02(self):
+        try:
+            import asyncpg
+        except ImportError:
+            raise unittest.SkipTest('asyncpg not installed')
+
+        assert self.mock_server is not None
+
+        example_request = (
+            'GET',
+            self.base_url,
+            '/test-wakeup-02',
+        )
+        url = f"{example_request[1]}{example_request[2]}"
+        self.mock_server.register_route_handler(*example_request)(
+            ("ok", 200)
+        )
+
+        await self.con.execute(
+            '''
+            create type NetWakeupTest {
+                create required property url: str;
+                create trigger schedule after insert for each do (
+                    std::net::http::schedule_request(__new__.url)
+                );
+            };
+            '''
+        )
+        conargs = self.get_connect_args()
+        tls_context = ssl.create_default_context(
+            ssl.Purpose.SERVER_AUTH,
+            cafile=conargs["tls_ca_file"],
+        )
+        tls_context.check_hostname = False
+        scon = await asyncpg.connect(
+            host=conargs['host'],
+            port=conargs['port'],
+            user=conargs['user'],
+            password=conargs['password'],
+            database=self.con.dbname,
+            ssl=tls_context,
+        )
+        try:
+            # Requests scheduled by the triggers of SQL DML wake the net
+            # worker up as well.
+            await scon.execute(
+                'INSERT INTO "NetWakeupTest" (url) VALUES ($1)', url
+            )
+
+            requests_for_example = None
+            async for tr in self.try_until_succeeds(
+                delay=0.2, timeout=5, ignore=(KeyError,)
+            ):
+                async with tr:
+                    requests_for_example = self.mock_server.requests[
+                        example_request
+                    ]
+
+            assert requests_for_example is not None
+            self.assertEqual(len(requests_for_example), 1)
+        finally:
+            await scon.close()
+            await self.con.execute('drop type NetWakeupTest')
+
+    async def test_http_std_net_con_schedule_request_batch_01(self):
+        assert self.mock_server is not None
+
+        paths = [f'/test-batch-01/{i}' for i in range(10)]
+        for path in paths:
+            self.mock_server.register_route_handler(
+                'GET', self.base_url, path
+            )((path, 200))
+
+        def measure(mode: str) -> typing.Callable[[], float]:
+            return lambda: sum(
+                value
+                for key, value in tb_server.parse_metrics(
+                    self.fetch_metrics()
+                ).items()
+                if key.startswith('edgedb_server_net_http_completions_total{')
+                and f'mode="{mode}"' in key
+            )
+
+        bulk_before = measure('bulk')()
+        fallback_before = measure('fallback')()
+
+        # The completions of requests sent together are written back
+        # to the branch in bulk.
+        result = await self.con.query(
+            """
+            for url in array_unpack(<array<str>>$urls) union (
+                std::net::http::schedule_request(url)
+            )
+            """,
+            urls=[f"{self.base_url}{path}" for path in paths],
+        )
+        self.assertEqual(len(result), len(paths))
+
+        for request in result:
+            table_result = await self._wait_for_request_completion(
+                request.id
+            )
+            self.assertEqual(str(table_result.state), 'Completed')
+            self.assertEqual(table_result.response.status, 200)
+
+        bodies = {
+            request.response.body.decode()
+            for request in await self.con.query(
+                """
+                select std::net::http::ScheduledRequest {
+                    response: { body }
+                }
+                filter .id in array_unpack(<array<uuid>>$ids)
+                """,
+                ids=[request.id for request in result],
+            )
+        }
+        self.assertEqual(bodies, set(paths))
+
+        # Make sure that they were not written by the per-request
+        # fallback after the bulk statement failed.
+        self.assertGreater(measure('bulk')(), bulk_before)
+        self.assertEqual(measure('fallback')(), fallback_before)
@@ -222,6 +222,142 @@ class TestProtocol(ProtocolTestCase):
             transaction_state=protocol.TransactionState.NOT_IN_TRANSACTION,
         )
 
+    async def test_proto_execute_pipelined_01(self):
+        # Test that pipelined read-only queries are executed and answered
+        # in order, and that an error in one of them doesn't affect the
+        # other queries.
+
+        await self.con.connect()
+
+        def execute(command_text):
+            return protocol.Execute(
+                annotations=[],
+                allowed_capabilities=protocol.Capability.ALL,
+                compilation_flags=protocol.CompilationFlag(0),
+                implicit_limit=0,
+                command_text=command_text,
+                input_language=protocol.InputLanguage.EDGEQL,
+                output_format=protocol.OutputFormat.BINARY,
+                expected_cardinality=protocol.Cardinality.MANY,
+                input_typedesc_id=b'\0' * 16,
+                output_typedesc_id=b'\0' * 16,
+                state_typedesc_id=b'\0' * 16,
+                arguments=b'',
+                state_data=b'',
+            )
+
+        await self.con.send(
+            execute('SELECT 1'),
+            protocol.Sync(),
+            execute('SELECT 1/0'),
+            protocol.Sync(),
+            execute('SELECT {2, 3}'),
+            protocol.Sync(),
+            execute('SELECT 4'),
+        )
+
+        for rows, error in [
+            (1, None),
+            (0, 'division by zero'),
+            (2, None),
+        ]:
+            if error is None:
+                await self.con.recv_match(protocol.CommandDataDescription)
+                for _ in range(rows):
+                    await self.con.recv_match(protocol.Data)
+                await self.con.recv_match(
+                    protocol.CommandComplete,
+                    status='SELECT'
+                )
+            else:
+                await self.con.recv_match(
+                    protocol.ErrorResponse,
+                    _ignore_msg=protocol.CommandDataDescription,
+                    message=error,
+                )
+            await self.con.recv_match(
+                protocol.ReadyForCommand,
+                transaction_state=protocol.TransactionState.NOT_IN_TRANSACTION,
+            )
+
+        # The last Execute is answered without waiting for its Sync
+        await self.con.recv_match(protocol.CommandDataDescription)
+        await self.con.recv_match(protocol.Data)
+        await self.con.recv_match(
+            protocol.CommandComplete,
+            status='SELECT'
+        )
+        self.assertEqual(
+            await self.con.sync(),
+            protocol.TransactionState.NOT_IN_TRANSACTION)
+
+    async def test_proto_execute_pipelined_02(self):
+        # Test that pipelined queries with different states each see
+        # their own globals.
+
+        await self.con.connect()
+        try:
+            await self._test_proto_execute_pipelined_02()
+        finally:
+            await self.con.execute('DROP GLOBAL pipelined_glob')
+
+    async def _test_proto_execute_pipelined_02(self):
+        await self._execute('CREATE GLOBAL pipelined_glob -> int32')
+        await self.con.recv_match(protocol.StateDataDescription)
+        await self.con.recv_match(protocol.CommandComplete)
+        await self.con.recv_match(protocol.ReadyForCommand)
+
+        states = []
+        for value in (1, 2):
+            await self._execute(f'SET GLOBAL pipelined_glob := {value}')
+            states.append(await self.con.recv_match(protocol.CommandComplete))
+            await self.con.recv_match(protocol.ReadyForCommand)
+
+        def execute(cc):
+            return protocol.Execute(
+                annotations=[],
+                allowed_capabilities=protocol.Capability.ALL,
+                compilation_flags=protocol.CompilationFlag(0),
+                implicit_limit=0,
+                command_text='SELECT GLOBAL pipelined_glob',
+                input_language=protocol.InputLanguage.EDGEQL,
+                output_format=protocol.OutputFormat.BINARY,
+                expected_cardinality=protocol.Cardinality.MANY,
+                input_typedesc_id=b'\0' * 16,
+                output_typedesc_id=b'\0' * 16,
+                state_typedesc_id=cc.state_typedesc_id,
+                arguments=b'',
+                state_data=cc.state_data,
+            )
+
+        cc1, cc2 = states
+        await self.con.send(
+            execute(cc1),
+            protocol.Sync(),
+            execute(cc1),
+            protocol.Sync(),
+            execute(cc2),
+            protocol.Sync(),
+            execute(cc1),
+            protocol.Sync(),
+        )
+
+        for value, cc in [(1, cc1), (1, cc1), (2, cc2), (1, cc1)]:
+            data = await self.con.recv_match(
+                protocol.Data,
+                _ignore_msg=protocol.CommandDataDescription,
+            )
+            self.assertEqual(data.data[0].data[-1], value)
+            await self.con.recv_match(
+                protocol.CommandComplete,
+                status='SELECT',
+                state_data=cc.state_data,
+            )
+            await self.con.recv_match(
+                protocol.ReadyForCommand,
+                transaction_state=protocol.TransactionState.NOT_IN_TRANSACTION,
+            )
+
     async def test_proto_flush_01(self):
 
         await self.con.connect()
@@ -20,6 +20,7 @@
 from __future__ import annotations
 from typing import Type, TYPE_CHECKING
 
+import pickle
 import random
 import re
 
@@ -32,6 +33,7 @@ from edb.edgeql import parser as qlparser
 from edb.edgeql import qltypes
 
 from edb.schema import ddl as s_ddl
+from edb.schema import expr as s_expr
 from edb.schema import links as s_links
 from edb.schema import name as s_name
 from edb.schema import objtypes as s_objtypes
@@ -831,6 +833,37 @@ class TestSchema(tb.BaseSchemaLoadTest):
             qltypes.SchemaCardinality.Many,
         )
 
+    def test_schema_preparse_expressions(self):
+        schema = self.load_schema("""
+            type Object {
+                property foo -> str;
+                property bar := .foo ++ '!';
+            };
+        """)
+
+        def get_expr(schema):
+            obj = schema.get('test::Object')
+            bar = obj.getptr(schema, s_name.UnqualName('bar'))
+            return bar.get_expr(schema)
+
+        # Unpickled expressions come without their ASTs.
+        schema_1 = pickle.loads(pickle.dumps(schema))
+        self.assertIsNone(get_expr(schema_1)._qlast)
+
+        for _ in s_expr.preparse_schema_expressions(schema_1):
+            pass
+        qltree = get_expr(schema_1)._qlast
+        self.assertIsNotNone(qltree)
+        self.assertIs(get_expr(schema_1).parse(), qltree)
+
+        # ASTs of the previous version of a schema are reused.
+        schema_2 = pickle.loads(pickle.dumps(schema))
+        for _ in s_expr.preparse_schema_expressions(
+            schema_2, prev_schema=schema_1
+        ):
+            pass
+        self.assertIs(get_expr(schema_2)._qlast, qltree)
+
     @tb.must_fail(errors.SchemaDefinitionError,
                   "possibly more than one element returned by an expression "
                   "for the computed link 'ham' of object type 'test::Spam' "
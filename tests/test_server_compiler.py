@@ -23,10 +23,12 @@ import contextlib
 import os
 import pickle
 import signal
+import struct
 import subprocess
 import sys
 import tempfile
 import time
+import unittest
 import unittest.mock
 import uuid
 
@@ -35,15 +37,19 @@ import immutables
 from edb import edgeql
 from edb import errors
 from edb.ir import statypes
+from edb.schema import ddl as s_ddl
 from edb.testbase import lang as tb
 from edb.testbase import server as tbs
 from edb.pgsql import params as pg_params
 from edb.server import args as edbargs
 from edb.server import compiler as edbcompiler
+from edb.server.compiler import ddl as edbcompiler_ddl
 from edb.server.compiler import rpc
 from edb.server import config
 from edb.server.compiler_pool import amsg
 from edb.server.compiler_pool import pool
+from edb.server.compiler_pool import server as compiler_server
+from edb.server.compiler_pool import state as compiler_pool_state
 from edb.server.dbview import dbview
 
 
@@ -220,6 +226,106 @@ class TestServerCompiler(tb.BaseSchemaLoadTest):
                 {"sysobj": [{"name": "same"}, {"name": "same"}]}
             )
 
+    def _affects_sql_catalog(self, ddl: str) -> bool:
+        delta = s_ddl.delta_from_ddl(
+            edgeql.parse_block(ddl)[0],
+            schema=self.schema,
+            modaliases={None: 'default'},
+            testmode=True,
+        )
+        return edbcompiler_ddl._affects_sql_catalog(delta)
+
+    def test_server_compiler_sql_catalog_refresh_01(self):
+        # DDL that doesn't change what the SQL catalog views are computed
+        # from skips their refresh.
+        for ddl in [
+            'create function f() -> int64 using (1)',
+            "alter type Foo { create annotation title := 'foo' }",
+        ]:
+            with self.subTest(ddl=ddl):
+                self.assertFalse(self._affects_sql_catalog(ddl))
+
+    def test_server_compiler_sql_catalog_refresh_02(self):
+        for ddl in [
+            'create type Bar',
+            'create module other',
+            'create scalar type Baz extending str',
+            'alter type Foo { create property baz -> int64 }',
+            'alter type Foo { drop property bar }',
+        ]:
+            with self.subTest(ddl=ddl):
+                self.assertTrue(self._affects_sql_catalog(ddl))
+
+
+class TestCompilerServer(unittest.TestCase):
+    def test_server_compiler_result_cache(self):
+        cache = compiler_server.CompileResultCache(100)
+
+        self.assertIsNone(cache.get(b'a'))
+        cache.put(b'a', b'x' * 40)
+        cache.put(b'b', b'y' * 40)
+        self.assertEqual(cache.get(b'a'), b'x' * 40)
+        self.assertEqual(cache.size, 80)
+
+        # The least recently used result is evicted to stay in bounds.
+        cache.put(b'c', b'z' * 40)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.size, 80)
+        self.assertIsNone(cache.get(b'b'))
+        self.assertIsNotNone(cache.get(b'a'))
+        self.assertIsNotNone(cache.get(b'c'))
+
+        # Results that don't fit at all are not cached.
+        cache.put(b'd', b'w' * 101)
+        self.assertIsNone(cache.get(b'd'))
+        self.assertEqual(len(cache), 2)
+
+    def test_server_compiler_shared_schemas(self):
+        def client(user_schema):
+            return compiler_server.ClientSchema(
+                immutables.Map(main=compiler_server.PickledState(
+                    compiler_pool_state.SchemaPickle.new(user_schema),
+                    b'refl',
+                    b'config',
+                )),
+                compiler_pool_state.SchemaPickle.new(b'global'),
+                b'instance config',
+                (),
+            )
+
+        client_1 = client(b'schema')
+        client_2 = client(b'schema')
+        client_3 = client(b'other schema')
+
+        # Identical schemas are identified by content.
+        self.assertEqual(
+            client_1.get_schema_key(), client_2.get_schema_key())
+        self.assertNotEqual(
+            client_1.get_schema_key(), client_3.get_schema_key())
+
+        # Only the data of schemas unknown to the worker is sent.
+        stripped = client_3.strip_schemas(client_1.get_schema_digests())
+        self.assertIsNone(stripped.global_schema.data)
+        self.assertEqual(
+            stripped.global_schema.digest, client_3.global_schema.digest)
+        self.assertEqual(stripped.dbs['main'].user_schema.data,
+                         b'other schema')
+        self.assertEqual(stripped.dbs['main'].reflection_cache, b'refl')
+
+    def test_server_compiler_message_stream(self):
+        stream = amsg.MessageStream()
+        self.assertFalse(stream.has_partial_message())
+
+        data = struct.pack('!Q', 6) + b'abcdef'
+        self.assertEqual(list(stream.feed_data(data[:4])), [])
+        self.assertTrue(stream.has_partial_message())
+        self.assertEqual(list(stream.feed_data(data[4:10])), [])
+        self.assertTrue(stream.has_partial_message())
+
+        # Workers only do their idle work between whole messages.
+        self.assertEqual(list(stream.feed_data(data[10:])), [b'abcdef'])
+        self.assertFalse(stream.has_partial_message())
+
 
 class ServerProtocol(amsg.ServerProtocol):
     def __init__(self):
@@ -925,6 +925,18 @@ class TestServerOps(tb.TestCaseWithHttpClient, tb.CLITestCaseMixin):
 
                         with self.assertChange(measure_sql_compilations(sd), 1):
                             await scon.execute('select 1')
+
+                        # catalog-only queries survive DDL
+                        cat_sql = 'select relname from pg_class limit 1'
+                        with self.assertChange(measure_sql_compilations(sd), 1):
+                            await scon.fetch(cat_sql)
+                        con = await sd.connect()
+                        try:
+                            await con.query('create type Y')
+                        finally:
+                            await con.aclose()
+                        with self.assertChange(measure_sql_compilations(sd), 0):
+                            await scon.fetch(cat_sql)
                     finally:
                         await scon.close()
 
@@ -946,6 +958,273 @@ class TestServerOps(tb.TestCaseWithHttpClient, tb.CLITestCaseMixin):
                 finally:
                     await con.aclose()
 
+    async def test_server_ops_cache_recompile_02(self):
+        try:
+            import asyncpg  # noqa
+        except ImportError:
+            self.skipTest('asyncpg is not installed')
+
+        def measure(
+            sd: tb._EdgeDBServerData, name: str
+        ) -> Callable[[], float | int]:
+            return lambda: tb.parse_metrics(sd.fetch_metrics()).get(
+                f'edgedb_server_{name}_total{{tenant="localtest"}}'
+            ) or 0
+
+        async with tb.start_edgedb_server(
+            default_auth_method=args.ServerAuthMethod.Trust,
+            net_worker_mode='disabled',
+            env={'EDGEDB_SERVER_SQL_RECOMPILE_HOT_QUERIES': '10'},
+        ) as sd:
+            con = await sd.connect()
+            scon = await sd.connect_pg()
+            try:
+                await con.query('create type X')
+                sql = 'select count(*) from "X"'
+                with self.assertChange(measure(sd, 'sql_compilations'), 1):
+                    await scon.fetch(sql)
+
+                recompilations = measure(sd, 'sql_recompilations')
+                before = recompilations()
+                await con.query('create type Y')
+                async for tr in self.try_until_succeeds(
+                    ignore=AssertionError,
+                ):
+                    async with tr:
+                        self.assertGreater(recompilations(), before)
+
+                # The hot query was recompiled on the new schema in the
+                # background, so using it again is a cache hit.
+                with self.assertChange(measure(sd, 'sql_compilations'), 0):
+                    await scon.fetch(sql)
+            finally:
+                await scon.close()
+                await con.aclose()
+
+    async def test_server_ops_query_stats_01(self):
+        async with tb.start_edgedb_server(
+            default_auth_method=args.ServerAuthMethod.Trust,
+            net_worker_mode='disabled',
+        ) as sd:
+            con = await sd.connect()
+            try:
+                for _ in range(3):
+                    await con.query(
+                        'with query_stats_test := 1 select query_stats_test'
+                    )
+                await con.execute('create role query_stats_user')
+            finally:
+                await con.aclose()
+
+            # The query texts are only exposed to superusers.
+            with self.http_con(server=sd) as http_con:
+                _, _, status = self.http_con_request(
+                    http_con,
+                    path='/server/query-stats',
+                    headers={'X-EdgeDB-User': 'query_stats_user'},
+                )
+            self.assertEqual(status, http.HTTPStatus.FORBIDDEN)
+
+            with self.http_con(server=sd) as http_con:
+                data, _, status = self.http_con_request(
+                    http_con, path='/server/query-stats'
+                )
+            self.assertEqual(status, http.HTTPStatus.OK)
+
+            entries = [
+                entry
+                for branch_entries in json.loads(data).values()
+                for entry in branch_entries
+                if 'query_stats_test' in entry['query']
+            ]
+            self.assertEqual(len(entries), 1)
+            entry = entries[0]
+            self.assertEqual(entry['calls'], 3)
+            self.assertEqual(entry['cache_hits'] + entry['cache_misses'], 3)
+            self.assertGreaterEqual(entry['cache_misses'], 1)
+            self.assertEqual(
+                entry['compile']['count'], entry['cache_misses']
+            )
+            for phase in ('pgcon_wait', 'recode_args', 'execute'):
+                stats = entry[phase]
+                self.assertEqual(stats['count'], 3)
+                self.assertLessEqual(stats['min'], stats['mean'])
+                self.assertLessEqual(stats['mean'], stats['max'])
+
+            metrics = sd.fetch_metrics()
+            self.assertIn(
+                'edgedb_server_query_phase_duration_seconds_count'
+                '{tenant="localtest",phase="execute"}',
+                metrics,
+            )
+
+    async def test_server_ops_query_manifest_01(self):
+        def measure(
+            sd: tb._EdgeDBServerData, path: str
+        ) -> Callable[[], float | int]:
+            return lambda: tb.parse_metrics(sd.fetch_metrics()).get(
+                'edgedb_server_edgeql_query_compilations_total'
+                f'{{tenant="localtest",path="{path}"}}'
+            ) or 0
+
+        async with tb.start_edgedb_server(
+            default_auth_method=args.ServerAuthMethod.Trust,
+            net_worker_mode='disabled',
+        ) as sd:
+            con = await sd.connect()
+            try:
+                # Without recompiling the cached queries as part of the
+                # DDL, the manifest is what keeps the query compiled.
+                await con.execute('''
+                    configure current database
+                        set auto_rebuild_query_cache := false;
+                ''')
+                await con.execute('''
+                    create type ManifestTest {
+                        create property name: str;
+                    };
+                ''')
+                qry = 'select ManifestTest { name } filter .name = "a"'
+
+                # The role running the queries must be given explicitly.
+                with self.http_con(server=sd) as http_con:
+                    _, _, status = self.http_con_json_request(
+                        http_con,
+                        path='/server/query-manifest',
+                        body={'branch': '__default__', 'queries': [qry]},
+                    )
+                self.assertEqual(status, http.HTTPStatus.BAD_REQUEST)
+
+                with self.http_con(server=sd) as http_con:
+                    data, _, status = self.http_con_json_request(
+                        http_con,
+                        path='/server/query-manifest',
+                        body={
+                            'branch': '__default__',
+                            'role': sd.get_connect_args()['user'],
+                            'queries': [qry, 'select NoSuchType'],
+                        },
+                    )
+                self.assertEqual(status, http.HTTPStatus.OK)
+                self.assertEqual(data['queries'], 2)
+                self.assertEqual(
+                    [e['query'] for e in data['errors']],
+                    ['select NoSuchType'],
+                )
+                self.assertEqual(measure(sd, 'manifest')(), 1)
+
+                # The declared query is compiled again in the background
+                # right after DDL, so its first use is a cache hit.
+                await con.execute('''
+                    alter type ManifestTest {
+                        create property other: int64;
+                    };
+                ''')
+                async for tr in self.try_until_succeeds(
+                    ignore=AssertionError,
+                ):
+                    async with tr:
+                        self.assertEqual(measure(sd, 'manifest')(), 2)
+                with self.assertChange(measure(sd, 'compiler'), 0):
+                    await con.query(qry)
+            finally:
+                await con.aclose()
+
+            with self.http_con(server=sd) as http_con:
+                data, _, status = self.http_con_request(
+                    http_con, path='/server/query-manifest'
+                )
+            self.assertEqual(status, http.HTTPStatus.OK)
+            manifest = json.loads(data)
+            self.assertEqual(
+                [entry['query'] for entry in manifest['main']],
+                [qry, 'select NoSuchType'],
+            )
+
+    async def test_server_ops_backend_state_syncs(self):
+        def measure(
+            sd: tb._EdgeDBServerData, result: str
+        ) -> Callable[[], float | int]:
+            return lambda: tb.parse_metrics(sd.fetch_metrics()).get(
+                'edgedb_server_backend_state_syncs_total'
+                f'{{tenant="localtest",result="{result}"}}'
+            ) or 0
+
+        async with tb.start_edgedb_server(
+            default_auth_method=args.ServerAuthMethod.Trust,
+            net_worker_mode='disabled',
+        ) as sd:
+            con1 = await sd.connect()
+            con2 = await sd.connect()
+            try:
+                con1 = con1.with_config(apply_access_policies=False)
+                await con1.query('select 1')
+                await con2.query('select 1')
+
+                # Make sure there are at least two idle backend connections,
+                # each synced to the state of one of the clients.
+                await asyncio.gather(
+                    con1.query('select sys::_sleep(0.2)'),
+                    con2.query('select sys::_sleep(0.2)'),
+                )
+
+                # Alternating clients with different session states should
+                # each get the backend connection already in their state.
+                with self.assertChange(measure(sd, 'applied'), 0):
+                    for _ in range(5):
+                        await con1.query('select 1')
+                        await con2.query('select 1')
+            finally:
+                await con1.aclose()
+                await con2.aclose()
+
+    async def test_server_ops_adaptive_stmt_cache(self):
+        def stmt_caches(sd: tb._EdgeDBServerData) -> list[dict[str, int]]:
+            info = sd.fetch_server_info()
+            if 'pg_stmt_caches' not in info:
+                info = info['tenants']['localhost']
+            return info['pg_stmt_caches']
+
+        async with tb.start_edgedb_server(
+            default_auth_method=args.ServerAuthMethod.Trust,
+            net_worker_mode='disabled',
+        ) as sd:
+            con = await sd.connect()
+            try:
+                await con.execute('''
+                    configure instance
+                    set _pg_prepared_statement_cache_size := 5;
+                ''')
+                async for tr in self.try_until_succeeds(
+                    ignore=AssertionError
+                ):
+                    async with tr:
+                        self.assertTrue(all(
+                            c['base_maxsize'] == 5 for c in stmt_caches(sd)
+                        ))
+
+                # Cycle through more distinct statements than fit into
+                # the configured cache, so that they keep being re-parsed.
+                for _ in range(20):
+                    for i in range(20):
+                        await con.query(f'select (stmt_cache_{i} := 1)')
+
+                caches = stmt_caches(sd)
+                self.assertTrue(
+                    any(c['reparses'] > 0 for c in caches), caches)
+                self.assertTrue(
+                    any(c['maxsize'] > c['base_maxsize'] for c in caches),
+                    caches,
+                )
+                self.assertTrue(
+                    any(c['parses_avoided'] > 0 for c in caches), caches)
+            finally:
+                await con.execute('''
+                    configure instance
+                    reset _pg_prepared_statement_cache_size;
+                ''')
+                await con.aclose()
+
     async def test_server_ops_schema_metrics_01(self):
         def _extkey(extension: str) -> str:
             return (
@@ -1631,6 +1631,87 @@ class TestServerConnectionPool(unittest.TestCase):
 
         asyncio.run(main())
 
+    def test_connpool_prefer(self):
+        async def fake_connect(dbname):
+            return FakeConnection(dbname)
+
+        @async_timeout(timeout=3)
+        async def test():
+            pool = pool_impl.Pool(
+                connect=fake_connect,
+                disconnect=self.make_fake_disconnect(),
+                max_capacity=5,
+            )
+            conns = [await pool.acquire('aaa') for _ in range(3)]
+            for conn in conns:
+                pool.release('aaa', conn)
+
+            # The preferred connection is handed out if idle, even though
+            # it is at the bottom of the stack
+            conn = await pool.acquire('aaa', prefer=lambda c: c is conns[0])
+            self.assertIs(conn, conns[0])
+
+            # ... and any other connection is used otherwise
+            other = await pool.acquire('aaa', prefer=lambda c: c is conns[0])
+            self.assertIsNot(other, conns[0])
+            pool.release('aaa', conn)
+            pool.release('aaa', other)
+
+        async def main():
+            await test()
+
+        asyncio.run(main())
+
+    def test_connpool_demand_history(self):
+        Block = collections.namedtuple('Block', 'dbname nconns nwaiters')
+
+        history = connpool.DemandHistory(decay=0.5)
+        history.record([Block('aaa', 4, 2), Block('bbb', 2, 0)])
+        history.record([Block('aaa', 1, 0)])
+        self.assertEqual(history.dump(), {'aaa': 3.0, 'bbb': 1.0})
+
+        # Branches that went quiet fade out of the history
+        history.record([])
+        history.record([])
+        self.assertEqual(history.dump(), {'aaa': 0.75})
+
+        history.load({'aaa': 0.5, 'bbb': 6})
+        self.assertEqual(history.get_quotas(10), {'bbb': 6, 'aaa': 1})
+        # The capacity is split proportionally when the demand doesn't fit
+        self.assertEqual(history.get_quotas(4), {'bbb': 4})
+
+        history.forget('bbb')
+        self.assertEqual(history.get_quotas(4), {'aaa': 1})
+
+    def test_connpool_prefill(self):
+        async def fake_connect(dbname):
+            return FakeConnection(dbname)
+
+        @async_timeout(timeout=3)
+        async def test():
+            pool = connpool.Pool(
+                connect=fake_connect,
+                disconnect=self.make_fake_disconnect(),
+                max_capacity=5,
+            )
+            pool.prefill({'aaa': 3, 'bbb': 3})
+
+            while pool.current_capacity < 5:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+            self.assertEqual(pool.current_capacity, 5)
+
+            # Prefilled connections are handed out without connecting
+            conn = await pool.acquire('aaa')
+            self.assertEqual(pool.current_capacity, 5)
+            pool.release('aaa', conn)
+            await pool.close()
+
+        async def main():
+            await test()
+
+        asyncio.run(main())
+
 
 HTML_TPL = R'''<!DOCTYPE html>
 <html>
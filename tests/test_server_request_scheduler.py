@@ -708,6 +708,64 @@ class TestRequests(unittest.TestCase):
             rs.Timer(1022, True),
         )
 
+    @with_fake_event_loop
+    async def test_service_remaining_budget_01(self):
+        service = rs.Service(
+            limits={
+                'requests': rs.Limits(total=6),
+                'tokens': rs.Limits(total='unlimited'),
+            },
+        )
+
+        # Without any recorded costs, remaining is left alone
+        service.update_remaining_budget()
+        self.assertIsNone(service.limits['requests'].remaining)
+
+        # Costs spent by any user of the service reduce the remaining budget
+        service.record_spent_costs({'requests': 2, 'tokens': 100})
+        await asyncio.sleep(30)
+        service.record_spent_costs({'requests': 3, 'tokens': 100})
+        service.update_remaining_budget()
+        self.assertEqual(service.limits['requests'].remaining, 1)
+        self.assertIsNone(service.limits['tokens'].remaining)
+
+        # Costs older than a minute are no longer counted
+        await asyncio.sleep(31)
+        service.update_remaining_budget()
+        self.assertEqual(service.limits['requests'].remaining, 3)
+
+        await asyncio.sleep(30)
+        service.update_remaining_budget()
+        self.assertEqual(service.limits['requests'].remaining, 6)
+
+    @with_fake_event_loop
+    async def test_scheduler_process_shared_service_01(self):
+        # Schedulers sharing a service share its budget
+        service = rs.Service(
+            jitter=False,
+            limits={'requests': rs.Limits(total=6)},
+        )
+        context = rs.Context(naptime=30)
+
+        for value in range(2):
+            scheduler = TestScheduler(
+                service=service,
+                params=[
+                    TestParams(
+                        _costs={'requests': 2},
+                        _results=[TestResult(data=TestData(value))],
+                    ),
+                ],
+            )
+            self.assertTrue(await scheduler.process(context))
+
+        self.assertEqual(
+            sum(cost for _, cost in service.spent_costs['requests']),
+            4,
+        )
+        service.update_remaining_budget()
+        self.assertEqual(service.limits['requests'].remaining, 2)
+
     def test_limits_update_total_01(self):
         # Check total takes the "latest" value
         self.assertEqual(
@@ -19,7 +19,9 @@
 
 import unittest
 
+from edb import edgeql
 from edb.server import server
+from edb.server.cache import source_cache
 
 
 class TestServerUnittests(unittest.TestCase):
@@ -108,3 +110,26 @@ class TestServerUnittests(unittest.TestCase):
                 (set(expected[0]), set(expected[1]))
             )
             self.assertEqual(tuple(has_wildcards), expected_wildcard)
+
+    def test_server_unittest_source_cache(self):
+        cache = source_cache.SourceCache(maxsize=2, max_text_len=20)
+
+        source, cached = cache.get(edgeql.NormalizedSource, 'select 1')
+        self.assertFalse(cached)
+        self.assertIsInstance(source, edgeql.NormalizedSource)
+
+        again, cached = cache.get(edgeql.NormalizedSource, 'select 1')
+        self.assertTrue(cached)
+        self.assertIs(again, source)
+
+        # Tokenized and normalized sources of the same text don't mix
+        plain, cached = cache.get(edgeql.Source, 'select 1')
+        self.assertFalse(cached)
+        self.assertNotIsInstance(plain, edgeql.NormalizedSource)
+
+        # Texts over the length limit are not cached
+        long_text = 'select ' + ' + '.join(['1'] * 10)
+        cache.get(edgeql.NormalizedSource, long_text)
+        _, cached = cache.get(edgeql.NormalizedSource, long_text)
+        self.assertFalse(cached)
+        self.assertEqual(len(cache), 2)
@@ -16,6 +16,7 @@
 # limitations under the License.
 #
 
+import io
 import uuid
 
 from edb.testbase import server as tb
@@ -1026,6 +1027,59 @@ class TestSQLDataModificationLanguage(tb.SQLQueryTestCase):
         res = await self.squery_values('SELECT num_id FROM "Numbered"')
         self.assertEqual(res, [[10]])
 
+    async def test_sql_dml_copy_01(self):
+        # COPY FROM STDIN, inspect CommandComplete tag
+        res = await self.scon.copy_records_to_table(
+            'Document',
+            records=[('Report',), ('Briefing',)],
+            columns=['title'],
+        )
+        self.assertEqual(res, 'COPY 2')
+
+        # goes through the same path as INSERT, so rewrites apply
+        res = await self.squery_values('SELECT title FROM "Document"')
+        self.assert_data_shape(
+            res, tb.bag([['Report (new)'], ['Briefing (new)']])
+        )
+
+    async def test_sql_dml_copy_02(self):
+        # COPY FROM STDIN in text format into a link table
+        res = await self.squery_values(
+            'INSERT INTO "Document" (title) VALUES (\'Report\') RETURNING id'
+        )
+        doc_id = res[0][0]
+        res = await self.squery_values(
+            'INSERT INTO "User" DEFAULT VALUES RETURNING id'
+        )
+        user_id = res[0][0]
+
+        res = await self.scon.copy_to_table(
+            'Document.shared_with',
+            source=io.BytesIO(f'{doc_id}\t{user_id}\tt\n'.encode()),
+            columns=['source', 'target', 'can_edit'],
+        )
+        self.assertEqual(res, 'COPY 1')
+
+        res = await self.squery_values(
+            'SELECT source, target, can_edit FROM "Document.shared_with"'
+        )
+        self.assertEqual(res, [[doc_id, user_id, True]])
+
+    async def test_sql_dml_copy_03(self):
+        # COPY FROM STDIN with a WHERE clause, only counts inserted rows
+        res = await self.scon.copy_to_table(
+            'Numbered',
+            source=io.BytesIO(b'1\n2\n3\n'),
+            columns=['num_id'],
+            where='num_id > 1',
+        )
+        self.assertEqual(res, 'COPY 2')
+
+        res = await self.squery_values(
+            'SELECT num_id FROM "Numbered" ORDER BY num_id'
+        )
+        self.assertEqual(res, [[2], [3]])
+
     async def test_sql_dml_delete_01(self):
         # delete, inspect CommandComplete tag
 
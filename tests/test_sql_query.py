@@ -1793,6 +1793,27 @@ class TestSQLQuery(tb.SQLQueryTestCase):
             {"Captain Miller", ""}
         )
 
+    async def test_sql_query_copy_06(self):
+        # copy of a large result is streamed to a slow client
+
+        chunks = []
+
+        async def output(chunk):
+            chunks.append(chunk)
+            await asyncio.sleep(0.001)
+
+        res = await self.scon.copy_from_query(
+            "SELECT i, repeat('x', 100) FROM generate_series(1, 50000) AS i",
+            output=output,
+            format="csv",
+        )
+        self.assertEqual(res, 'COPY 50000')
+
+        out = io.StringIO(b''.join(chunks).decode("utf-8"))
+        res = list(csv.reader(out))
+        self.assertEqual(len(res), 50000)
+        self.assertEqual(res[-1], ['50000', 'x' * 100])
+
     async def test_sql_query_error_01(self):
         with self.assertRaisesRegex(
             asyncpg.UndefinedFunctionError,